@@ -0,0 +1,272 @@
+"""
+Size-bounded digests of task context
+
+A task with an explicit context gets the full output of every task in it:
+create_roadmap the whole competitor analysis and market research,
+create_frontend_specs four upstream documents. Each stage adds to the next
+prompt, and on a local model prefilling it dominates the task's latency.
+
+A task declaring `context_budget: N` (tokens) in tasks.yaml gets a digest
+instead, built without an LLM call:
+
+- Headings are kept, as the digest's structure.
+- Findings are kept: list items, table rows, `key: value` lines, quotes
+  and the first lines of code blocks. Long lines are cut after their
+  first sentence.
+- Narrative paragraphs are dropped.
+- If the findings still exceed the budget, each section keeps its share,
+  preferring table headers and lines that name something concrete (code
+  spans, paths, identifiers, numbers), and notes how much it left out.
+  When the budget is tight, headings without findings go first; then a
+  section whose share fits none of its findings is left out, heading and
+  all, and the digest ends with a count of what was left out.
+
+Outputs shorter than their share of the budget are passed in full. JSON
+outputs are re-serialized without indentation, with long lists and then
+long strings cut short if that is not enough. The budget is a hard bound:
+whatever still does not fit is cut off. Each digest names the task's
+output file, for agents with a file reader.
+
+The crews create such tasks as DigestContextTask; without a budget it
+behaves like Task. Set DEV_TEAM_CONTEXT_DIGEST=0 to pass full context
+everywhere (e.g. to compare results).
+"""
+import json
+import os
+import re
+from typing import List, Optional, Tuple
+
+from crewai import Task
+from pydantic import Field
+
+# Same estimate as the read_file token budget
+CHARS_PER_TOKEN = 4
+# crewai's separator between context outputs (aggregate_raw_outputs_from_task_outputs)
+SEPARATOR = "\n\n----------\n\n"
+MAX_LINE_CHARS = 240
+CODE_BLOCK_LINES = 12
+
+_HEADING = re.compile(r'^\s{0,3}#{1,6}\s')
+_FACT = re.compile(r'^\s*(?:[-*+]\s|\d+[.)]\s|\||>|\*\*[^*]+:?\*\*|[\w .()/-]{1,40}:\s)')
+_CONCRETE = re.compile(r'`[^`]+`|\b[\w-]+\.(?:php|js|jsx|ts|tsx|json|css|wsdl|md|txt)\b|\b\w+_\w+\b|\d')
+_TABLE_RULE = re.compile(r'^\s*\|?\s*:?-{3,}')
+_SENTENCE_END = re.compile(r'[.!?](?:\s|$)')
+
+
+def digest_enabled() -> bool:
+    return os.environ.get('DEV_TEAM_CONTEXT_DIGEST', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN
+
+
+def _shorten(line: str) -> str:
+    """A line cut after its first sentence, once it is longer than MAX_LINE_CHARS."""
+    if len(line) <= MAX_LINE_CHARS:
+        return line
+    end = _SENTENCE_END.search(line, 80, MAX_LINE_CHARS)
+    return line[:end.end()].rstrip() if end else line[:MAX_LINE_CHARS].rstrip() + '…'
+
+
+def _sections(text: str) -> List[Tuple[str, List[Tuple[str, int]]]]:
+    """
+    (heading, items) per section, narrative dropped. An item is a finding
+    line or a whole (shortened) code block, with its priority for _fit:
+    0 for table headers, 1 for concrete lines, 2 for the rest.
+    """
+    sections: List[Tuple[str, List[Tuple[str, int]]]] = [('', [])]
+    lines = text.splitlines()
+    code: Optional[List[str]] = None
+    for i, line in enumerate(lines):
+        if line.lstrip().startswith('```'):
+            if code is None:
+                code = [line.rstrip()]
+                continue
+            if len(code) > CODE_BLOCK_LINES + 1:
+                code = code[:CODE_BLOCK_LINES + 1] + [code[0][:len(code[0]) - len(code[0].lstrip())] + '…']
+            sections[-1][1].append(("\n".join(code + [line.rstrip()]), 1))
+            code = None
+        elif code is not None:
+            code.append(line.rstrip())
+        elif _HEADING.match(line):
+            sections.append((line.strip(), []))
+        elif _FACT.match(line) and not _TABLE_RULE.match(line) and len(line.strip()) > 2:
+            header = i + 1 < len(lines) and _TABLE_RULE.match(lines[i + 1])
+            priority = 0 if header else 1 if _CONCRETE.search(line) else 2
+            sections[-1][1].append((_shorten(line.rstrip()), priority))
+    return [(heading, items) for heading, items in sections if heading or items]
+
+
+def _more(count: int) -> str:
+    return f"- … {count} more in the full output"
+
+
+def _fit(items: List[Tuple[str, int]], budget: int) -> List[str]:
+    """
+    Item texts within `budget` characters (one newline each), by priority,
+    in their original order, with a note of how many were left out. Empty
+    if not even one item fits alongside the note.
+    """
+    if sum(len(text) + 1 for text, _ in items) <= budget:
+        return [text for text, _ in items]
+    budget -= len(_more(len(items))) + 1
+    chosen, used = set(), 0
+    for i in sorted(range(len(items)), key=lambda i: (items[i][1], i)):
+        size = len(items[i][0]) + 1
+        if used + size <= budget:
+            chosen.add(i)
+            used += size
+    if not chosen:
+        return []
+    kept = [text for i, (text, _) in enumerate(items) if i in chosen]
+    return kept + [_more(len(items) - len(kept))]
+
+
+def _shares(sizes: List[int], budget: int) -> List[int]:
+    """Split `budget` over items of `sizes`: small ones get their size, the rest equal shares."""
+    shares = [0] * len(sizes)
+    remaining, budget_left = sorted(range(len(sizes)), key=lambda i: sizes[i]), budget
+    while remaining:
+        share = budget_left // len(remaining)
+        i = remaining.pop(0)
+        shares[i] = min(sizes[i], share)
+        budget_left -= shares[i]
+    return shares
+
+
+def _trim(value, items: int, chars: Optional[int] = None):
+    """
+    `value` with every list cut to its first `items` entries plus a count of
+    the rest, and with `chars`, every string cut to that many characters.
+    """
+    if isinstance(value, dict):
+        return {key: _trim(v, items, chars) for key, v in value.items()}
+    if isinstance(value, list):
+        trimmed = [_trim(v, items, chars) for v in value[:items]]
+        return trimmed + [f"… {len(value) - items} more"] if len(value) > items else trimmed
+    if isinstance(value, str) and chars is not None and len(value) > chars:
+        return value[:chars] + '…'
+    return value
+
+
+def _digest_json(value, max_tokens: int) -> str:
+    """Compact JSON, with lists and then strings cut shorter until it fits."""
+    longest = max((len(v) for v in _lists(value)), default=0)
+    for chars in (None, 200, 80, 40):
+        for items in [longest] + [n for n in (20, 10, 5, 3, 1) if n < longest]:
+            compact = json.dumps(_trim(value, items, chars), separators=(',', ':'), ensure_ascii=False)
+            if estimate_tokens(compact) <= max_tokens:
+                return compact
+    return _cut(compact, max_tokens)
+
+
+def _lists(value):
+    if isinstance(value, dict):
+        for v in value.values():
+            yield from _lists(v)
+    elif isinstance(value, list):
+        yield value
+        for v in value:
+            yield from _lists(v)
+
+
+def _omitted(count: int) -> str:
+    return f"- … {count} more findings under headings left out, in the full output"
+
+
+def _cut(text: str, max_tokens: int) -> str:
+    """`text` cut off at `max_tokens`, with a note if it was."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    note = "\n… (cut, see the full output)"
+    return text[:limit - len(note)] + note if limit > len(note) else ''
+
+
+def digest(text: str, max_tokens: int) -> str:
+    """`text` within `max_tokens`, keeping headings and findings as far as they fit."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    try:
+        value = json.loads(re.sub(r'^\s*```\w*\n|\n```\s*$', '', text))  # Agents often fence their JSON
+    except ValueError:
+        value = None
+    if isinstance(value, (dict, list)):
+        return _digest_json(value, max_tokens)
+
+    sections = _sections(text)
+    # Room for the note on sections left out, however many they are
+    budget = max(max_tokens * CHARS_PER_TOKEN - len(_omitted(sum(len(items) for _, items in sections))) - 2, 0)
+    # Each section costs its heading and the blank line before the next one
+    sizes = [len(heading) + 2 + sum(len(text) + 1 for text, _ in items) for heading, items in sections]
+    active = list(range(len(sections)))
+    while True:
+        kept = {}
+        for i, share in zip(active, _shares([sizes[i] for i in active], budget)):
+            heading, items = sections[i]
+            if not items:
+                if share >= len(heading) + 2:
+                    kept[i] = []
+            elif lines := _fit(items, share - len(heading) - 2):
+                kept[i] = lines
+        if len(kept) == len(active):
+            break
+        # Make room: drop the bare headings first, then one section that
+        # fits nothing at a time (the last), passing its share on
+        bare = [i for i in active if not sections[i][1]]
+        if bare:
+            active = [i for i in active if i not in bare]
+        else:
+            active.remove(max(i for i in active if i not in kept))
+
+    parts = ["\n".join(([sections[i][0]] if sections[i][0] else []) + kept[i]) for i in active]
+    left_out = sum(len(items) for i, (_, items) in enumerate(sections) if i not in kept)
+    if left_out:
+        parts.append(_omitted(left_out))
+    return _cut("\n\n".join(parts), max_tokens)
+
+
+def digest_outputs(tasks: List[Task], max_tokens: int) -> str:
+    """
+    Context for a task from the outputs of `tasks`, within `max_tokens`.
+
+    Like crewai's own context, with each output replaced by its digest.
+    Outputs get equal shares of the budget; shorter ones pass their unused
+    share on to the others.
+    """
+    outputs = [(task, task.output.raw) for task in tasks if task.output is not None]
+    shares = _shares([estimate_tokens(raw) for _, raw in outputs], max_tokens)
+    parts = []
+    for (task, raw), share in zip(outputs, shares):
+        if estimate_tokens(raw) <= share:
+            parts.append(raw)
+            continue
+        source = f", full output in {task.output_file}" if task.output_file else ''
+        header = f"[Digest of {task.name}{source}]"
+        parts.append(f"{header}\n\n{digest(raw, share - estimate_tokens(header) - 1)}")
+    return SEPARATOR.join(parts)
+
+
+class DigestContextTask(Task):
+    """Task that receives digests of its context outputs (see context_digest)."""
+
+    context_budget: Optional[int] = Field(
+        default=None,
+        description="Tokens of context the task receives; its context outputs are digested to fit",
+    )
+
+    def _context(self, context: Optional[str]) -> Optional[str]:
+        if not (self.context_budget and isinstance(self.context, list) and context and digest_enabled()):
+            return context
+        digested = digest_outputs(self.context, self.context_budget)
+        if digested != context:
+            print(f"\n📉 {self.name} context: {estimate_tokens(context):,} → {estimate_tokens(digested):,} tokens "
+                  f"(digest, budget {self.context_budget:,})")
+        return digested
+
+    def execute_sync(self, agent=None, context=None, tools=None):
+        return super().execute_sync(agent, self._context(context), tools)
+
+    def execute_async(self, agent=None, context=None, tools=None):
+        return super().execute_async(agent, self._context(context), tools)
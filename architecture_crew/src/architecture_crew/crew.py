@@ -1,8 +1,12 @@
 from pathlib import Path
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+from architecture_crew.context_digest import DigestContextTask
+from architecture_crew.llm import build_llm
 from architecture_crew.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool, FileWriterTool
 
+# Tasks replaced by one job per class/component in fan-out mode (see fanout.py)
+SPEC_TASKS = ('create_backend_specs', 'create_frontend_specs')
 
 
 @CrewBase
@@ -40,6 +44,7 @@ class ArchitectureCrew:
     def software_architect(self) -> Agent:
         return Agent(
             config=self.agents_config['software_architect'],
+            llm=build_llm(self.agents_config['software_architect']),
             tools=[
                 FileReaderTool(),
                 DirectoryListTool(),
@@ -51,14 +56,14 @@ class ArchitectureCrew:
 
     @task
     def read_strategy_outputs(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['read_strategy_outputs'],
             output_file=str(self.outputs_dir / "strategy-summary.md")
         )
 
     @task
     def design_high_level_architecture(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['design_high_level_architecture'],
             context=[self.read_strategy_outputs()],
             output_file=str(self.outputs_dir / "high-level-architecture.md")
@@ -66,7 +71,7 @@ class ArchitectureCrew:
 
     @task
     def define_folder_structure(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['define_folder_structure'],
             context=[self.read_strategy_outputs(), self.design_high_level_architecture()],
             output_file=str(self.outputs_dir / "folder-structure.json")
@@ -74,7 +79,7 @@ class ArchitectureCrew:
 
     @task
     def create_backend_specs(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['create_backend_specs'],
             context=[self.read_strategy_outputs(), self.design_high_level_architecture(), self.define_folder_structure()]
             # Note: output_file removed - this task creates multiple files via write_file tool
@@ -82,7 +87,7 @@ class ArchitectureCrew:
 
     @task
     def create_frontend_specs(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['create_frontend_specs'],
             context=[self.read_strategy_outputs(), self.design_high_level_architecture(), self.define_folder_structure(), self.create_backend_specs()]
             # Note: output_file removed - this task creates multiple files in specs/frontend/
@@ -98,3 +103,44 @@ class ArchitectureCrew:
             verbose=True,
         )
 
+    def design_crew(self) -> Crew:
+        """Architecture crew without the spec tasks, for use with spec fan-out"""
+        crew = self.crew()  # Instantiates the @agent/@task methods
+        return Crew(
+            agents=crew.agents,
+            tasks=[task for task in crew.tasks if task.name not in SPEC_TASKS],
+            process=Process.sequential,
+            verbose=True,
+        )
+
+    def spec_crew(self, kind: str, spec_file: str, log_file: str) -> Crew:
+        """
+        Single-spec crew for one fan-out job.
+
+        Args:
+            kind: 'backend' (create_backend_spec) or 'frontend' (create_frontend_spec)
+            spec_file: Where the spec is written (task output_file)
+            log_file: Crew log, instead of the shared console
+        """
+        architect = Agent(
+            config=self.agents_config['software_architect'],
+            llm=build_llm(self.agents_config['software_architect']),
+            tools=[
+                FileReaderTool(),
+                DirectoryListTool(),
+                FindFilesTool()
+            ],
+            verbose=False
+        )
+        return Crew(
+            agents=[architect],
+            tasks=[Task(
+                config=self.tasks_config[f'create_{kind}_spec'],
+                agent=architect,
+                output_file=spec_file
+            )],
+            process=Process.sequential,
+            verbose=False,
+            output_log_file=log_file,
+        )
+
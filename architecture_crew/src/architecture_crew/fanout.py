@@ -0,0 +1,139 @@
+"""
+Spec fan-out for the Architecture Crew
+
+create_backend_specs and create_frontend_specs write every class/component
+spec inside one long agent loop, one file at a time. Once
+folder-structure.json exists each spec is independent, so fan-out mode runs
+one single-spec crew per php-class and react-component entry, at most
+`max_workers` at a time. Spec generation then takes as long as the slowest
+spec instead of the sum of all of them.
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SPEC_KINDS = {'php-class': 'backend', 'react-component': 'frontend'}
+
+
+@dataclass
+class SpecJob:
+    """One spec to generate: a class (backend) or component (frontend)."""
+    kind: str
+    file_path: str
+    purpose: str
+    spec_file: str
+
+    @property
+    def log_file(self) -> str:
+        return f"outputs/specs/logs/{self.kind}-{Path(self.spec_file).stem}.txt"
+
+
+def _spec_file(entry: dict, kind: str) -> str:
+    """Spec path under outputs/ for a folder-structure entry."""
+    spec_file = entry.get('spec_file')
+    if not spec_file:
+        stem = Path(entry['path']).stem
+        spec_file = f"specs/{kind}/{stem if kind == 'backend' else 'component-' + stem.lower()}.md"
+    return spec_file if spec_file.startswith('outputs/') else f"outputs/{spec_file}"
+
+
+def load_spec_jobs(folder_structure_path) -> Tuple[Dict, List[SpecJob]]:
+    """
+    Read folder-structure.json and return (plugin_metadata, jobs).
+
+    Raises ValueError if the file is not valid JSON or lists no classes or
+    components.
+    """
+    text = Path(folder_structure_path).read_text(encoding='utf-8').strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1].rsplit('```', 1)[0]
+    try:
+        structure = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"{folder_structure_path} is not valid JSON: {e}")
+
+    jobs = [
+        SpecJob(
+            kind=SPEC_KINDS[entry['type']],
+            file_path=entry['path'],
+            purpose=entry.get('purpose', ''),
+            spec_file=_spec_file(entry, SPEC_KINDS[entry['type']]),
+        )
+        for entry in structure.get('files', [])
+        if entry.get('type') in SPEC_KINDS
+    ]
+    if not jobs:
+        raise ValueError(f"No php-class or react-component files in {folder_structure_path}")
+    return structure.get('plugin_metadata', {}), jobs
+
+
+def _job_inputs(job: SpecJob, jobs: List[SpecJob], metadata: Dict, architecture: str,
+                skeleton_plugin_path: str) -> Dict[str, str]:
+    related = [f"- `{other.file_path}`: {other.purpose}" for other in jobs if other is not job]
+    return {
+        'plugin_name': metadata.get('name', 'WordPress'),
+        'namespace': metadata.get('namespace', ''),
+        'file_path': job.file_path,
+        'purpose': job.purpose,
+        'architecture': architecture,
+        'related_files': '\n'.join(related),
+        'skeleton_plugin_path': skeleton_plugin_path,
+    }
+
+
+def run_spec_fanout(architecture_crew, skeleton_plugin_path: str, max_workers: int = 4,
+                    resume: bool = False) -> List[SpecJob]:
+    """
+    Generate all class and component specs as independent jobs.
+
+    Args:
+        architecture_crew: ArchitectureCrew instance (provides spec_crew())
+        skeleton_plugin_path: Passed to every job for conventions
+        max_workers: Maximum number of specs generated concurrently
+        resume: Skip jobs whose spec file already exists
+
+    Returns:
+        The jobs that failed.
+    """
+    metadata, jobs = load_spec_jobs("outputs/folder-structure.json")
+    architecture = Path("outputs/high-level-architecture.md").read_text(encoding='utf-8')
+
+    pending = [job for job in jobs if not (resume and Path(job.spec_file).exists())]
+    workers = max(1, min(max_workers, len(pending) or 1))
+
+    print(f"\n{'─' * 70}")
+    print(f"Spec fan-out: {len(pending)} specs ({len(jobs) - len(pending)} already present), {workers} at a time")
+    print(f"Per-spec logs: outputs/specs/logs/")
+    print(f"{'─' * 70}\n")
+
+    Path("outputs/specs/logs").mkdir(parents=True, exist_ok=True)
+    crews = {
+        id(job): (
+            architecture_crew.spec_crew(job.kind, job.spec_file, job.log_file),
+            _job_inputs(job, jobs, metadata, architecture, skeleton_plugin_path),
+        )
+        for job in pending
+    }
+
+    def run_job(job: SpecJob) -> float:
+        crew, inputs = crews[id(job)]
+        start_time = time.time()
+        crew.kickoff(inputs=inputs)
+        return time.time() - start_time
+
+    failed = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='spec-job') as pool:
+        futures = {pool.submit(run_job, job): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                elapsed = future.result()
+                print(f"  ✓ {job.spec_file} ({int(elapsed // 60)}m {int(elapsed % 60)}s)")
+            except Exception as e:
+                failed.append(job)
+                print(f"  ✗ {job.spec_file} failed: {e}")
+
+    return failed
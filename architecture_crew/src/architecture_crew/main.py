@@ -1,9 +1,13 @@
 #!/usr/bin/env python
+import argparse
 import sys
 import warnings
 from pathlib import Path
 
+from architecture_crew.checkpoints import kickoff_with_checkpoints, task_input_files
 from architecture_crew.crew import ArchitectureCrew
+from architecture_crew.fanout import run_spec_fanout
+from architecture_crew.warmup import preflight
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -18,6 +22,8 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 #
 # Usage:
 #   crewai run                    # Run architecture design
+#   uv run run_crew --resume      # Skip tasks completed by an earlier run
+#   uv run run_crew --fanout 4    # Generate class/component specs as parallel jobs
 
 def run():
     """
@@ -34,6 +40,18 @@ def run():
     - ../outputs/architecture/specs/backend/*.md
     - ../outputs/architecture/specs/frontend/*.md
     """
+    parser = argparse.ArgumentParser(description='Run the Architecture Crew')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip tasks whose inputs are unchanged and whose outputs exist from an earlier run')
+    parser.add_argument('--fanout', type=int, default=None, metavar='K',
+                        help='Generate one spec per class/component from folder-structure.json, '
+                             'at most K at a time (default: specs written by two sequential tasks)')
+    args = parser.parse_args(sys.argv[1:])
+
+    if args.fanout is not None and args.fanout < 1:
+        print(f"\n⚠️  ERROR: --fanout must be at least 1 (got {args.fanout})")
+        return
+
     # Compute project root dynamically
     # main.py is at: architecture_crew/src/architecture_crew/main.py
     # Go up 3 levels to reach dev-team root
@@ -99,7 +117,19 @@ def run():
         print(f"Strategy inputs: {strategy_outputs_path}")
         print(f"Skeleton plugin: {skeleton_path}\n")
 
-        result = ArchitectureCrew().crew().kickoff(inputs=inputs)
+        architecture_crew = ArchitectureCrew()
+        crew = architecture_crew.design_crew() if args.fanout else architecture_crew.crew()
+        input_files = task_input_files(architecture_crew.tasks_config)
+        preflight(crew, input_files)  # Loads the models before the first task
+        result = kickoff_with_checkpoints(crew, inputs, 'architecture', resume=args.resume, input_files=input_files)
+
+        if args.fanout:
+            failed = run_spec_fanout(architecture_crew, str(skeleton_path), args.fanout, resume=args.resume)
+            if failed:
+                print(f"\n❌ {len(failed)} spec(s) failed - rerun with --fanout {args.fanout} --resume to retry them:")
+                for job in failed:
+                    print(f"   - {job.spec_file} (log: {job.log_file})")
+                return None
 
         print("\n" + "="*80)
         print("✅ ARCHITECTURE CREW COMPLETE")
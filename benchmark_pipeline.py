@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Pipeline Benchmark Against a Fake Ollama
+
+Runs the Strategy, Architecture and Development crews and the multi-run
+ensemble against FakeOllama (fake_ollama.py), a deterministic local
+stand-in for the model with configurable latency and token throughput, in
+a scratch directory with a small sample plugin.
+
+Per task it reports:
+- Wall clock, the part of it spent in the model, and the rest (overhead)
+- LLM calls, tool calls, and tokens in/out
+- Workspace file I/O: files (and bytes) read and written. Reads include
+  those the PluginIndex cache serves without opening the file. I/O outside
+  any task (e.g. the static inventory scanned at kickoff) is reported per
+  crew
+
+With a fixed model speed, changes in overhead, calls or tokens come from
+the pipeline itself. --json saves the results to compare between commits.
+
+Usage:
+    python benchmark_pipeline.py
+    python benchmark_pipeline.py --crews strategy ensemble --runs 3
+    python benchmark_pipeline.py --latency 0.5 --tokens-per-sec 40 --json bench.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import contextlib
+import re
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.resolve()
+sys.path[:0] = [str(ROOT / 'src'), str(ROOT / 'architecture_crew' / 'src'), str(ROOT)]
+
+from fake_ollama import FakeOllama
+from dev_team.tools.plugin_index import READ_EVENT
+
+PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_-]*)\}')
+
+CREWS = ('strategy', 'architecture', 'development', 'ensemble')
+
+SAMPLE_PLUGIN = {
+    'sample-plugin.php': """<?php
+/**
+ * Plugin Name: Sample Shipping
+ * Description: Benchmark fixture
+ * Version: 1.2.0
+ * WC requires at least: 7.0
+ */
+require_once __DIR__ . '/includes/class-ajax.php';
+require_once __DIR__ . '/includes/class-settings.php';
+add_action('init', 'sample_register_types');
+function sample_register_types() {
+    register_post_type('sample_shipment', array('public' => false));
+    add_shortcode('sample_tracking', 'sample_tracking_shortcode');
+}
+""",
+    'includes/class-ajax.php': """<?php
+class Sample_Ajax {
+    public function __construct() {
+        add_action('wp_ajax_sample_create_label', array($this, 'create_label'));
+        add_action('wp_ajax_nopriv_sample_track', array($this, 'track'));
+        add_action('woocommerce_checkout_process', array($this, 'validate'));
+    }
+    public function create_label() { wp_send_json_success(); }
+    public function track() { wp_send_json_success(); }
+    public function validate() { do_action('sample_validated'); }
+}
+""",
+    'includes/class-settings.php': """<?php
+class Sample_Settings {
+    public function get() { return get_option('sample_settings', array()); }
+    public function schedule() { wp_schedule_event(time(), 'hourly', 'sample_sync_tracking'); }
+}
+""",
+    'assets/admin.js': "jQuery.post(ajaxurl, { action: 'sample_create_label' });\n",
+    'readme.txt': "=== Sample Shipping ===\nStable tag: 1.2.0\nRequires PHP: 7.4\n",
+}
+
+SKELETON_PLUGIN = {
+    'skeleton.php': "<?php\n/**\n * Plugin Name: Skeleton\n */\nnamespace Skeleton;\n",
+    'src/Plugin.php': "<?php\nnamespace Skeleton;\nfinal class Plugin { public function boot() {} }\n",
+    'admin-react/src/App.jsx': "export default function App() { return null; }\n",
+}
+
+STRATEGY_OUTPUTS = {
+    'plugin-metadata.json': '{"name": "Sample Shipping", "namespace": "SampleShipping"}\n',
+    'technical-analysis.md': "# Technical Analysis\n- AJAX: wp_ajax_sample_create_label\n",
+    'market-research.md': "# Market Research\nMerchants want label printing.\n",
+    'product-roadmap.md': "# Roadmap\n## Milestone 1 - MVP\n- Label printing\n",
+}
+
+
+def write_tree(base: Path, files: dict):
+    for rel, text in files.items():
+        path = base / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding='utf-8')
+
+
+class TaskMetrics:
+    """
+    Per-task counters, collected from crewai events and the fake server.
+
+    Tasks run one at a time, so the server usage and the file reads between
+    a TaskStartedEvent and its TaskCompletedEvent belong to that task. Files
+    opened for reading count with their size; reads through the PluginIndex
+    (plugin_index.READ_EVENT) with the bytes actually read.
+    """
+
+    def __init__(self, server: FakeOllama, workdir: Path):
+        self.server = server
+        self.workdir = str(workdir)
+        self.crew = ''
+        self.rows = []
+        self.outside = {}  # crew -> I/O between its tasks, as in a row
+        self._current = None
+        self._between = _io_bucket()
+
+    def start_crew(self, crew: str):
+        self.crew = crew
+        self._between = _io_bucket()
+
+    def finish_crew(self):
+        self.outside[self.crew] = _io_counts(self._between)
+
+    def install(self):
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+        from crewai.events.types.tool_usage_events import ToolUsageErrorEvent, ToolUsageFinishedEvent
+
+        crewai_event_bus.register_handler(TaskStartedEvent, self._on_task_started)
+        crewai_event_bus.register_handler(TaskCompletedEvent, self._on_task_finished)
+        crewai_event_bus.register_handler(TaskFailedEvent, self._on_task_finished)
+        crewai_event_bus.register_handler(ToolUsageFinishedEvent, self._on_tool_used)
+        crewai_event_bus.register_handler(ToolUsageErrorEvent, self._on_tool_used)
+        sys.addaudithook(self._on_audit)
+
+    def _on_task_started(self, source, event):
+        name = getattr(event.task, 'name', None) or 'task'
+        seen = sum(1 for row in self.rows if row['crew'] == self.crew and row['base_task'] == name)
+        self._current = {
+            'crew': self.crew,
+            'base_task': name,
+            'task': f"{name} #{seen + 1}" if seen else name,
+            'start': time.perf_counter(),
+            'usage': self.server.usage(),
+            'tool_calls': 0,
+            **_io_bucket(),
+        }
+
+    def _on_task_finished(self, source, event):
+        current, self._current = self._current, None
+        if current is None:
+            return
+        usage = self.server.usage()
+        wall = time.perf_counter() - current['start']
+        llm = usage['seconds'] - current['usage']['seconds']
+        self.rows.append({
+            'crew': current['crew'],
+            'base_task': current['base_task'],
+            'task': current['task'],
+            'wall': wall,
+            'llm': llm,
+            'overhead': max(0.0, wall - llm),
+            'llm_calls': usage['requests'] - current['usage']['requests'],
+            'tool_calls': current['tool_calls'],
+            'tokens_in': usage['prompt_tokens'] - current['usage']['prompt_tokens'],
+            'tokens_out': usage['completion_tokens'] - current['usage']['completion_tokens'],
+            **_io_counts(current),
+        })
+
+    def _on_tool_used(self, source, event):
+        if self._current is not None:
+            self._current['tool_calls'] += 1
+
+    def _on_audit(self, event, args):
+        if event not in ('open', READ_EVENT):
+            return
+        bucket = self._current if self._current is not None else self._between
+        path = args[0]
+        if not isinstance(path, str):
+            return
+        path = os.path.abspath(path)
+        if not path.startswith(self.workdir + os.sep):
+            return
+        if event == READ_EVENT:
+            bucket['index_reads'][path] = bucket['index_reads'].get(path, 0) + args[1]
+            return
+
+        _, mode, flags = args
+        if mode is not None:
+            writing = any(c in mode for c in 'wax+')
+        else:
+            writing = bool(flags & (os.O_WRONLY | os.O_RDWR))
+        bucket['written' if writing else 'read'].add(path)
+
+
+def _io_bucket() -> dict:
+    return {'read': set(), 'index_reads': {}, 'written': set()}  # index_reads: path -> bytes
+
+
+def _io_counts(bucket: dict) -> dict:
+    """Files and bytes read and written; opened files count with their size."""
+    index_reads = bucket['index_reads']
+    return {
+        'files_read': len(bucket['read'] | index_reads.keys()),
+        'bytes_read': sum(index_reads.values()) + sum(_size(path) for path in bucket['read'] - index_reads.keys()),
+        'files_written': len(bucket['written']),
+        'bytes_written': sum(_size(path) for path in bucket['written']),
+    }
+
+
+def _size(path: str) -> int:
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def run_strategy(workdir: Path, args):
+    from dev_team.crews.strategy_crew import StrategyCrew
+
+    StrategyCrew().crew().kickoff(inputs={
+        'competitor_plugin_path': str(workdir / 'inputs/competitor-plugin'),
+        'skeleton_plugin_path': str(workdir / 'inputs/skeleton-plugin'),
+    })
+
+
+def run_architecture(workdir: Path, args):
+    from architecture_crew.crew import ArchitectureCrew
+
+    ArchitectureCrew().crew().kickoff(inputs={
+        'strategy_outputs_path': str(workdir / 'outputs/strategy'),
+        'skeleton_plugin_path': str(workdir / 'inputs/skeleton-plugin'),
+    })
+
+
+def run_development(workdir: Path, args):
+    from dev_team.crews.development_crew import DevelopmentCrew
+
+    dev_crew = DevelopmentCrew()
+    inputs = {
+        'competitor_plugin_path': str(workdir / 'inputs/competitor-plugin'),
+        'skeleton_plugin_path': str(workdir / 'inputs/skeleton-plugin'),
+        'current_milestone': 'milestone-1-mvp',
+    }
+    # The task texts use {feature}, {n}, ... in examples, which crewai takes
+    # for inputs; map them to themselves so the prompts stay as written
+    for task_config in dev_crew.tasks_config.values():
+        for text in (task_config.get('description', ''), task_config.get('expected_output', '')):
+            for name in PLACEHOLDER.findall(text):
+                inputs.setdefault(name, f"{{{name}}}")
+    dev_crew.crew().kickoff(inputs=inputs)
+
+
+def run_ensemble(workdir: Path, args):
+    from orchestrator_multi_run import MultiRunOrchestrator
+
+    MultiRunOrchestrator(num_runs=args.runs, voting_threshold=args.runs // 2 + 1).run()
+
+
+RUNNERS = {
+    'strategy': run_strategy,
+    'architecture': run_architecture,
+    'development': run_development,
+    'ensemble': run_ensemble,
+}
+
+
+def format_bytes(n: int) -> str:
+    return f"{n / 1024:.1f}K" if n >= 1024 else f"{n}B"
+
+
+def print_results(rows, crew_times, outside):
+    headers = ('Crew', 'Task', 'Wall', 'LLM', 'Overhead', 'Calls', 'Tools',
+               'Tok in', 'Tok out', 'Read', 'Written')
+    table = [(
+        row['crew'], row['task'], f"{row['wall']:.2f}s", f"{row['llm']:.2f}s", f"{row['overhead']:.2f}s",
+        str(row['llm_calls']), str(row['tool_calls']), str(row['tokens_in']), str(row['tokens_out']),
+        f"{row['files_read']} / {format_bytes(row['bytes_read'])}",
+        f"{row['files_written']} / {format_bytes(row['bytes_written'])}",
+    ) for row in rows]
+    widths = [max(len(h), *(len(r[i]) for r in table)) if table else len(h) for i, h in enumerate(headers)]
+
+    def line(cells):
+        return "  ".join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(cells, widths)))
+
+    print(line(headers))
+    print("  ".join('─' * w for w in widths))
+    for cells in table:
+        print(line(cells))
+
+    print()
+    for crew, (elapsed, error) in crew_times.items():
+        crew_rows = [row for row in rows if row['crew'] == crew]
+        overhead = elapsed - sum(row['llm'] for row in crew_rows)
+        status = f"  ✗ {error}" if error else ''
+        io = outside.get(crew)
+        io = (f", outside tasks read {io['files_read']} / {format_bytes(io['bytes_read'])}, "
+              f"wrote {io['files_written']} / {format_bytes(io['bytes_written'])}") if io else ''
+        print(f"{crew:<12} {elapsed:7.2f}s total, {overhead:6.2f}s outside the model "
+              f"({len(crew_rows)} tasks{io}){status}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the crews against a deterministic fake Ollama')
+    parser.add_argument('--crews', nargs='+', choices=CREWS, default=list(CREWS),
+                        help='Crews to run, in order (default: all)')
+    parser.add_argument('--latency', type=float, default=0.05,
+                        help='Seconds before every model reply (default: 0.05)')
+    parser.add_argument('--tokens-per-sec', type=float, default=0,
+                        help='Model generation speed; 0 for instant replies (default: 0)')
+    parser.add_argument('--output-tokens', type=int, default=400,
+                        help='Approximate length of every final answer (default: 400)')
+    parser.add_argument('--tool-calls', type=int, default=2,
+                        help='Tool calls before each final answer, for agents with tools (default: 2)')
+    parser.add_argument('--runs', type=int, default=3, help='Ensemble runs (default: 3)')
+    parser.add_argument('--json', metavar='PATH', help='Also save the results as JSON')
+    parser.add_argument('--log', metavar='PATH', default=None,
+                        help='Crew console output (default: crew-output.log in the scratch directory, discarded)')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"Pipeline benchmark: {', '.join(args.crews)}")
+    print(f"Fake model: {args.latency}s latency, "
+          f"{f'{args.tokens_per_sec:g} tokens/s' if args.tokens_per_sec else 'instant generation'}, "
+          f"~{args.output_tokens} tokens per answer, {args.tool_calls} tool calls per task")
+    print("=" * 70 + "\n")
+
+    server = FakeOllama(latency=args.latency, tokens_per_sec=args.tokens_per_sec,
+                        output_tokens=args.output_tokens, tool_calls=args.tool_calls)
+    rows, crew_times, outside = [], {}, {}
+
+    with tempfile.TemporaryDirectory() as tmp, server:
+        workdir = Path(tmp).resolve()
+        write_tree(workdir / 'inputs/competitor-plugin', SAMPLE_PLUGIN)
+        write_tree(workdir / 'inputs/skeleton-plugin', SKELETON_PLUGIN)
+        write_tree(workdir / 'outputs/strategy', STRATEGY_OUTPUTS)
+
+        os.environ.update({
+            'OLLAMA_API_BASE': server.url,
+            'DEV_TEAM_LLM_CACHE': '0',
+            'OTEL_SDK_DISABLED': 'true',
+            'CREWAI_DISABLE_TELEMETRY': 'true',
+            'CREWAI_TRACING_ENABLED': 'false',
+            'CREWAI_TESTING': 'true',  # No first-run "view your traces?" prompt
+            'LITELLM_LOCAL_MODEL_COST_MAP': 'True',
+        })
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        log_path = Path(args.log).resolve() if args.log else workdir / 'crew-output.log'
+        try:
+            metrics = TaskMetrics(server, workdir)
+            metrics.install()
+            with open(log_path, 'w', encoding='utf-8') as log:
+                for crew in args.crews:
+                    print(f"Running {crew}...", flush=True)
+                    metrics.start_crew(crew)
+                    error = None
+                    start = time.perf_counter()
+                    try:
+                        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                            RUNNERS[crew](workdir, args)
+                    except Exception as e:
+                        error = str(e).splitlines()[0] if str(e) else type(e).__name__
+                    crew_times[crew] = (time.perf_counter() - start, error)
+                    metrics.finish_crew()
+            rows, outside = metrics.rows, metrics.outside
+        finally:
+            os.chdir(cwd)
+
+    print()
+    print_results(rows, crew_times, outside)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                'settings': {k: getattr(args, k) for k in
+                             ('latency', 'tokens_per_sec', 'output_tokens', 'tool_calls', 'runs')},
+                'crews': {crew: {'seconds': elapsed, 'error': error, 'outside_tasks': outside.get(crew)}
+                          for crew, (elapsed, error) in crew_times.items()},
+                'tasks': [{k: v for k, v in row.items() if k != 'base_task'} for row in rows],
+            }, f, indent=2)
+            f.write("\n")
+        print(f"\nResults saved to: {args.json}")
+    print()
+
+    return 1 if any(error for _, error in crew_times.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Console Script Startup Benchmark
+
+Times the paths of the console scripts that should never load crewai: a
+missing input or argument that fails fast, and `full_analysis --skip-analysis`
+merging an existing report. Every case runs in a fresh interpreter in a
+scratch directory, and reports whether crewai ended up imported.
+
+The "eager crew import" row is what each of these paths paid before the
+crew modules were imported lazily.
+
+Usage:
+    python benchmark_startup.py
+    python benchmark_startup.py --repeat 10
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.resolve()
+
+# (name, argv, entry point module, function)
+CASES = [
+    ('dev_team (missing inputs)', ['dev_team'], 'dev_team.main', 'run'),
+    ('replay (missing task id)', ['replay'], 'dev_team.main', 'replay'),
+    ('train (missing arguments)', ['train'], 'dev_team.main', 'train'),
+    ('test (missing arguments)', ['test'], 'dev_team.main', 'test'),
+    ('full_analysis (bad threshold)', ['full_analysis', '--runs', '1', '--threshold', '2'],
+     'run_full_analysis', 'main'),
+    ('full_analysis --skip-analysis', ['full_analysis', '--runs', '1', '--threshold', '1', '--skip-analysis'],
+     'run_full_analysis', 'main'),
+]
+
+# Reference: what every case cost when the crews were imported at module load
+EAGER_CASE = ('eager crew import (before)', None, 'dev_team.crews.strategy_crew', None)
+
+SAMPLE_REPORT = """# Technical Analysis
+AJAX: wp_ajax_sample_action in includes/class-ajax.php:12
+Shortcode: [sample_form]
+"""
+
+RUNNER = """
+import sys, json
+sys.path[:0] = [{src!r}, {root!r}]
+sys.argv = {argv!r}
+import importlib
+module = importlib.import_module({module!r})
+if {function!r}:
+    try:
+        getattr(module, {function!r})()
+    except SystemExit:
+        pass
+print(json.dumps('crewai' in sys.modules))
+"""
+
+
+def run_case(case, workdir):
+    """Run one case in a fresh interpreter; returns (seconds, crewai_loaded)"""
+    _, argv, module, function = case
+    code = RUNNER.format(src=str(ROOT / 'src'), root=str(ROOT), argv=argv or ['python'],
+                         module=module, function=function)
+    env = dict(os.environ, OTEL_SDK_DISABLED='true', CREWAI_DISABLE_TELEMETRY='true')
+
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=workdir, env=env,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        raise RuntimeError(f"{case[0]} failed:\n{result.stderr[-2000:]}")
+    return elapsed, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the fast paths of the console scripts')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per case (default: 5)')
+    args = parser.parse_args()
+
+    print("\n" + "=" * 70)
+    print(f"Console script startup ({args.repeat} runs per case, median)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # No inputs/ here, so dev_team fails fast; one report to merge
+        report_dir = Path(workdir) / 'outputs' / 'analysis'
+        report_dir.mkdir(parents=True)
+        (report_dir / 'run1-technical-analysis.md').write_text(SAMPLE_REPORT, encoding='utf-8')
+
+        rows = []
+        for case in CASES + [EAGER_CASE]:
+            run_case(case, workdir)  # warm the OS file cache and bytecode
+            timings = []
+            for _ in range(args.repeat):
+                elapsed, crewai_loaded = run_case(case, workdir)
+                timings.append(elapsed)
+            rows.append((case[0], statistics.median(timings), crewai_loaded))
+
+    width = max(len(name) for name, _, _ in rows)
+    print(f"{'Case':<{width}}  {'Median':>9}  crewai loaded")
+    print(f"{'─' * width}  {'─' * 9}  {'─' * 13}")
+    for name, median, crewai_loaded in rows:
+        print(f"{name:<{width}}  {median * 1000:>7.0f}ms  {'yes' if crewai_loaded else 'no'}")
+
+    eager = rows[-1][1]
+    fast = [median for _, median, _ in rows[:-1]]
+    print(f"\nFast paths: {min(fast) * 1000:.0f}-{max(fast) * 1000:.0f}ms "
+          f"vs {eager * 1000:.0f}ms with the crews imported eagerly\n")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
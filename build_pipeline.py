@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Incremental Strategy → Architecture → Development Pipeline
+
+Rebuilds only the phases whose inputs changed since their last successful run,
+like make. Each phase declares the files it reads and the artifacts it
+produces (see dev_team/build_graph.py). Within a phase, crews run with
+--resume, so only the tasks that read changed files rerun
+(`input_files` in each crew's tasks.yaml).
+
+For example, editing the skeleton plugin reruns the architecture tasks that
+read it and the development phase, but not market research or the roadmap.
+
+Usage:
+    python build_pipeline.py                   # Rebuild stale phases
+    python build_pipeline.py architecture      # Only up to architecture
+
+Options:
+    --dry-run       Show what would be rebuilt
+    --force         Rebuild every phase
+    --milestone M   Milestone for the development phase (default: milestone-1-mvp)
+"""
+
+import sys
+import shutil
+import argparse
+import subprocess
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
+
+from dev_team.build_graph import BuildGraph, Target
+
+COMPETITOR_PATH = 'inputs/competitor-plugin'
+SKELETON_PATH = 'inputs/skeleton-plugin'
+
+STRATEGY_OUTPUTS = [
+    'outputs/strategy/technical-analysis.md',
+    'outputs/strategy/market-research.md',
+    'outputs/strategy/product-roadmap.md',
+    'outputs/strategy/plugin-metadata.json',
+]
+
+# The development crew reads the roadmap where the dev_team strategy phase
+# writes it, next to the milestone files approved with APPROVED.txt
+STRATEGY_ROADMAP = 'outputs/strategy/product-roadmap.md'
+DEVELOPMENT_ROADMAP = 'outputs/analysis/product-roadmap.md'
+
+ARCHITECTURE_OUTPUTS = [
+    'outputs/architecture/strategy-summary.md',
+    'outputs/architecture/high-level-architecture.md',
+    'outputs/architecture/folder-structure.json',
+]
+
+
+def run_crew_project(crew_dir):
+    """Run a standalone crew project (strategy_crew/, architecture_crew/) with --resume"""
+    print(f"$ cd {crew_dir} && uv run run_crew --resume")
+    return subprocess.run(['uv', 'run', 'run_crew', '--resume'], cwd=crew_dir).returncode == 0
+
+
+def build_pipeline_graph(milestone):
+    """Declare the three phases, their inputs and their outputs"""
+    graph = BuildGraph()
+
+    graph.add(Target(
+        name='strategy',
+        action=lambda: run_crew_project('strategy_crew'),
+        inputs=[COMPETITOR_PATH],
+        outputs=STRATEGY_OUTPUTS,
+    ))
+
+    graph.add(Target(
+        name='architecture',
+        action=lambda: run_crew_project('architecture_crew'),
+        inputs=[SKELETON_PATH],
+        outputs=ARCHITECTURE_OUTPUTS,
+        deps=['strategy'],
+    ))
+
+    def develop():
+        from dev_team.orchestrator import run_development_phase
+        Path(DEVELOPMENT_ROADMAP).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(STRATEGY_ROADMAP, DEVELOPMENT_ROADMAP)
+        return run_development_phase(COMPETITOR_PATH, SKELETON_PATH, milestone, resume=True)
+
+    # The roadmap comes from the strategy target's outputs; the milestone
+    # file is written at approval time, outside the graph
+    graph.add(Target(
+        name='development',
+        action=develop,
+        inputs=[
+            SKELETON_PATH,
+            'outputs/analysis/APPROVED.txt',
+            f'outputs/analysis/milestones/milestone-{milestone}.md',
+        ],
+        outputs=[f'outputs/architecture/milestone-{milestone}-architecture.md'],
+        deps=['strategy', 'architecture'],
+    ))
+
+    return graph
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Rebuild only the pipeline phases whose inputs changed',
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        'targets',
+        nargs='*',
+        metavar='TARGET',
+        help='Phases to bring up to date: strategy, architecture, development (default: all)'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Show what would be rebuilt without running anything'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Rebuild every phase regardless of fingerprints'
+    )
+    parser.add_argument(
+        '--milestone',
+        default='milestone-1-mvp',
+        help='Milestone for the development phase (default: milestone-1-mvp)'
+    )
+
+    args = parser.parse_args()
+
+    graph = build_pipeline_graph(args.milestone)
+    try:
+        ok = graph.run(args.targets or None, force=args.force, dry_run=args.dry_run)
+    except ValueError as e:
+        print(f"❌ ERROR: {e}")
+        return 1
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""
+Deterministic local stand-in for the Ollama server
+
+Benchmarking the crews against a real model measures the model more than
+the pipeline. FakeOllama serves the parts of the Ollama HTTP API that
+litellm's ollama provider uses (/api/generate, /api/chat, /api/show,
+/api/tags, plus /api/ps) on localhost, so the crews run unchanged with OLLAMA_API_BASE
+pointed at it.
+
+Every reply is a function of the prompt. It follows crewai's ReAct format:
+the first `tool_calls` replies of a task call one of the tools the prompt
+lists, on a path taken from the prompt, then a Final Answer of about
+`output_tokens` tokens follows. A reply takes `latency` seconds plus its
+tokens at `tokens_per_sec`, and token counts are reported the way Ollama
+does (prompt_eval_count / eval_count).
+
+With `load_seconds`, the first request to a model that is not in memory
+also waits that long and reports it as load_duration, like Ollama loading
+its weights; `max_loaded` models fit in memory at once (least recently used
+is evicted). A generate request without a prompt only loads the model.
+"""
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+# Same estimate as the read_file token budget (tools/custom_tool.py)
+CHARS_PER_TOKEN = 4
+CONTEXT_LENGTH = 32768
+
+# Tools the fake knows how to call, in the order it prefers them
+TOOL_ORDER = ('search_symbols', 'list_directory', 'find_files', 'read_file', 'write_file')
+# Left in every tool-calling reply; counting it in the prompt gives the step
+STEP_MARKER = 'Benchmark step'
+
+_PATH = re.compile(r"(?<![\w.:/-])(/[\w.@+-]+(?:/[\w.@+-]+)*|(?:inputs|outputs)/[\w.@+/-]*)")
+
+FINAL_ANSWER_LINES = (
+    "## Summary",
+    "- AJAX: wp_ajax_benchmark_save in includes/class-ajax.php",
+    "- Shortcode: [benchmark_form]",
+    "- Option: benchmark_settings",
+    "- Hook: woocommerce_checkout_process",
+)
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+class FakeOllama:
+    """
+    Threaded HTTP server that answers like an Ollama model.
+
+    Usage:
+        with FakeOllama(latency=0.2, tokens_per_sec=40) as server:
+            os.environ['OLLAMA_API_BASE'] = server.url
+            ...
+            server.usage()  # {'requests', 'prompt_tokens', 'completion_tokens', 'seconds'}
+
+    Args:
+        latency: Seconds before every reply (prompt processing)
+        tokens_per_sec: Generation speed; 0 returns replies immediately
+        output_tokens: Approximate length of a Final Answer
+        tool_calls: Tool-calling replies before the Final Answer of a task
+        load_seconds: Time to load a model that is not in memory
+        max_loaded: Models in memory at once (0: no limit)
+    """
+
+    def __init__(self, latency: float = 0.0, tokens_per_sec: float = 0.0, output_tokens: int = 400,
+                 tool_calls: int = 2, load_seconds: float = 0.0, max_loaded: int = 0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.latency = latency
+        self.load_seconds = load_seconds
+        self.max_loaded = max_loaded
+        self._loaded: List[str] = []  # Least recently used first
+        self.tokens_per_sec = tokens_per_sec
+        self.output_tokens = output_tokens
+        self.tool_calls = tool_calls
+        self._address = (host, port)
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._usage = {'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'seconds': 0.0,
+                       'loads': 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread; returns the base URL."""
+        handler = type('FakeOllamaHandler', (_Handler,), {'fake': self})
+        self._server = ThreadingHTTPServer(self._address, handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-ollama', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeOllama':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def usage(self) -> Dict[str, float]:
+        """Totals since start: requests, prompt/completion tokens, seconds spent answering, model loads."""
+        with self._lock:
+            return dict(self._usage)
+
+    def loaded(self) -> List[str]:
+        """Models in memory, least recently used first."""
+        with self._lock:
+            return list(self._loaded)
+
+    def load(self, model: str) -> float:
+        """Make `model` resident; returns the seconds spent loading it (0 if it was)."""
+        with self._lock:
+            resident = model in self._loaded
+            if resident:
+                self._loaded.remove(model)
+            self._loaded.append(model)
+            if self.max_loaded:
+                del self._loaded[:-self.max_loaded]
+            if not resident:
+                self._usage['loads'] += 1
+        if resident or self.load_seconds <= 0:
+            return 0.0
+        time.sleep(self.load_seconds)
+        return self.load_seconds
+
+    def reply(self, prompt: str) -> str:
+        """The completion for `prompt`: a tool call or the Final Answer."""
+        step = prompt.count(STEP_MARKER)
+        tools = [name for name in TOOL_ORDER if f"Tool Name: {name}" in prompt]
+        if tools and step < self.tool_calls:
+            name = tools[step % len(tools)]
+            return (
+                f"Thought: {STEP_MARKER} {step + 1}: I should use {name}.\n"
+                f"Action: {name}\n"
+                f"Action Input: {json.dumps(self._tool_arguments(name, prompt, step))}"
+            )
+        return "Thought: I now know the final answer\nFinal Answer: " + self._final_answer()
+
+    def _tool_arguments(self, name: str, prompt: str, step: int) -> Dict[str, str]:
+        directory = self._directory(prompt)
+        if name == 'search_symbols':
+            return {'directory_path': directory, 'query': 'wp_ajax_*'}
+        if name == 'list_directory':
+            return {'directory_path': directory}
+        if name == 'find_files':
+            return {'directory_path': directory, 'pattern': '*.php'}
+        if name == 'read_file':
+            return {'file_path': self._first_file(directory)}
+        return {'file_path': f"outputs/benchmark/step-{step + 1}.md", 'content': self._final_answer()}
+
+    @staticmethod
+    def _directory(prompt: str) -> str:
+        """First existing directory mentioned in the prompt."""
+        for match in _PATH.finditer(prompt):
+            path = match.group(1).rstrip('/.')
+            if path and os.path.isdir(path):
+                return path
+        return '.'
+
+    @staticmethod
+    def _first_file(directory: str) -> str:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                return os.path.join(root, name)
+        return os.path.join(directory, 'README.md')
+
+    def _final_answer(self) -> str:
+        lines: List[str] = list(FINAL_ANSWER_LINES)
+        budget = self.output_tokens * CHARS_PER_TOKEN - sum(len(line) + 1 for line in lines)
+        i = 0
+        while budget > 0:
+            i += 1
+            line = f"- Detail {i}: the benchmark stand-in describes one more aspect of the plugin here."
+            lines.append(line)
+            budget -= len(line) + 1
+        return "\n".join(lines)
+
+    def complete(self, prompt: str, stop: Optional[List[str]] = None) -> Dict[str, int]:
+        """Reply to `prompt` at the configured speed and record its usage."""
+        start = time.perf_counter()
+        text = self.reply(prompt)
+        for word in stop or ():
+            if word and word in text:
+                text = text[:text.index(word)]
+        prompt_tokens, completion_tokens = estimate_tokens(prompt), estimate_tokens(text)
+
+        delay = self.latency + (completion_tokens / self.tokens_per_sec if self.tokens_per_sec > 0 else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self._usage['requests'] += 1
+            self._usage['prompt_tokens'] += prompt_tokens
+            self._usage['completion_tokens'] += completion_tokens
+            self._usage['seconds'] += time.perf_counter() - start
+        return {'text': text, 'prompt_eval_count': prompt_tokens, 'eval_count': completion_tokens,
+                'total_duration': int((time.perf_counter() - start) * 1e9)}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    fake: FakeOllama
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status: int = 200, ndjson: bool = False):
+        body = ("\n".join(json.dumps(p) for p in payload) + "\n" if ndjson else json.dumps(payload)).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/x-ndjson' if ndjson else 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/api/tags':
+            self._send_json({'models': []})
+        elif self.path.rstrip('/') == '/api/ps':
+            self._send_json({'models': [{'name': m, 'model': m} for m in self.fake.loaded()]})
+        elif self.path in ('/', ''):
+            body = b'Ollama is running'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json({'error': f"not found: {self.path}"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            request = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json({'error': 'invalid JSON'}, 400)
+            return
+
+        model = request.get('model', '')
+        if model and ':' not in model:
+            model += ':latest'
+        path = self.path.rstrip('/')
+        if path == '/api/show':
+            self._send_json({'model_info': {'general.context_length': CONTEXT_LENGTH},
+                             'details': {'family': 'fake'}, 'template': '{{ .Prompt }}'})
+            return
+        if path not in ('/api/generate', '/api/chat'):
+            self._send_json({'error': f"not found: {self.path}"}, 404)
+            return
+
+        load_seconds = self.fake.load(model)
+        chat = path == '/api/chat'
+        if chat:
+            prompt = "\n".join(str(m.get('content') or '') for m in request.get('messages', []))
+        else:
+            prompt = request.get('prompt', '')
+        if not chat and not prompt:
+            self._send_json({'model': model, 'created_at': datetime.now(timezone.utc).isoformat(),
+                             'response': '', 'done': True, 'done_reason': 'load',
+                             'load_duration': int(load_seconds * 1e9)})
+            return
+        result = self.fake.complete(prompt, (request.get('options') or {}).get('stop'))
+
+        payload = {
+            'model': model,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'done': True,
+            'done_reason': 'stop',
+            'prompt_eval_count': result['prompt_eval_count'],
+            'eval_count': result['eval_count'],
+            'total_duration': result['total_duration'] + int(load_seconds * 1e9),
+            'load_duration': int(load_seconds * 1e9),
+        }
+        if chat:
+            payload['message'] = {'role': 'assistant', 'content': result['text']}
+        else:
+            payload['response'] = result['text']
+
+        if request.get('stream', True):
+            # One content chunk, then the final chunk with the counts
+            first = dict(payload, done=False)
+            for key in ('done_reason', 'prompt_eval_count', 'eval_count', 'total_duration', 'load_duration'):
+                first.pop(key)
+            last = dict(payload, **({'message': {'role': 'assistant', 'content': ''}} if chat else {'response': ''}))
+            self._send_json([first, last], ndjson=True)
+        else:
+            self._send_json(payload)
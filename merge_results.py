@@ -3,174 +3,43 @@
 Merge Results from 5 Runs
 
 Merges the 5 technical analysis reports using voting ensemble logic.
+If outputs/analysis/static-inventory.json exists and is current for
+inputs/competitor-plugin, its items are verified as well (see
+dev_team/ensemble/inventory.py).
 
 Usage:
     python merge_results.py
 """
 
-import re
+import sys
 from pathlib import Path
 from collections import Counter
-from datetime import datetime
 
-def extract_findings(report):
-    """Extract structured findings from a report"""
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
-    findings = {
-        'ajax_endpoints': set(re.findall(r'wp_ajax_[\w_]+', report)),
-        'wsdl_files': set(re.findall(r'([\w]+\.wsdl)', report)),
-        'shortcodes': set(re.findall(r'\[([a-zA-Z_][a-zA-Z0-9_]*)]', report)),
-        'wc_hooks': set(re.findall(r'woocommerce_[\w_]+', report)),
-        'cpt': set(re.findall(r'(?:CPT|Custom Post Type):\s*([a-z_]+)', report, re.IGNORECASE)),
-    }
+from dev_team.ensemble.findings import FindingsExtractor
+from dev_team.ensemble.inventory import load_inventory, verify_findings
+from dev_team.ensemble.report import print_verified_summary, write_merged_outputs
 
-    return findings
+extractor = FindingsExtractor()
 
-def voting_ensemble(reports, threshold=3):
-    """Merge findings using voting - only include items in threshold+ reports"""
+def voting_ensemble(findings_per_report, threshold=3, inventory=None):
+    """
+    Merge findings using voting - only include items in threshold+ reports
 
-    counters = {
-        'ajax_endpoints': Counter(),
-        'wsdl_files': Counter(),
-        'shortcodes': Counter(),
-        'wc_hooks': Counter(),
-        'cpt': Counter(),
-    }
+    With a static inventory, its items are verified instead. Returns
+    (verified, unconfirmed).
+    """
+
+    counters = {name: Counter() for name in extractor.category_names}
 
     # Count occurrences across all reports
-    for report in reports:
-        findings = extract_findings(report)
+    for findings in findings_per_report:
         for category, items in findings.items():
             counters[category].update(items)
 
-    # Filter by voting threshold
-    verified = {}
-    for category, counter in counters.items():
-        verified[category] = {
-            item: count
-            for item, count in counter.items()
-            if count >= threshold
-        }
-
-    return verified
-
-def generate_merged_report(verified, num_runs, threshold):
-    """Generate final merged report with confidence scores"""
-
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    report = f"""# Merged Technical Analysis Report
-## ELTA Courier Voucher for WooCommerce
-
-**Analysis Method:** Voting Ensemble ({num_runs} runs of competitor_analyst)  
-**Voting Threshold:** {threshold}/{num_runs} runs  
-**Generated:** {timestamp}  
-**Confidence:** Items verified in {threshold}+ runs only
-
----
-
-## Executive Summary
-
-This report merges findings from {num_runs} independent runs of the **competitor_analyst agent**.
-
-Only findings that appear in at least {threshold} runs are included, which:
-- ✅ Filters out hallucinations (appear in only 1-2 runs)
-- ✅ Increases confidence in findings
-- ✅ Improves accuracy from ~88% to ~94%
-
-**Confidence Levels:**
-- ✅✅✅✅✅ Found in all {num_runs} runs (highest confidence)
-- ✅✅✅✅ Found in 4 runs (very high confidence)
-- ✅✅✅ Found in {threshold} runs (verified)
-
----
-
-## AJAX Endpoints
-
-**Total Verified:** {len(verified['ajax_endpoints'])}
-
-"""
-
-    # AJAX Endpoints
-    ajax = verified['ajax_endpoints']
-    if ajax:
-        for endpoint, count in sorted(ajax.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{endpoint}` {confidence} ({count}/{num_runs} runs)\n"
-    else:
-        report += f"_No AJAX endpoints found in {threshold}+ runs_\n"
-
-    # WSDL Files
-    report += f"\n---\n\n## WSDL Files\n\n**Total Verified:** {len(verified['wsdl_files'])}\n\n"
-    wsdl = verified['wsdl_files']
-    if wsdl:
-        for file, count in sorted(wsdl.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{file}` {confidence} ({count}/{num_runs} runs)\n"
-    else:
-        report += f"_No WSDL files found in {threshold}+ runs_\n"
-
-    # Shortcodes
-    report += f"\n---\n\n## Shortcodes\n\n**Total Verified:** {len(verified['shortcodes'])}\n\n"
-    shortcodes = verified['shortcodes']
-    if shortcodes:
-        for sc, count in sorted(shortcodes.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `[{sc}]` {confidence} ({count}/{num_runs} runs)\n"
-    else:
-        report += f"_No shortcodes found in {threshold}+ runs_\n"
-
-    # WooCommerce Hooks
-    report += f"\n---\n\n## WooCommerce Hooks\n\n**Total Verified:** {len(verified['wc_hooks'])}\n\n"
-    hooks = verified['wc_hooks']
-    if hooks:
-        for hook, count in sorted(hooks.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{hook}` {confidence} ({count}/{num_runs} runs)\n"
-    else:
-        report += f"_No WooCommerce hooks found in {threshold}+ runs_\n"
-
-    # Custom Post Types
-    report += f"\n---\n\n## Custom Post Types\n\n**Total Verified:** {len(verified['cpt'])}\n\n"
-    cpt = verified['cpt']
-    if cpt:
-        for name, count in sorted(cpt.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{name}` {confidence} ({count}/{num_runs} runs)\n"
-    else:
-        report += f"_No custom post types found in {threshold}+ runs_\n"
-
-    # Statistics
-    report += f"""
----
-
-## Analysis Statistics
-
-- **Agent:** competitor_analyst
-- **Total runs:** {num_runs}
-- **Voting threshold:** {threshold}/{num_runs} runs
-- **Verified AJAX endpoints:** {len(ajax)}
-- **Verified WSDL files:** {len(wsdl)}
-- **Verified shortcodes:** {len(shortcodes)}
-- **Verified WooCommerce hooks:** {len(hooks)}
-- **Verified CPTs:** {len(cpt)}
-
----
-
-## Recommendations
-
-For findings with ✅✅✅✅✅ (all runs): **Highest confidence - use directly**  
-For findings with ✅✅✅✅ (4 runs): **Very high confidence - minimal verification needed**  
-For findings with ✅✅✅ ({threshold} runs): **Good confidence - verify if critical**  
-For items in only 1-2 runs: **Low confidence - likely hallucination**
-
----
-
-_Report generated by merge_results.py_  
-_Agent: competitor_analyst | Runs: {num_runs} | Threshold: {threshold}_
-"""
-
-    return report
+    return verify_findings(counters, threshold, inventory)
 
 def main():
     output_dir = Path('outputs/analysis')
@@ -179,7 +48,7 @@ def main():
     print("Merging 5 Technical Analysis Reports")
     print("="*70 + "\n")
 
-    # Read all 5 reports
+    # Extract findings from all 5 reports (streamed, reports are never held in memory)
     reports = []
     for i in range(1, 6):
         report_path = output_dir / f'run{i}-technical-analysis.md'
@@ -187,42 +56,42 @@ def main():
             print(f"⚠️  Missing: {report_path}")
             continue
 
-        with open(report_path) as f:
-            report = f.read()
-
-        reports.append(report)
+        reports.append(extractor.extract_file(report_path))
         print(f"✓ Loaded run{i}-technical-analysis.md")
 
-    if len(reports) < 3:
-        print(f"\n❌ Need at least 3 reports to merge (found {len(reports)})")
+    # With the static inventory a single report is enough: its items are verified from the source
+    inventory = load_inventory(plugin_path=str(Path('inputs/competitor-plugin').resolve()))
+    needed = 1 if inventory else 3
+    if len(reports) < needed:
+        print(f"\n❌ Need at least {needed} reports to merge (found {len(reports)})")
         return
 
     print(f"\n{'='*70}")
-    print(f"Applying voting ensemble (threshold: 3/{len(reports)} runs)...")
+    if inventory:
+        print(f"Verifying against static inventory (outputs/analysis/static-inventory.json) and voting (threshold: 3/{len(reports)} runs)...")
+    else:
+        print(f"Applying voting ensemble (threshold: 3/{len(reports)} runs)...")
     print(f"{'='*70}\n")
 
-    # Merge with voting
-    verified = voting_ensemble(reports, threshold=3)
-
-    # Generate merged report
-    merged_report = generate_merged_report(verified, len(reports), 3)
+    # Merge with voting (plus the static inventory, if there is one)
+    verified, unconfirmed = voting_ensemble(reports, threshold=3, inventory=inventory)
 
-    # Save
-    output_path = output_dir / 'MERGED-technical-analysis.md'
-    with open(output_path, 'w') as f:
-        f.write(merged_report)
+    # Stream merged report (plus JSON/CSV findings) to disk
+    output_path = write_merged_outputs(
+        output_dir, extractor.categories, verified, len(reports), 3,
+        generated_by='merge_results.py',
+        unconfirmed=unconfirmed if inventory else None,
+        in_source=inventory['findings'] if inventory else None
+    )
 
     # Print summary
     print(f"{'='*70}")
     print("✓ Merge Complete!")
     print(f"{'='*70}\n")
-    print(f"Merged report saved to: {output_path}\n")
-    print(f"Final Results (verified in 3+ runs):")
-    print(f"  • AJAX Endpoints:     {len(verified['ajax_endpoints'])}")
-    print(f"  • WSDL Files:         {len(verified['wsdl_files'])}")
-    print(f"  • Shortcodes:         {len(verified['shortcodes'])}")
-    print(f"  • WooCommerce Hooks:  {len(verified['wc_hooks'])}")
-    print(f"  • Custom Post Types:  {len(verified['cpt'])}")
+    print(f"Merged report saved to: {output_path}")
+    print(f"Findings data saved to: {output_dir / 'MERGED-findings.json'}, {output_dir / 'MERGED-findings.csv'}\n")
+    print(f"Final Results ({'found in source or ' if inventory else ''}verified in 3+ runs):")
+    print_verified_summary(extractor.categories, verified)
     print()
 
 if __name__ == '__main__':
@@ -15,8 +15,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from crewai import Agent, Task, Crew, Process
-from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool
-import yaml
+from dev_team.config_loader import fill_placeholders, load_config
+from dev_team.ensemble.inventory import inventory_input
+from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool, SymbolSearchTool
 
 def main():
     # Paths
@@ -24,11 +25,8 @@ def main():
     skeleton_path = str(Path('inputs/skeleton-plugin').resolve())
 
     # Load configs
-    with open('src/dev_team/config/agents.yaml') as f:
-        agents_config = yaml.safe_load(f)
-
-    with open('src/dev_team/config/strategy_tasks.yaml') as f:
-        tasks_config = yaml.safe_load(f)
+    agents_config = load_config('src/dev_team/config/agents.yaml')
+    tasks_config = load_config('src/dev_team/config/strategy_tasks.yaml')
 
     # Create competitor_analyst agent
     agent_config = agents_config['competitor_analyst']
@@ -43,8 +41,9 @@ def main():
         allow_delegation=agent_config.get('allow_delegation', False),
         tools=[
             DirectoryListTool(),
-            FileReaderTool(),
-            FindFilesTool()
+            FileReaderTool(token_budget=agent_config.get('read_token_budget')),
+            FindFilesTool(),
+            SymbolSearchTool()
         ]
     )
 
@@ -53,8 +52,11 @@ def main():
     base_description = task_config['description']
 
     # Replace placeholders
-    base_description = base_description.replace('{competitor_plugin_path}', competitor_path)
-    base_description = base_description.replace('{skeleton_plugin_path}', skeleton_path)
+    base_description = fill_placeholders(base_description, {
+        'competitor_plugin_path': competitor_path,
+        'skeleton_plugin_path': skeleton_path,
+        'static_inventory': inventory_input(competitor_path),
+    })
 
     tasks = []
 
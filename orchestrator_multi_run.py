@@ -5,26 +5,48 @@ Multi-Run Orchestrator with Voting Ensemble
 Runs ONLY the competitor_analyst agent 5 times and merges results using voting logic
 to increase accuracy from 88% to ~93%.
 
+With --adaptive, findings are re-voted after every run and the ensemble stops
+as soon as the remaining runs can no longer change the verified set (e.g.
+after 3 of 5 runs when every item is unanimous or can no longer reach the
+threshold; items in the static inventory count as verified from the start).
+
+With --concurrent K, up to K runs are in flight at once (each logging to
+outputs/analysis/run<N>-crew.txt). Adaptive mode then cancels the queued and
+running runs as soon as the findings settle, and Ctrl+C stops every running
+crew after its current LLM call.
+
 Usage:
     python orchestrator_multi_run.py
+    python orchestrator_multi_run.py --adaptive
+    python orchestrator_multi_run.py --adaptive --concurrent 2 --timeout 1800
 """
 
 import sys
-import re
+import argparse
+import asyncio
 from pathlib import Path
 from collections import Counter
-from datetime import datetime
 
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
 
 from dev_team.crews.strategy_crew import StrategyCrew
+from dev_team.ensemble.findings import FindingsExtractor
+from dev_team.ensemble.inventory import load_inventory, verified_can_change, verify_findings
+from dev_team.ensemble.report import print_verified_summary, write_merged_outputs
+from dev_team.tracing import start_trace
 
 class MultiRunOrchestrator:
 
-    def __init__(self, num_runs=5, voting_threshold=3):
+    def __init__(self, num_runs=5, voting_threshold=3, adaptive=False, concurrency=1, timeout=None):
         self.num_runs = num_runs
         self.voting_threshold = voting_threshold
+        self.adaptive = adaptive
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.runs_saved = 0
+        self.report_runs = []  # Run number of each collected report, in collection order
+        self.extractor = FindingsExtractor()
         self.output_dir = Path('outputs/analysis')
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -33,281 +55,212 @@ class MultiRunOrchestrator:
         self.skeleton_path = str(Path('inputs/skeleton-plugin').resolve())
 
     def run_analysis_multiple_times(self):
-        """Run competitor_analyst task multiple times and collect reports"""
+        """
+        Run competitor_analyst task multiple times and collect reports
+
+        In adaptive mode, stops early once the verified findings are settled
+        and records the skipped runs in self.runs_saved.
+        """
 
         print(f"\n{'='*70}")
-        print(f"Running Competitor Analysis Agent {self.num_runs} times")
+        print(f"Running Competitor Analysis Agent {'up to ' if self.adaptive else ''}{self.num_runs} times")
         print(f"Agent: competitor_analyst (from strategy_crew)")
         print(f"{'='*70}\n")
 
         reports = []
+        counters = {name: Counter() for name in self.extractor.category_names}
 
         for i in range(1, self.num_runs + 1):
-            print(f"\n{'─'*70}")
-            print(f"RUN {i}/{self.num_runs}")
-            print(f"{'─'*70}\n")
-
-            try:
-                # Create strategy crew instance
-                strategy_crew_instance = StrategyCrew()
-
-                # Get the crew object
-                crew = strategy_crew_instance.crew()
-
-                # Prepare inputs
-                inputs = {
-                    'competitor_plugin_path': self.competitor_path,
-                    'skeleton_plugin_path': self.skeleton_path
-                }
-
-                print(f"Starting competitor_analyst analysis...")
-                print(f"Competitor: {self.competitor_path}")
-                print(f"Skeleton: {self.skeleton_path}\n")
-
-                # Run the crew (which will execute all tasks including analyze_competitor)
-                result = crew.kickoff(inputs=inputs)
-
-                # The result should contain the technical analysis
-                # Save to the standard location
-                report_path = self.output_dir / 'technical-analysis.md'
-
-                if not report_path.exists():
-                    print(f"⚠️  Run {i} produced no output file")
-                    continue
-
-                with open(report_path) as f:
-                    report = f.read()
-
-                # Save a copy
-                backup_path = self.output_dir / f'run{i}-technical-analysis.md'
-                with open(backup_path, 'w') as f:
-                    f.write(report)
-
+            report = self.run_once(i)
+            if report is not None:
                 reports.append(report)
-                print(f"\n✓ Run {i} complete - Saved to {backup_path}")
-
-            except Exception as e:
-                print(f"⚠️  Run {i} failed with error: {e}")
-                import traceback
-                traceback.print_exc()
-                continue
+                self.report_runs.append(i)
+                for category, items in self.extract_findings(report).items():
+                    counters[category].update(items)
+
+            runs_left = self.num_runs - i
+            if self.adaptive and runs_left:
+                if not verified_can_change(counters, self.voting_threshold, runs_left,
+                                           load_inventory(plugin_path=self.competitor_path)):
+                    self.runs_saved = runs_left
+                    print(f"\n⏹️  Verified findings settled after {i} runs - "
+                          f"the remaining {runs_left} cannot change them, stopping early")
+                    break
+                print(f"   Findings not settled yet - {runs_left} runs left")
 
         return reports
 
-    def extract_findings(self, report):
-        """Extract structured findings from a report"""
-
-        findings = {
-            'ajax_endpoints': set(re.findall(r'wp_ajax_[\w_]+', report)),
-            'wsdl_files': set(re.findall(r'([\w]+\.wsdl)', report)),
-            'shortcodes': set(re.findall(r'\[([a-zA-Z_][a-zA-Z0-9_]*)\]', report)),
-            'wc_hooks': set(re.findall(r'woocommerce_[\w_]+', report)),
-            'cpt': set(re.findall(r'(?:CPT|Custom Post Type):\s*([a-z_]+)', report, re.IGNORECASE)),
-            'cron_jobs': set(re.findall(r'wp_schedule|cron.*?([a-z_]+)', report, re.IGNORECASE)),
-        }
-
-        return findings
-
-    def voting_ensemble(self, reports):
-        """Merge findings using voting - only include items in threshold+ reports"""
-
-        counters = {
-            'ajax_endpoints': Counter(),
-            'wsdl_files': Counter(),
-            'shortcodes': Counter(),
-            'wc_hooks': Counter(),
-            'cpt': Counter(),
-            'cron_jobs': Counter(),
-        }
-
-        # Count occurrences across all reports
-        for report in reports:
-            findings = self.extract_findings(report)
-            for category, items in findings.items():
-                counters[category].update(items)
-
-        # Filter by voting threshold
-        verified = {}
-        for category, counter in counters.items():
-            verified[category] = {
-                item: count
-                for item, count in counter.items()
-                if count >= self.voting_threshold
-            }
-
-        return verified
-
-    def generate_merged_report(self, verified, reports):
-        """Generate final merged report with confidence scores"""
-
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-        report = f"""# Merged Technical Analysis Report
-## ELTA Courier Voucher for WooCommerce
-
-**Analysis Method:** Voting Ensemble ({self.num_runs} runs of competitor_analyst)  
-**Voting Threshold:** {self.voting_threshold}/{self.num_runs} runs  
-**Generated:** {timestamp}  
-**Confidence:** Items verified in {self.voting_threshold}+ runs only
-
----
-
-## Executive Summary
-
-This report merges findings from {self.num_runs} independent runs of the **competitor_analyst agent**.
-Only findings that appear in at least {self.voting_threshold} runs are included, which:
-- ✅ Filters out hallucinations (appear in only 1-2 runs)
-- ✅ Increases confidence in findings
-- ✅ Improves accuracy from ~88% to ~94%
+    async def run_analysis_concurrently(self):
+        """
+        run_analysis_multiple_times with up to self.concurrency runs at once
 
-**Confidence Levels:**
-- ✅✅✅✅✅ Found in all {self.num_runs} runs (highest confidence)
-- ✅✅✅✅ Found in 4 runs (very high confidence)
-- ✅✅✅ Found in {self.voting_threshold} runs (verified)
+        Runs finish in any order; in adaptive mode the findings are re-voted
+        as each one does. Once they are settled, the runs still queued or in
+        flight are cancelled (a running crew stops after its current LLM
+        call) and counted in self.runs_saved. A run still going after
+        self.timeout seconds is stopped and counts as failed.
+        """
+        from dev_team.async_kickoff import run_in_thread
 
----
+        print(f"\n{'='*70}")
+        print(f"Running Competitor Analysis Agent {'up to ' if self.adaptive else ''}{self.num_runs} times, "
+              f"{self.concurrency} at a time")
+        print(f"Agent: competitor_analyst (from strategy_crew)")
+        print(f"Per-run logs: outputs/analysis/run<N>-crew.txt")
+        print(f"{'='*70}\n")
 
-## AJAX Endpoints
+        semaphore = asyncio.Semaphore(self.concurrency)
 
-**Total Verified:** {len(verified['ajax_endpoints'])}
+        async def run(i):
+            async with semaphore:
+                return await run_in_thread(self.run_once, i, self.output_dir / f'run{i}-crew.txt',
+                                           timeout=self.timeout, name=f'run {i}')
 
-"""
+        pending = {asyncio.create_task(run(i)): i for i in range(1, self.num_runs + 1)}
+        reports = []
+        counters = {name: Counter() for name in self.extractor.category_names}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    i = pending.pop(finished)
+                    try:
+                        report = finished.result()
+                    except TimeoutError as e:
+                        print(f"⚠️  Run {i} failed with error: {e}")
+                        continue
+                    if report is not None:
+                        reports.append(report)
+                        self.report_runs.append(i)
+                        for category, items in self.extract_findings(report).items():
+                            counters[category].update(items)
+
+                runs_left = len(pending)
+                if self.adaptive and runs_left:
+                    if not verified_can_change(counters, self.voting_threshold, runs_left,
+                                           load_inventory(plugin_path=self.competitor_path)):
+                        self.runs_saved = runs_left
+                        print(f"\n⏹️  Verified findings settled after {self.num_runs - runs_left} runs - "
+                              f"cancelling the remaining {runs_left}")
+                        break
+                    print(f"   Findings not settled yet - {runs_left} runs left")
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
-        # AJAX Endpoints
-        ajax = verified['ajax_endpoints']
-        if ajax:
-            for endpoint, count in sorted(ajax.items(), key=lambda x: (-x[1], x[0])):
-                confidence = '✅' * min(count, 5)
-                report += f"- `{endpoint}` {confidence} ({count}/{self.num_runs} runs)\n"
-        else:
-            report += f"_No AJAX endpoints found in {self.voting_threshold}+ runs_\n"
-
-        # WSDL Files
-        report += f"\n---\n\n## WSDL Files\n\n**Total Verified:** {len(verified['wsdl_files'])}\n\n"
-        wsdl = verified['wsdl_files']
-        if wsdl:
-            for file, count in sorted(wsdl.items(), key=lambda x: (-x[1], x[0])):
-                confidence = '✅' * min(count, 5)
-                report += f"- `{file}` {confidence} ({count}/{self.num_runs} runs)\n"
-        else:
-            report += f"_No WSDL files found in {self.voting_threshold}+ runs_\n"
-
-        # Shortcodes
-        report += f"\n---\n\n## Shortcodes\n\n**Total Verified:** {len(verified['shortcodes'])}\n\n"
-        shortcodes = verified['shortcodes']
-        if shortcodes:
-            for sc, count in sorted(shortcodes.items(), key=lambda x: (-x[1], x[0])):
-                confidence = '✅' * min(count, 5)
-                report += f"- `[{sc}]` {confidence} ({count}/{self.num_runs} runs)\n"
-        else:
-            report += f"_No shortcodes found in {self.voting_threshold}+ runs_\n"
-
-        # WooCommerce Hooks
-        report += f"\n---\n\n## WooCommerce Hooks\n\n**Total Verified:** {len(verified['wc_hooks'])}\n\n"
-        hooks = verified['wc_hooks']
-        if hooks:
-            for hook, count in sorted(hooks.items(), key=lambda x: (-x[1], x[0])):
-                confidence = '✅' * min(count, 5)
-                report += f"- `{hook}` {confidence} ({count}/{self.num_runs} runs)\n"
-        else:
-            report += f"_No WooCommerce hooks found in {self.voting_threshold}+ runs_\n"
-
-        # Custom Post Types
-        report += f"\n---\n\n## Custom Post Types\n\n**Total Verified:** {len(verified['cpt'])}\n\n"
-        cpt = verified['cpt']
-        if cpt:
-            for name, count in sorted(cpt.items(), key=lambda x: (-x[1], x[0])):
-                confidence = '✅' * min(count, 5)
-                report += f"- `{name}` {confidence} ({count}/{self.num_runs} runs)\n"
-        else:
-            report += f"_No custom post types found in {self.voting_threshold}+ runs_\n"
+        return reports
 
-        # Statistics
-        report += f"""
----
+    def run_once(self, i, log_file=None):
+        """
+        Run analyze_competitor once; returns the technical analysis, or None if the run failed
 
-## Analysis Statistics
+        With log_file, the crew logs there instead of the console.
+        """
 
-- **Agent:** competitor_analyst (from strategy_crew)
-- **Total runs completed:** {len(reports)}
-- **Voting threshold:** {self.voting_threshold}/{self.num_runs} runs
-- **Verified AJAX endpoints:** {len(ajax)}
-- **Verified WSDL files:** {len(wsdl)}
-- **Verified shortcodes:** {len(shortcodes)}
-- **Verified WooCommerce hooks:** {len(hooks)}
-- **Verified CPTs:** {len(cpt)}
+        print(f"\n{'─'*70}")
+        print(f"RUN {i}/{self.num_runs}")
+        print(f"{'─'*70}\n")
 
----
+        try:
+            # Create strategy crew instance (own LLM cache namespace per run,
+            # so cached completions never make the runs identical)
+            strategy_crew_instance = StrategyCrew(llm_cache_namespace=f'ensemble-run{i}')
 
-## Methodology
+            # Prepare inputs
+            inputs = {
+                'competitor_plugin_path': self.competitor_path,
+                'skeleton_plugin_path': self.skeleton_path
+            }
 
-### Voting Ensemble Logic
+            print(f"Starting competitor_analyst analysis...")
+            print(f"Competitor: {self.competitor_path}")
+            print(f"Skeleton: {self.skeleton_path}\n")
 
-1. Run competitor_analyst agent {self.num_runs} times independently
-2. Extract structured findings from each report
-3. Count occurrences of each finding across all runs
-4. Only include findings that appear in {self.voting_threshold}+ runs
-5. Assign confidence scores based on frequency
+            # Run only analyze_competitor - research_market and create_roadmap
+            # are not part of the ensemble. The report comes back in memory and
+            # is saved straight to this run's file.
+            backup_path = self.output_dir / f'run{i}-technical-analysis.md'
+            output = strategy_crew_instance.run_task('analyze_competitor', inputs, output_file=str(backup_path),
+                                                     log_file=str(log_file) if log_file else None)
 
-### Benefits
+            report = output.raw if output else ''
+            if not report.strip():
+                print(f"⚠️  Run {i} produced no report")
+                return None
 
-- **Reduces hallucinations:** Fabricated items typically appear in only 1-2 runs
-- **Increases coverage:** Different runs may find different items
-- **Provides confidence scores:** Know which findings are most reliable
-- **Improves accuracy:** From ~88% (single run) to ~94% (5-run ensemble)
+            print(f"\n✓ Run {i} complete - Saved to {backup_path}")
+            return report
 
-### Individual Reports
+        except Exception as e:
+            print(f"⚠️  Run {i} failed with error: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
 
-View individual run results:
-"""
+    def extract_findings(self, report):
+        """Extract structured findings from a report"""
 
-        for i in range(1, len(reports) + 1):
-            report += f"- `outputs/analysis/run{i}-technical-analysis.md`\n"
+        return self.extractor.extract(report)
 
-        report += f"""
----
+    def voting_ensemble(self, reports, inventory=None):
+        """
+        Merge findings using voting - only include items in threshold+ reports
 
-## Recommendations
+        With the static inventory (saved when StrategyCrew kicks off), its
+        items are verified as well. Returns (verified, unconfirmed).
+        """
 
-For findings with ✅✅✅✅✅ (all runs): **Highest confidence - use directly**  
-For findings with ✅✅✅✅ (4 runs): **Very high confidence - minimal verification needed**  
-For findings with ✅✅✅ ({self.voting_threshold} runs): **Good confidence - verify if critical**  
-For items in only 1-2 runs: **Low confidence - likely hallucination or edge case**
+        counters = {name: Counter() for name in self.extractor.category_names}
 
-Consider manual verification for security-critical findings.
+        # Count occurrences across all reports
+        for report in reports:
+            findings = self.extract_findings(report)
+            for category, items in findings.items():
+                counters[category].update(items)
 
----
+        return verify_findings(counters, self.voting_threshold, inventory)
 
-_Report generated by Multi-Run Orchestrator with Voting Ensemble_  
-_Agent: competitor_analyst | Runs: {self.num_runs} | Threshold: {self.voting_threshold}_
-"""
+    def write_merged_report(self, verified, reports, unconfirmed=None, inventory=None):
+        """Stream the merged report (plus JSON/CSV findings) to the output dir"""
 
-        return report
+        return write_merged_outputs(
+            self.output_dir, self.extractor.categories, verified, len(reports), self.voting_threshold,
+            generated_by='Multi-Run Orchestrator with Voting Ensemble',
+            agent='competitor_analyst (from strategy_crew)',
+            run_files=[f'outputs/analysis/run{i}-technical-analysis.md' for i in self.report_runs],
+            unconfirmed=unconfirmed,
+            in_source=inventory['findings'] if inventory else None
+        )
 
     def run(self):
         """Main execution flow"""
 
         # Run analyses
-        reports = self.run_analysis_multiple_times()
+        if self.concurrency > 1 or self.timeout is not None:
+            reports = asyncio.run(self.run_analysis_concurrently())
+        else:
+            reports = self.run_analysis_multiple_times()
 
-        if len(reports) < 2:
-            print("\n❌ Not enough successful runs (need at least 2)")
+        # With the static inventory a single report is enough: its items are verified from the source
+        inventory = load_inventory(plugin_path=self.competitor_path)
+        needed = 1 if inventory else 2
+        if len(reports) < needed:
+            print(f"\n❌ Not enough successful runs (need at least {needed})")
             return
 
         print(f"\n{'='*70}")
-        print(f"Merging {len(reports)} reports with voting ensemble...")
+        if inventory:
+            print(f"Merging {len(reports)} reports with voting ensemble and the static inventory...")
+        else:
+            print(f"Merging {len(reports)} reports with voting ensemble...")
         print(f"{'='*70}\n")
 
-        # Merge with voting
-        verified = self.voting_ensemble(reports)
-
-        # Generate merged report
-        merged_report = self.generate_merged_report(verified, reports)
+        # Merge with voting (plus the static inventory)
+        verified, unconfirmed = self.voting_ensemble(reports, inventory)
 
-        # Save merged report
-        output_path = self.output_dir / 'MERGED-technical-analysis.md'
-        with open(output_path, 'w') as f:
-            f.write(merged_report)
+        # Write merged report
+        output_path = self.write_merged_report(verified, reports, unconfirmed if inventory else None, inventory)
 
         # Print summary
         print(f"\n{'='*70}")
@@ -315,27 +268,78 @@ _Agent: competitor_analyst | Runs: {self.num_runs} | Threshold: {self.voting_thr
         print(f"{'='*70}\n")
         print(f"Agent: competitor_analyst (strategy_crew)")
         print(f"Runs completed: {len(reports)}/{self.num_runs}")
+        if self.adaptive:
+            print(f"Runs saved by early stopping: {self.runs_saved}")
         print(f"Merged report saved to: {output_path}\n")
-        print(f"Final Results (verified in {self.voting_threshold}+ runs):")
-        print(f"  • AJAX Endpoints:     {len(verified['ajax_endpoints'])}")
-        print(f"  • WSDL Files:         {len(verified['wsdl_files'])}")
-        print(f"  • Shortcodes:         {len(verified['shortcodes'])}")
-        print(f"  • WooCommerce Hooks:  {len(verified['wc_hooks'])}")
-        print(f"  • Custom Post Types:  {len(verified['cpt'])}")
+        print(f"Final Results ({'found in source or ' if inventory else ''}verified in {self.voting_threshold}+ runs):")
+        print_verified_summary(self.extractor.categories, verified)
         print()
 
 
 def main():
     """Entry point"""
 
+    parser = argparse.ArgumentParser(description='Multi-run competitor analysis with voting ensemble')
+    parser.add_argument(
+        '--runs',
+        type=int,
+        default=5,
+        help='Number of analysis runs - the maximum in adaptive mode (default: 5)'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=int,
+        default=3,
+        help='Voting threshold - items must appear in N runs (default: 3, a 60%% majority of 5)'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        help='Re-vote after each run and stop once further runs cannot change the verified findings'
+    )
+    parser.add_argument(
+        '--concurrent',
+        type=int,
+        default=1,
+        metavar='K',
+        help='Runs in flight at once, each logging to outputs/analysis/run<N>-crew.txt (default: 1)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='Stop a run still going after this many seconds (default: no limit)'
+    )
+    args = parser.parse_args()
+
+    if args.threshold > args.runs:
+        print(f"❌ ERROR: Threshold ({args.threshold}) cannot be greater than runs ({args.runs})")
+        return 1
+
+    if args.concurrent < 1:
+        print(f"❌ ERROR: --concurrent must be at least 1 (got {args.concurrent})")
+        return 1
+
     orchestrator = MultiRunOrchestrator(
-        num_runs=5,           # Run competitor_analyst 5 times
-        voting_threshold=3    # Must appear in 3+ runs (60% majority)
+        num_runs=args.runs,
+        voting_threshold=args.threshold,
+        adaptive=args.adaptive,
+        concurrency=args.concurrent,
+        timeout=args.timeout
     )
 
-    orchestrator.run()
+    trace_path = start_trace('multi-run')
+    try:
+        orchestrator.run()
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted - completed runs are in outputs/analysis/run<N>-technical-analysis.md")
+        return 130
+    if trace_path:
+        print(f"Trace: {trace_path} (run trace_summary for the time sinks per task)\n")
+    return 0
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
 
@@ -14,13 +14,19 @@ Options:
     --runs N        Number of runs (default: 5)
     --threshold N   Voting threshold (default: 3)
     --skip-analysis Skip the analysis phase and only merge existing results
+    --parallel K    Run each analysis as its own crew, K at a time
+    --timeout S     With --parallel, stop a run still going after S seconds
+    --no-inventory  Merge by voting only, ignoring the static inventory
+
+The competitor plugin is scanned once into outputs/analysis/static-inventory.json
+(AJAX endpoints, shortcodes, hooks, WSDL files, ...). Every run sees it in its
+prompt, and the merge verifies its items from the source, on top of the vote.
 """
 
 import sys
 import argparse
 from pathlib import Path
 import time
-from datetime import datetime
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / 'src'))
@@ -40,104 +46,213 @@ def print_step(step_num, total_steps, text):
     print(f"{'─' * 70}\n")
 
 
-def run_analysis(num_runs=5):
-    """Run the competitor analyst multiple times"""
-    from crewai import Agent, Task, Crew, Process
-    from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool
-    import yaml
-
-    print_step(1, 3, f"Running competitor_analyst {num_runs} times")
-
-    # Paths
-    competitor_path = str(Path('inputs/competitor-plugin').resolve())
-    skeleton_path = str(Path('inputs/skeleton-plugin').resolve())
-
-    # Load configs
-    with open('src/dev_team/config/agents.yaml') as f:
-        agents_config = yaml.safe_load(f)
-
-    with open('src/dev_team/config/strategy_tasks.yaml') as f:
-        tasks_config = yaml.safe_load(f)
+def build_competitor_analyst(agent_config, verbose=None):
+    """Create a competitor_analyst agent with its own tool instances"""
+    from crewai import Agent
+    from dev_team.llm_cache import build_llm
+    from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool, SymbolSearchTool
 
-    # Create competitor_analyst agent
-    agent_config = agents_config['competitor_analyst']
-
-    competitor_analyst = Agent(
+    return Agent(
         role=agent_config['role'],
         goal=agent_config['goal'],
         backstory=agent_config['backstory'],
-        llm=agent_config['llm'],
+        llm=build_llm(agent_config),
         max_iter=agent_config.get('max_iter', 60),
-        verbose=agent_config.get('verbose', True),
+        verbose=agent_config.get('verbose', True) if verbose is None else verbose,
         allow_delegation=agent_config.get('allow_delegation', False),
         tools=[
             DirectoryListTool(),
-            FileReaderTool(),
-            FindFilesTool()
+            FileReaderTool(token_budget=agent_config.get('read_token_budget')),
+            FindFilesTool(),
+            SymbolSearchTool()
         ]
     )
 
-    # Get task config
-    task_config = tasks_config['analyze_competitor']
-    base_description = task_config['description']
-
-    # Replace placeholders
-    base_description = base_description.replace('{competitor_plugin_path}', competitor_path)
-    base_description = base_description.replace('{skeleton_plugin_path}', skeleton_path)
-
-    tasks = []
 
-    # Create N tasks for the same agent
-    print(f"Creating {num_runs} analysis tasks for competitor_analyst...\n")
+def build_analysis_task(run_num, num_runs, base_description, task_config, agent):
+    """Create the analysis task for run `run_num` (1-based)"""
+    from crewai import Task
 
-    for i in range(num_runs):
-        task = Task(
-            description=f"""
-**ANALYSIS RUN {i+1}/{num_runs}**
+    return Task(
+        description=f"""
+**ANALYSIS RUN {run_num}/{num_runs}**
 
 {base_description}
 
-**Special Instructions for Run {i+1}:**
-- This is run {i+1} of {num_runs} independent analyses
+**Special Instructions for Run {run_num}:**
+- This is run {run_num} of {num_runs} independent analyses
 - Focus on finding items that might be missed in other runs
 - Be thorough - different runs may focus on different aspects
-- Save output to outputs/analysis/run{i+1}-technical-analysis.md
+- Save output to outputs/analysis/run{run_num}-technical-analysis.md
             """,
-            expected_output=task_config['expected_output'],
-            agent=competitor_analyst,
-            output_file=f'outputs/analysis/run{i+1}-technical-analysis.md'
-        )
-        tasks.append(task)
-        print(f"  ✓ Created task {i+1}/{num_runs}")
+        expected_output=task_config['expected_output'],
+        agent=agent,
+        output_file=f'outputs/analysis/run{run_num}-technical-analysis.md'
+    )
 
-    # Create crew with all tasks
-    print(f"\n{'─' * 70}")
-    print(f"Creating crew with 1 agent and {num_runs} tasks")
-    print(f"{'─' * 70}\n")
+
+def run_single_analysis(run_num, num_runs, agent_config, task_config, base_description):
+    """
+    Run one analysis pass as its own isolated crew.
+
+    Each pass gets a fresh agent (and therefore fresh tools and memory), so
+    concurrent passes share nothing but the LLM server. Crew output is logged
+    to outputs/analysis/run{N}-crew.txt instead of the interleaved console.
+    """
+    from crewai import Crew, Process
+
+    agent = build_competitor_analyst(agent_config, verbose=False)
+    task = build_analysis_task(run_num, num_runs, base_description, task_config, agent)
 
     crew = Crew(
-        agents=[competitor_analyst],
-        tasks=tasks,
+        agents=[agent],
+        tasks=[task],
         process=Process.sequential,
-        verbose=True
+        verbose=False,
+        output_log_file=f'outputs/analysis/run{run_num}-crew.txt'
     )
 
-    # Run the crew
     start_time = time.time()
+    crew.kickoff()
+    return time.time() - start_time
+
+
+def run_analysis_parallel(num_runs, parallel, agent_config, task_config, base_description, timeout=None):
+    """
+    Run each analysis pass as an isolated crew, at most `parallel` at a time
+
+    The runs are coroutines on one event loop (see dev_team.async_kickoff):
+    Ctrl+C stops every running crew after its current LLM call instead of
+    waiting for each to finish, and a run still going after `timeout`
+    seconds is stopped and counted as failed.
+    """
+    import asyncio
+    from dev_team.async_kickoff import gather_limited, run_in_thread
+
+    workers = max(1, min(parallel, num_runs))
+
     print(f"{'─' * 70}")
-    print(f"Starting {num_runs} sequential analysis runs...")
-    print(f"Expected time: {num_runs * 5}-{num_runs * 6} minutes")
+    print(f"Starting {num_runs} isolated analysis runs ({workers} at a time)...")
+    print(f"Per-run logs: outputs/analysis/run<N>-crew.txt")
     print(f"{'─' * 70}\n")
 
-    result = crew.kickoff()
+    failed = []
+
+    async def run_one(run_num):
+        try:
+            elapsed = await run_in_thread(run_single_analysis, run_num, num_runs, agent_config, task_config,
+                                          base_description, timeout=timeout, name=f"run {run_num}")
+        except Exception as e:
+            failed.append(run_num)
+            print(f"  ✗ Run {run_num}/{num_runs} failed: {e}")
+            return
+        print(f"  ✓ Run {run_num}/{num_runs} complete ({int(elapsed // 60)}m {int(elapsed % 60)}s)")
+
+    async def run_all():
+        await gather_limited([run_one(i) for i in range(1, num_runs + 1)], workers)
+
+    asyncio.run(run_all())
+    return sorted(failed)
+
+
+def run_analysis(num_runs=5, parallel=None, timeout=None):
+    """
+    Run the competitor analyst multiple times
+
+    Args:
+        num_runs: Number of independent analysis passes
+        parallel: If set, run each pass as its own crew with at most this
+            many passes in flight. If None, run all passes as tasks of one
+            sequential crew.
+        timeout: With `parallel`, stop a pass still running after this many
+            seconds
+    """
+    from crewai import Crew, Process
+    from dev_team.config_loader import fill_placeholders, load_config
+    from dev_team.ensemble.inventory import inventory_input
+    from dev_team.tracing import span, start_trace
+
+    print_step(1, 3, f"Running competitor_analyst {num_runs} times")
+    trace_path = start_trace('full-analysis')
+
+    # Paths
+    competitor_path = str(Path('inputs/competitor-plugin').resolve())
+    skeleton_path = str(Path('inputs/skeleton-plugin').resolve())
+
+    # Load configs
+    agents_config = load_config('src/dev_team/config/agents.yaml')
+    tasks_config = load_config('src/dev_team/config/strategy_tasks.yaml')
+
+    agent_config = agents_config['competitor_analyst']
+
+    # Get task config
+    task_config = tasks_config['analyze_competitor']
+    base_description = task_config['description']
+
+    with span('step', 'static_inventory'):
+        static_inventory = inventory_input(competitor_path)
+
+    # Replace placeholders
+    base_description = fill_placeholders(base_description, {
+        'competitor_plugin_path': competitor_path,
+        'skeleton_plugin_path': skeleton_path,
+        'static_inventory': static_inventory,
+    })
+
+    start_time = time.time()
+
+    if parallel:
+        failed = run_analysis_parallel(num_runs, parallel, agent_config, task_config, base_description,
+                                       timeout=timeout)
+    else:
+        failed = []
+
+        agents = []
+        tasks = []
+
+        # Create N tasks, each with its own competitor_analyst so that every
+        # run starts with a full read budget (the tools count per instance)
+        print(f"Creating {num_runs} analysis tasks for competitor_analyst...\n")
+
+        for i in range(num_runs):
+            agent = build_competitor_analyst(agent_config)
+            task = build_analysis_task(i + 1, num_runs, base_description, task_config, agent)
+            agents.append(agent)
+            tasks.append(task)
+            print(f"  ✓ Created task {i+1}/{num_runs}")
+
+        # Create crew with all tasks
+        print(f"\n{'─' * 70}")
+        print(f"Creating crew with {num_runs} competitor_analyst agents and {num_runs} tasks")
+        print(f"{'─' * 70}\n")
+
+        crew = Crew(
+            agents=agents,
+            tasks=tasks,
+            process=Process.sequential,
+            verbose=True
+        )
+
+        # Run the crew
+        print(f"{'─' * 70}")
+        print(f"Starting {num_runs} sequential analysis runs...")
+        print(f"Expected time: {num_runs * 5}-{num_runs * 6} minutes")
+        print(f"{'─' * 70}\n")
+
+        result = crew.kickoff()
 
     elapsed = time.time() - start_time
     minutes = int(elapsed // 60)
     seconds = int(elapsed % 60)
 
     print(f"\n{'─' * 70}")
-    print(f"✓ All {num_runs} runs complete!")
+    if failed:
+        print(f"⚠️  {num_runs - len(failed)}/{num_runs} runs complete ({len(failed)} failed)")
+    else:
+        print(f"✓ All {num_runs} runs complete!")
     print(f"  Time elapsed: {minutes}m {seconds}s")
+    if trace_path:
+        print(f"  Trace: {trace_path} (run trace_summary for the time sinks per task)")
     print(f"{'─' * 70}\n")
 
     print("Output files:")
@@ -149,27 +264,36 @@ def run_analysis(num_runs=5):
         else:
             print(f"  ✗ outputs/analysis/run{i}-technical-analysis.md (MISSING)")
 
-    return True
+    # Merging still works with a partial set, but not with nothing
+    return len(failed) < num_runs
+
 
+def merge_results(num_runs=5, threshold=3, use_inventory=True):
+    """
+    Merge results from multiple runs
 
-def merge_results(num_runs=5, threshold=3):
-    """Merge results from multiple runs using voting logic"""
-    import re
+    Findings are verified by voting, plus the items of the static inventory
+    saved by the analysis runs (which alone decide the categories it lists
+    exhaustively); use_inventory=False votes only.
+    """
     from collections import Counter
+    from dev_team.ensemble.findings import FindingsExtractor
+    from dev_team.ensemble.inventory import INVENTORY_PATH, load_inventory, verify_findings
+    from dev_team.ensemble.report import write_merged_outputs
 
     print_step(2, 3, f"Merging {num_runs} reports (threshold: {threshold}/{num_runs})")
 
-    # Read all reports
+    extractor = FindingsExtractor()
+
+    # Extract findings from all reports (streamed in chunks)
     reports = []
     print("Reading report files...\n")
 
     for i in range(1, num_runs + 1):
         file_path = Path(f'outputs/analysis/run{i}-technical-analysis.md')
         if file_path.exists():
-            with open(file_path, 'r') as f:
-                content = f.read()
-                reports.append(content)
-                print(f"  ✓ Read run{i}-technical-analysis.md ({len(content)} chars)")
+            reports.append(extractor.extract_file(file_path))
+            print(f"  ✓ Read run{i}-technical-analysis.md ({file_path.stat().st_size} bytes)")
         else:
             print(f"  ✗ Missing run{i}-technical-analysis.md - SKIPPING")
 
@@ -179,200 +303,56 @@ def merge_results(num_runs=5, threshold=3):
 
     print(f"\n  Total reports loaded: {len(reports)}/{num_runs}")
 
-    # Extract findings
     print("\n" + "─" * 70)
-    print("Extracting findings from reports...")
+    print("Extracted findings")
     print("─" * 70 + "\n")
 
-    def extract_findings(report):
-        """Extract structured findings from a report"""
-        findings = {
-            'ajax_endpoints': set(re.findall(r'wp_ajax_[\w_]+', report)),
-            'wsdl_files': set(re.findall(r'([\w]+\.wsdl)', report)),
-            'shortcodes': set(re.findall(r'\[([a-zA-Z_][a-zA-Z0-9_]*)]', report)),
-            'wc_hooks': set(re.findall(r'woocommerce_[\w_]+', report)),
-            'cpt': set(re.findall(r'(?:CPT|Custom Post Type):\s*([a-z_]+)', report, re.IGNORECASE)),
-        }
-        return findings
-
     # Count occurrences
-    counters = {
-        'ajax_endpoints': Counter(),
-        'wsdl_files': Counter(),
-        'shortcodes': Counter(),
-        'wc_hooks': Counter(),
-        'cpt': Counter(),
-    }
-
-    for idx, report in enumerate(reports, 1):
-        findings = extract_findings(report)
+    counters = {name: Counter() for name in extractor.category_names}
+
+    for idx, findings in enumerate(reports, 1):
         print(f"Run {idx} findings:")
         for category, items in findings.items():
             if items:
                 print(f"  • {category}: {len(items)} items")
                 counters[category].update(items)
 
-    # Apply voting threshold
+    inventory = load_inventory(plugin_path=str(Path('inputs/competitor-plugin').resolve())) if use_inventory else None
+
+    # Verify by voting threshold, plus the static inventory if there is one
     print("\n" + "─" * 70)
-    print(f"Applying voting threshold ({threshold}/{len(reports)} runs)...")
+    if inventory:
+        print(f"Verifying against static inventory ({INVENTORY_PATH}) and voting threshold ({threshold}/{len(reports)} runs)...")
+    else:
+        print(f"Applying voting threshold ({threshold}/{len(reports)} runs)...")
     print("─" * 70 + "\n")
 
-    verified = {}
+    verified, unconfirmed = verify_findings(counters, threshold, inventory)
     for category, counter in counters.items():
-        verified[category] = {
-            item: count
-            for item, count in counter.items()
-            if count >= threshold
-        }
-        total_found = len(counter)
-        verified_count = len(verified[category])
-        filtered = total_found - verified_count
-        print(f"  {category}: {verified_count} verified (filtered {filtered} items)")
+        if inventory:
+            in_source = len(set(verified[category]) & set(inventory['findings'].get(category, ())))
+            print(f"  {category}: {len(verified[category])} verified ({in_source} in source), "
+                  f"{len(unconfirmed[category])} unconfirmed report items")
+        else:
+            filtered = len(counter) - len(verified[category])
+            print(f"  {category}: {len(verified[category])} verified (filtered {filtered} items)")
 
     # Generate merged report
     print("\n" + "─" * 70)
     print("Generating merged report...")
     print("─" * 70 + "\n")
 
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    report = f"""# Merged Technical Analysis Report
-## ELTA Courier Voucher for WooCommerce
-
-**Analysis Method:** Voting Ensemble ({len(reports)} runs of competitor_analyst)  
-**Voting Threshold:** {threshold}/{len(reports)} runs  
-**Generated:** {timestamp}  
-**Confidence:** Items verified in {threshold}+ runs only
-
----
-
-## Executive Summary
-
-This report merges findings from {len(reports)} independent runs of the **competitor_analyst agent**.
-
-Only findings that appear in at least {threshold} runs are included, which:
-- ✅ Filters out hallucinations (appear in only 1-2 runs)
-- ✅ Increases confidence in findings
-- ✅ Improves accuracy from ~88% to ~94%
-
-**Confidence Levels:**
-- ✅✅✅✅✅ Found in all {len(reports)} runs (highest confidence)
-- ✅✅✅✅ Found in 4 runs (very high confidence)
-- ✅✅✅ Found in {threshold} runs (verified)
-
----
-
-## AJAX Endpoints
-
-**Total Verified:** {len(verified['ajax_endpoints'])}
-
-"""
-
-    # AJAX Endpoints
-    ajax = verified['ajax_endpoints']
-    if ajax:
-        for endpoint, count in sorted(ajax.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{endpoint}` {confidence} ({count}/{len(reports)} runs)\n"
-    else:
-        report += f"_No AJAX endpoints found in {threshold}+ runs_\n"
-
-    # WSDL Files
-    report += f"\n---\n\n## WSDL Files\n\n**Total Verified:** {len(verified['wsdl_files'])}\n\n"
-    wsdl = verified['wsdl_files']
-    if wsdl:
-        for file, count in sorted(wsdl.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{file}` {confidence} ({count}/{len(reports)} runs)\n"
-    else:
-        report += f"_No WSDL files found in {threshold}+ runs_\n"
-
-    # Shortcodes
-    report += f"\n---\n\n## Shortcodes\n\n**Total Verified:** {len(verified['shortcodes'])}\n\n"
-    shortcodes = verified['shortcodes']
-    if shortcodes:
-        for sc, count in sorted(shortcodes.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `[{sc}]` {confidence} ({count}/{len(reports)} runs)\n"
-    else:
-        report += f"_No shortcodes found in {threshold}+ runs_\n"
-
-    # WooCommerce Hooks
-    report += f"\n---\n\n## WooCommerce Hooks\n\n**Total Verified:** {len(verified['wc_hooks'])}\n\n"
-    hooks = verified['wc_hooks']
-    if hooks:
-        for hook, count in sorted(hooks.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{hook}` {confidence} ({count}/{len(reports)} runs)\n"
-    else:
-        report += f"_No WooCommerce hooks found in {threshold}+ runs_\n"
-
-    # Custom Post Types
-    report += f"\n---\n\n## Custom Post Types\n\n**Total Verified:** {len(verified['cpt'])}\n\n"
-    cpt = verified['cpt']
-    if cpt:
-        for name, count in sorted(cpt.items(), key=lambda x: (-x[1], x[0])):
-            confidence = '✅' * min(count, 5)
-            report += f"- `{name}` {confidence} ({count}/{len(reports)} runs)\n"
-    else:
-        report += f"_No custom post types found in {threshold}+ runs_\n"
-
-    # Statistics
-    total_verified = sum(len(v) for v in verified.values())
-    report += f"""
----
-
-## Analysis Statistics
-
-- **Agent:** competitor_analyst
-- **Total runs:** {len(reports)}
-- **Voting threshold:** {threshold}/{len(reports)} runs
-- **Total verified items:** {total_verified}
-
-### Verification Breakdown
-
-| Category | Verified Items |
-|----------|----------------|
-| AJAX Endpoints | {len(verified['ajax_endpoints'])} |
-| WSDL Files | {len(verified['wsdl_files'])} |
-| Shortcodes | {len(verified['shortcodes'])} |
-| WooCommerce Hooks | {len(verified['wc_hooks'])} |
-| Custom Post Types | {len(verified['cpt'])} |
-
----
-
-## Methodology
-
-This report uses a **voting ensemble** approach:
-
-1. Run competitor_analyst {len(reports)} times independently
-2. Extract findings from each run
-3. Count how many times each item appears
-4. Only include items found in {threshold}+ runs
-
-**Benefits:**
-- Reduces hallucinations (items found in only 1-2 runs)
-- Increases confidence through consensus
-- Better coverage (different runs find different items)
-
-**Confidence Interpretation:**
-- Items with ✅✅✅✅✅ can be used directly
-- Items with ✅✅✅ should be verified if critical
-
----
-
-*Generated by: run_full_analysis.py*  
-*Timestamp: {timestamp}*
-"""
-
-    # Save merged report
-    output_path = Path('outputs/analysis/MERGED-technical-analysis.md')
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(output_path, 'w') as f:
-        f.write(report)
+    # Stream merged report (plus JSON/CSV findings) to disk
+    output_path = write_merged_outputs(
+        Path('outputs/analysis'), extractor.categories, verified, len(reports), threshold,
+        generated_by='run_full_analysis.py',
+        unconfirmed=unconfirmed if inventory else None,
+        in_source=inventory['findings'] if inventory else None
+    )
+    total_verified = sum(len(items) for items in verified.values())
 
     print(f"  ✓ Saved to: {output_path}")
+    print(f"  ✓ Findings data: outputs/analysis/MERGED-findings.json, MERGED-findings.csv")
     print(f"  ✓ Total verified items: {total_verified}")
 
     return True
@@ -418,6 +398,26 @@ def main():
         action='store_true',
         help='Skip analysis phase and only merge existing results'
     )
+    parser.add_argument(
+        '--no-inventory',
+        action='store_true',
+        help='Merge by voting only, without the static inventory'
+    )
+    parser.add_argument(
+        '--parallel',
+        type=int,
+        default=None,
+        metavar='K',
+        help='Run each analysis as an isolated crew, at most K concurrently '
+             '(default: all runs as one sequential crew)'
+    )
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        metavar='SECONDS',
+        help='With --parallel, stop a run still going after this many seconds (default: no limit)'
+    )
 
     args = parser.parse_args()
 
@@ -426,25 +426,35 @@ def main():
         print(f"❌ ERROR: Threshold ({args.threshold}) cannot be greater than runs ({args.runs})")
         return 1
 
+    if args.parallel is not None and args.parallel < 1:
+        print(f"❌ ERROR: --parallel must be at least 1 (got {args.parallel})")
+        return 1
+
+    if args.timeout is not None and not args.parallel:
+        print("❌ ERROR: --timeout needs --parallel (a sequential crew runs all passes as one)")
+        return 1
+
     print_header("🚀 Complete Multi-Run Analysis Workflow")
     print(f"Configuration:")
     print(f"  • Number of runs: {args.runs}")
     print(f"  • Voting threshold: {args.threshold}/{args.runs}")
     print(f"  • Skip analysis: {args.skip_analysis}")
+    print(f"  • Parallel runs: {args.parallel or 'off (sequential crew)'}")
 
     start_time = time.time()
 
     try:
         # Step 1: Run analysis (unless skipped)
         if not args.skip_analysis:
-            if not run_analysis(num_runs=args.runs):
+            if not run_analysis(num_runs=args.runs, parallel=args.parallel, timeout=args.timeout):
                 print("\n❌ Analysis failed!")
                 return 1
         else:
             print_step(1, 3, "Skipping analysis phase (using existing results)")
 
         # Step 2: Merge results
-        if not merge_results(num_runs=args.runs, threshold=args.threshold):
+        if not merge_results(num_runs=args.runs, threshold=args.threshold,
+                             use_inventory=not args.no_inventory):
             print("\n❌ Merge failed!")
             return 1
 
@@ -466,6 +476,7 @@ def main():
         return 0
 
     except KeyboardInterrupt:
+        # With --parallel the running crews have already stopped (see run_analysis_parallel)
         print("\n\n⚠️  Interrupted by user")
         return 130
     except Exception as e:
@@ -0,0 +1,120 @@
+"""
+Async kickoff for crews
+
+crew.kickoff() blocks its thread until the last task is done, so an
+orchestrator drove one crew at a time, and Ctrl+C during a thread-pool run
+left the worker threads finishing whole crews before the process exited.
+run_in_thread runs a blocking crew call (a kickoff, a phase function) in a
+worker thread as a coroutine: several can be gathered on one event loop
+(gather_limited bounds how many run at once), and cancelling the coroutine
+or exceeding its timeout stops the crew.
+
+A thread cannot be killed, so stopping is cooperative: every dev_team LLM
+(TracedLLM, see llm_cache.py) calls raise_if_cancelled() before each
+request, which raises CrewCancelled in the crew's thread. The request in
+flight finishes; nothing after it is sent. Tasks checkpointed before that
+(see checkpoints.py) are kept, so a stopped phase resumes where it stopped.
+
+Usage:
+    result = await run_in_thread(crew.kickoff, inputs=inputs, timeout=1800)
+    results = await gather_limited([run_in_thread(...) for ...], limit=2)
+
+asyncio.run() turns the first Ctrl+C into cancelling the main coroutine
+(and with it every crew it awaits); a second Ctrl+C stops waiting.
+"""
+import asyncio
+import threading
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+# Set in each worker thread's context by run_in_thread
+_stop_event: ContextVar[Optional[threading.Event]] = ContextVar('dev_team_crew_stop', default=None)
+
+
+class CrewCancelled(BaseException):
+    """
+    Raised in a crew's thread once its coroutine is cancelled or times out.
+
+    A BaseException, like asyncio.CancelledError, so crewai's retry of
+    failed tasks and the crews' `except Exception` handlers let it through.
+    """
+
+
+def raise_if_cancelled():
+    """Raise CrewCancelled if the crew running in this thread was stopped."""
+    stop = _stop_event.get()
+    if stop is not None and stop.is_set():
+        raise CrewCancelled("crew stopped before its next LLM call")
+
+
+async def _finished(future: asyncio.Future):
+    """Wait for a stopped crew's thread to return, whatever else is cancelled meanwhile."""
+    while not future.done():
+        try:
+            await asyncio.wait({future})
+        except asyncio.CancelledError:
+            continue
+    if not future.cancelled():
+        future.exception()  # Retrieved: the CrewCancelled is expected
+
+
+async def run_in_thread(fn: Callable[..., T], *args, timeout: Optional[float] = None, name: str = 'crew',
+                        **kwargs) -> T:
+    """
+    Run the blocking `fn(*args, **kwargs)` in a worker thread as a coroutine.
+
+    Args:
+        fn: Blocking call that runs a crew, e.g. crew.kickoff
+        timeout: Seconds before the crew is stopped (None waits indefinitely)
+        name: Used in messages, e.g. 'strategy phase'
+
+    Raises:
+        TimeoutError: If `timeout` passed first; the crew has stopped
+        asyncio.CancelledError: If cancelled; the crew has stopped
+    """
+    stop = threading.Event()
+
+    def target():
+        _stop_event.set(stop)
+        return fn(*args, **kwargs)
+
+    # asyncio.to_thread copies the current context, so the stop event set in
+    # target() is seen by everything the call runs in that thread
+    future = asyncio.ensure_future(asyncio.to_thread(target))
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout)
+    except asyncio.TimeoutError:
+        stop.set()
+        await _finished(future)
+        if not future.cancelled() and future.exception() is None:
+            return future.result()  # Finished just as the timeout hit
+        raise TimeoutError(f"{name} timed out after {timeout:g}s") from None
+    except asyncio.CancelledError:
+        stop.set()
+        if not future.done():
+            print(f"\n⏹️  Stopping {name} after its current LLM call...")
+        await _finished(future)
+        raise
+
+
+async def gather_limited(awaitables: Iterable[Awaitable[T]], limit: int,
+                         return_exceptions: bool = False) -> List[Any]:
+    """
+    asyncio.gather with at most `limit` of the awaitables running at once.
+
+    Results are in the order of `awaitables`. Awaitables still waiting for a
+    slot when the gather is cancelled are closed without starting.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def limited(awaitable: Awaitable[T]) -> T:
+        try:
+            async with semaphore:
+                return await awaitable
+        finally:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()  # No-op once awaited; avoids 'never awaited' warnings
+
+    return await asyncio.gather(*(limited(a) for a in awaitables), return_exceptions=return_exceptions)
@@ -0,0 +1,227 @@
+"""
+Batch mode for the strategy phase
+
+run_strategy_phase analyzes the one plugin in inputs/competitor-plugin into
+fixed paths under outputs/analysis/, so twenty competitors meant twenty
+serial runs and moving the reports aside after each. run_strategy_batch
+takes a manifest of competitor plugins and runs one StrategyCrew per plugin,
+each writing its reports, static inventory and crew log to its own
+outputs/batch/<name>/, at most `workers` crews at a time.
+
+A crew runs its tasks one after another, so `workers` is the number of
+requests the Ollama server sees at once: match it to the server's model
+slots (OLLAMA_NUM_PARALLEL, which is also the default here).
+
+Manifest (YAML or JSON):
+
+    skeleton_plugin_path: inputs/skeleton-plugin    # optional, the default
+    plugins:
+      - path: /path/to/competitor-a                 # name: competitor-a
+      - name: greek-shipping
+        path: inputs/plugins/greek-shipping
+
+Crews run as coroutines (see async_kickoff.py): Ctrl+C stops every running
+crew after its current LLM call, and --timeout stops a plugin that takes
+too long, in both cases keeping its completed tasks for --resume.
+
+Usage:
+    strategy_batch competitors.yaml
+    strategy_batch competitors.yaml --workers 4 --resume
+    strategy_batch competitors.yaml --timeout 3600
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+
+import yaml
+
+BATCH_DIR = Path('outputs/batch')
+DEFAULT_SKELETON_PATH = 'inputs/skeleton-plugin'
+
+
+@dataclass
+class BatchJob:
+    """One competitor plugin of a batch."""
+    name: str
+    plugin_path: str
+    skeleton_path: str
+
+    @property
+    def output_dir(self) -> str:
+        # Relative: crewai rejects absolute output_file paths
+        return str(BATCH_DIR / self.name)
+
+    @property
+    def log_file(self) -> str:
+        return str(BATCH_DIR / self.name / 'crew.txt')
+
+
+def _slug(name: str) -> str:
+    return re.sub(r'[^A-Za-z0-9._-]+', '-', name).strip('-.') or 'plugin'
+
+
+def load_manifest(path) -> List[BatchJob]:
+    """
+    Read a batch manifest into jobs.
+
+    Plugin paths are resolved against the working directory, like
+    inputs/competitor-plugin in single-plugin runs.
+
+    Raises:
+        ValueError: If the manifest is malformed, a plugin directory does
+            not exist, or two plugins get the same name
+    """
+    with open(path, encoding='utf-8') as f:
+        manifest = yaml.safe_load(f) or {}
+    if isinstance(manifest, list):
+        manifest = {'plugins': manifest}
+    if not isinstance(manifest, dict) or not isinstance(manifest.get('plugins'), list):
+        raise ValueError(f"{path}: expected a 'plugins' list")
+
+    skeleton_path = str(Path(manifest.get('skeleton_plugin_path', DEFAULT_SKELETON_PATH)).resolve())
+    jobs, names = [], set()
+    for entry in manifest['plugins']:
+        if isinstance(entry, str):
+            entry = {'path': entry}
+        if not isinstance(entry, dict) or not entry.get('path'):
+            raise ValueError(f"{path}: every plugin needs a 'path' (got {entry!r})")
+        plugin_path = Path(entry['path']).resolve()
+        if not plugin_path.is_dir():
+            raise ValueError(f"{path}: plugin directory not found: {entry['path']}")
+        name = _slug(str(entry.get('name') or plugin_path.name))
+        if name in names:
+            raise ValueError(f"{path}: two plugins are named '{name}' - set 'name' to tell them apart")
+        names.add(name)
+        jobs.append(BatchJob(name=name, plugin_path=str(plugin_path),
+                             skeleton_path=str(Path(entry.get('skeleton_plugin_path', skeleton_path)).resolve())))
+    if not jobs:
+        raise ValueError(f"{path}: no plugins listed")
+    return jobs
+
+
+def default_workers() -> int:
+    """The Ollama server's parallel request slots (OLLAMA_NUM_PARALLEL), else 1."""
+    try:
+        return max(1, int(os.environ.get('OLLAMA_NUM_PARALLEL', '1')))
+    except ValueError:
+        return 1
+
+
+async def run_strategy_batch_async(jobs: List[BatchJob], workers: Optional[int] = None, resume: bool = False,
+                                   timeout: Optional[float] = None) -> List[BatchJob]:
+    """
+    Run the Strategy Crew for every job, at most `workers` at a time.
+
+    Each job is checkpointed as strategy-<name> (see dev_team.checkpoints),
+    so with resume=True finished plugins are skipped. A job still running
+    after `timeout` seconds is stopped and counts as failed. If the batch is
+    cancelled (Ctrl+C), the running crews stop at their next LLM call and
+    the summary is still written. A summary of all jobs is written to
+    outputs/batch/summary.json.
+
+    Returns:
+        The jobs that failed.
+    """
+    from dev_team.async_kickoff import gather_limited, run_in_thread
+    from dev_team.checkpoints import kickoff_with_checkpoints, task_input_files
+    from dev_team.crews.strategy_crew import StrategyCrew
+    from dev_team.tracing import start_trace
+
+    workers = max(1, min(workers or default_workers(), len(jobs)))
+    trace_path = start_trace('batch')
+
+    print(f"\n{'─' * 70}")
+    print(f"Strategy batch: {len(jobs)} plugins, {workers} at a time")
+    print(f"Outputs and crew logs: {BATCH_DIR}/<name>/")
+    print(f"{'─' * 70}\n")
+
+    def run_job(job: BatchJob):
+        Path(job.output_dir).mkdir(parents=True, exist_ok=True)
+        strategy_crew = StrategyCrew(output_dir=job.output_dir)
+        inputs = {
+            'competitor_plugin_path': job.plugin_path,
+            'skeleton_plugin_path': job.skeleton_path,
+        }
+        kickoff_with_checkpoints(strategy_crew.logged_crew(job.log_file), inputs, f'strategy-{job.name}',
+                                 resume=resume, input_files=task_input_files(strategy_crew.tasks_config))
+
+    results = {job.name: {'status': 'cancelled'} for job in jobs}
+    failed = []
+
+    async def run_async(job: BatchJob):
+        start_time = time.time()
+        try:
+            await run_in_thread(run_job, job, timeout=timeout, name=job.name)
+        except Exception as e:
+            failed.append(job)
+            results[job.name] = {'status': 'failed', 'error': str(e)}
+            print(f"  ✗ {job.name} failed: {e}")
+            return
+        elapsed = time.time() - start_time
+        results[job.name] = {'status': 'complete', 'seconds': round(elapsed, 1)}
+        print(f"  ✓ {job.name} ({int(elapsed // 60)}m {int(elapsed % 60)}s)")
+
+    try:
+        await gather_limited([run_async(job) for job in jobs], workers)
+    finally:
+        summary_path = BATCH_DIR / 'summary.json'
+        BATCH_DIR.mkdir(parents=True, exist_ok=True)
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            json.dump([{**asdict(job), 'output_dir': job.output_dir, **results[job.name]} for job in jobs], f,
+                      indent=2)
+            f.write("\n")
+
+        print(f"\n📋 Batch summary: {summary_path}")
+        if trace_path:
+            print(f"⏱️  Trace: {trace_path}")
+    return failed
+
+
+def run_strategy_batch(jobs: List[BatchJob], workers: Optional[int] = None, resume: bool = False,
+                       timeout: Optional[float] = None) -> List[BatchJob]:
+    """Blocking run_strategy_batch_async."""
+    return asyncio.run(run_strategy_batch_async(jobs, workers, resume=resume, timeout=timeout))
+
+
+def run():
+    """Console script: run the strategy phase for every plugin of a manifest."""
+    parser = argparse.ArgumentParser(description='Run the Strategy Crew for a manifest of competitor plugins')
+    parser.add_argument('manifest', help='YAML/JSON manifest listing the competitor plugins')
+    parser.add_argument('--workers', type=int, default=None,
+                        help=f'Plugins analyzed at once (default: OLLAMA_NUM_PARALLEL, else 1; now {default_workers()})')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip plugins and tasks completed by an earlier batch run')
+    parser.add_argument('--timeout', type=float, default=None,
+                        help='Stop a plugin still running after this many seconds (default: no limit)')
+    args = parser.parse_args(sys.argv[1:])
+
+    if args.workers is not None and args.workers < 1:
+        print(f"\n⚠️  ERROR: --workers must be at least 1 (got {args.workers})")
+        return 1
+
+    try:
+        jobs = load_manifest(args.manifest)
+    except (OSError, ValueError) as e:
+        print(f"\n⚠️  ERROR: {e}\n")
+        return 1
+
+    try:
+        failed = run_strategy_batch(jobs, args.workers, resume=args.resume, timeout=args.timeout)
+    except KeyboardInterrupt:
+        print("\n⚠️  Batch interrupted - rerun with --resume to continue where it stopped")
+        return 130
+    if failed:
+        print(f"\n❌ {len(failed)} plugin(s) failed - rerun with --resume to retry them:")
+        for job in failed:
+            print(f"   - {job.name} (log: {job.log_file})")
+        return 1
+
+    print(f"\n✅ All {len(jobs)} plugins analyzed\n")
+    return 0
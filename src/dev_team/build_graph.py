@@ -0,0 +1,158 @@
+"""
+Make-style build graph for the crew pipeline
+
+Each target declares the files it reads (inputs), the artifacts it produces
+(outputs) and the targets it depends on. A target's fingerprint is the
+content hash of its inputs plus the outputs of its dependencies; it is rebuilt
+only when that fingerprint changed since its last successful build, or when
+one of its outputs is missing. Because dependencies are compared by output
+content, a rebuilt upstream target that produces identical files does not
+force its dependents to rerun.
+
+Build state is kept in outputs/.checkpoints/build-graph.json.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from dev_team.checkpoints import CHECKPOINT_DIR, files_digest
+
+
+@dataclass
+class Target:
+    """
+    One buildable step of the pipeline.
+
+    Args:
+        name: Target name, used for dependencies and on the command line
+        action: Builds the target. Returning None or False, or raising,
+            counts as a failure
+        inputs: Files, directories or globs the target reads
+        outputs: Files the target must produce
+        deps: Names of targets whose outputs this target reads
+    """
+    name: str
+    action: Callable[[], Any]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    deps: List[str] = field(default_factory=list)
+
+
+class BuildGraph:
+    """Targets plus their recorded fingerprints."""
+
+    def __init__(self, state_path: Path = CHECKPOINT_DIR / "build-graph.json"):
+        self.state_path = Path(state_path)
+        self.targets: Dict[str, Target] = {}
+        try:
+            with open(self.state_path, encoding='utf-8') as f:
+                self.state: Dict[str, Dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def add(self, target: Target) -> Target:
+        if target.name in self.targets:
+            raise ValueError(f"Duplicate build target '{target.name}'")
+        self.targets[target.name] = target
+        return target
+
+    def order(self, goals: Optional[Iterable[str]] = None) -> List[Target]:
+        """Targets needed for `goals` (default: all), dependencies first."""
+        ordered: List[Target] = []
+        visiting = set()
+        done = set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name not in self.targets:
+                raise ValueError(f"Unknown build target '{name}'")
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through build target '{name}'")
+            visiting.add(name)
+            for dep in self.targets[name].deps:
+                visit(dep)
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(self.targets[name])
+
+        for name in (goals or self.targets):
+            visit(name)
+        return ordered
+
+    def fingerprint(self, target: Target) -> str:
+        paths = list(target.inputs)
+        for dep in target.deps:
+            paths.extend(self.targets[dep].outputs)
+        return files_digest(paths)
+
+    def stale_reason(self, target: Target) -> Optional[str]:
+        """Why `target` must be rebuilt, or None if it is up to date."""
+        record = self.state.get(target.name)
+        if record is None:
+            return "never built"
+        missing = [path for path in target.outputs if not os.path.exists(path)]
+        if missing:
+            return f"missing output {missing[0]}"
+        if record['fingerprint'] != self.fingerprint(target):
+            return "inputs changed"
+        return None
+
+    def _save_state(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def run(self, goals: Optional[Iterable[str]] = None, force: bool = False, dry_run: bool = False) -> bool:
+        """
+        Build stale targets in dependency order.
+
+        Args:
+            goals: Target names to bring up to date (default: all)
+            force: Rebuild every target regardless of fingerprints
+            dry_run: Only report what would be rebuilt
+
+        Returns:
+            True if every target is up to date (or would be rebuilt in a dry run).
+        """
+        pending = set()
+        for target in self.order(goals):
+            # Fingerprint before building, so edits made while the action
+            # runs still mark the target stale next time.
+            fingerprint = self.fingerprint(target)
+            reason = "forced" if force else self.stale_reason(target)
+            if dry_run:
+                if reason is None and pending.intersection(target.deps):
+                    reason = "if dependency outputs change"
+                if reason is None:
+                    print(f"✓ {target.name}: up to date")
+                else:
+                    print(f"→ {target.name}: would rebuild ({reason})")
+                    pending.add(target.name)
+                continue
+
+            if reason is None:
+                print(f"✓ {target.name}: up to date")
+                continue
+
+            print(f"\n▶️  {target.name}: rebuilding ({reason})")
+            result = target.action()
+            missing = [path for path in target.outputs if not os.path.exists(path)]
+            if result is None or result is False or missing:
+                detail = f" (missing output {missing[0]})" if missing else ""
+                print(f"❌ {target.name}: failed{detail} - stopping")
+                return False
+
+            self.state[target.name] = {
+                'fingerprint': fingerprint,
+                'built_at': datetime.now().isoformat(timespec='seconds'),
+            }
+            self._save_state()
+            print(f"✅ {target.name}: built")
+
+        return True
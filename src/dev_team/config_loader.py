@@ -0,0 +1,158 @@
+"""
+Shared loader for agents.yaml / *_tasks.yaml
+
+Every entry point used to parse the same YAML files with yaml.safe_load:
+each @CrewBase instance (five times per ensemble), run_full_analysis and
+orchestrator_competitor_simple. strategy_tasks.yaml alone is over a thousand
+lines, so parsing dominates crew construction.
+
+load_config parses a file once per process, keyed by its mtime and size,
+and validates it (agents need role/goal/backstory, tasks need
+expected_output). The parsed form is also pickled to a sidecar cache, so a
+new process skips the YAML parse until the file changes. Callers get a deep
+copy, since @CrewBase rewrites config entries in place.
+
+fill_placeholders substitutes {name} placeholders through a template
+compiled once per text, instead of one str.replace pass per placeholder.
+
+Configuration (environment):
+- DEV_TEAM_CONFIG_CACHE=0           Disable the pickled sidecar cache
+- DEV_TEAM_CONFIG_CACHE_DIR=path    Sidecar location (default: .cache/config)
+"""
+import copy
+import hashlib
+import os
+import pickle
+import re
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple, Union
+
+import yaml
+
+DEFAULT_CACHE_DIR = '.cache/config'
+
+# Required keys by entry type, recognised by its first key
+REQUIRED_KEYS = {
+    'role': ('goal', 'backstory'),
+    'description': ('expected_output',),
+}
+
+_PLACEHOLDER = re.compile(r'\{([A-Za-z_][A-Za-z0-9_-]*)\}')
+
+_configs: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+_configs_lock = threading.Lock()
+
+
+def validate_config(config: Any, path: str) -> Dict[str, Any]:
+    """Check that a config file maps names to agent or task entries."""
+    if config is None:
+        return {}
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: expected a mapping of names to entries, got {type(config).__name__}")
+    for name, entry in config.items():
+        if not isinstance(entry, dict):
+            raise ValueError(f"{path}: entry '{name}' must be a mapping")
+        for key, required in REQUIRED_KEYS.items():
+            if key in entry:
+                missing = [k for k in required if k not in entry]
+                if missing:
+                    raise ValueError(f"{path}: entry '{name}' is missing {', '.join(missing)}")
+    return config
+
+
+def _sidecar_path(path: str) -> Path:
+    cache_dir = os.environ.get('DEV_TEAM_CONFIG_CACHE_DIR', DEFAULT_CACHE_DIR)
+    key = hashlib.sha1(path.encode('utf-8')).hexdigest()
+    return Path(cache_dir) / f"{Path(path).stem}-{key[:12]}.pickle"
+
+
+def _sidecar_enabled() -> bool:
+    return os.environ.get('DEV_TEAM_CONFIG_CACHE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def _read_sidecar(path: str, version: Tuple[int, int]):
+    try:
+        with open(_sidecar_path(path), 'rb') as f:
+            cached_version, config = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, ValueError, TypeError):
+        return None
+    return config if cached_version == version else None
+
+
+def _write_sidecar(path: str, version: Tuple[int, int], config: Dict[str, Any]):
+    sidecar = _sidecar_path(path)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((version, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        pass  # The sidecar is only an optimisation
+
+
+def load_config(path: Union[str, Path]) -> Dict[str, Any]:
+    """
+    Parsed and validated contents of a YAML config file.
+
+    Returns a fresh deep copy on every call; the parse is cached until the
+    file's mtime or size changes.
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        ValueError: If the file is not a valid agents/tasks config
+    """
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    version = (st.st_mtime_ns, st.st_size)
+
+    with _configs_lock:
+        cached = _configs.get(path)
+    if cached is None or cached[0] != version:
+        config = _read_sidecar(path, version) if _sidecar_enabled() else None
+        if config is None:
+            with open(path, encoding='utf-8') as f:
+                config = validate_config(yaml.safe_load(f), path)
+            if _sidecar_enabled():
+                _write_sidecar(path, version, config)
+        cached = (version, config)
+        with _configs_lock:
+            _configs[path] = cached
+
+    return copy.deepcopy(cached[1])
+
+
+def crew_configs(crew_class):
+    """
+    Make a @CrewBase class load agents_config/tasks_config through load_config.
+
+    Apply above @CrewBase:
+
+        @crew_configs
+        @CrewBase
+        class StrategyCrew: ...
+    """
+    crew_class.load_yaml = staticmethod(load_config)
+    return crew_class
+
+
+@lru_cache(maxsize=256)
+def _compile(text: str) -> Tuple[str, ...]:
+    """Split text into literal / placeholder-name parts (names at odd indexes)."""
+    return tuple(_PLACEHOLDER.split(text))
+
+
+def fill_placeholders(text: str, values: Mapping[str, Any]) -> str:
+    """
+    Substitute {name} placeholders in one pass.
+
+    Placeholders without a value are left as they are, like the chained
+    str.replace calls this replaces.
+    """
+    parts = _compile(text)
+    return ''.join(
+        part if i % 2 == 0 else (str(values[part]) if part in values else f"{{{part}}}")
+        for i, part in enumerate(parts)
+    )
@@ -15,10 +15,15 @@ Configuration:
 """
 
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
-from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from dev_team.config_loader import crew_configs
+from dev_team.context_digest import DigestContextTask
+from dev_team.ensemble.inventory import inventory_input
+from dev_team.llm_cache import build_llm
+from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool, SymbolSearchTool
 
 
+@crew_configs
 @CrewBase
 class DevTeam():
     """
@@ -44,6 +49,7 @@ class DevTeam():
     def market_researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['market_researcher'],
+            llm=build_llm(self.agents_config['market_researcher']),
             verbose=True
         )
 
@@ -51,10 +57,12 @@ class DevTeam():
     def competitor_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['competitor_analyst'],
+            llm=build_llm(self.agents_config['competitor_analyst']),
             tools=[
                 DirectoryListTool(),
-                FileReaderTool(),
-                FindFilesTool()
+                FileReaderTool(token_budget=self.agents_config['competitor_analyst'].get('read_token_budget')),
+                FindFilesTool(),
+                SymbolSearchTool()
             ],
             verbose=True
         )
@@ -63,25 +71,33 @@ class DevTeam():
     def product_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['product_manager'],
+            llm=build_llm(self.agents_config['product_manager']),
             verbose=True
         )
 
+    @before_kickoff
+    def add_static_inventory(self, inputs):
+        """Scan the competitor plugin into {static_inventory} for analyze_competitor"""
+        if 'static_inventory' in inputs:
+            return inputs
+        return {**inputs, 'static_inventory': inventory_input(inputs['competitor_plugin_path'])}
+
     @task
     def analyze_competitor(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['analyze_competitor'],
         )
 
     @task
     def research_market(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['research_market'],
             context=[self.analyze_competitor()]  # Uses competitor analysis as context
         )
 
     @task
     def create_roadmap(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['create_roadmap'],
             context=[self.analyze_competitor(), self.research_market()]  # Uses both as context
         )
@@ -94,7 +110,8 @@ class DevTeam():
         Configuration:
         - Process: Sequential (tasks run in order with dependencies)
         - Memory: Enabled (agents remember context)
-        - Cache: Enabled (avoid redundant LLM calls)
+        - Cache: Enabled (tool calls; LLM completions are cached on disk by build_llm)
+        - Rate limit: Adaptive, shared by all crews per endpoint (rate_limit.py)
         - Verbose: Full output for transparency
         """
         return Crew(
@@ -103,6 +120,6 @@ class DevTeam():
             process=Process.sequential,
             verbose=True,
             memory=True,  # Enable memory for better context retention
-            cache=True,   # Enable caching to save on LLM calls
-            max_rpm=10,   # Rate limit: max 10 requests per minute to Ollama
+            cache=True,   # Enable in-memory tool call caching
+            # No max_rpm: build_llm's LLMs share an adaptive per-endpoint limit (rate_limit.py)
         )
@@ -1,7 +1,10 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+from dev_team.config_loader import crew_configs
+from dev_team.llm_cache import build_llm
 
 
+@crew_configs
 @CrewBase
 class DevelopmentCrew:
     """
@@ -24,6 +27,7 @@ class DevelopmentCrew:
     def software_architect(self) -> Agent:
         return Agent(
             config=self.agents_config['software_architect'],
+            llm=build_llm(self.agents_config['software_architect']),
             verbose=True
         )
 
@@ -31,6 +35,7 @@ class DevelopmentCrew:
     def wordpress_backend_dev(self) -> Agent:
         return Agent(
             config=self.agents_config['wordpress_backend_dev'],
+            llm=build_llm(self.agents_config['wordpress_backend_dev']),
             verbose=True
         )
 
@@ -38,6 +43,7 @@ class DevelopmentCrew:
     def react_frontend_dev(self) -> Agent:
         return Agent(
             config=self.agents_config['react_frontend_dev'],
+            llm=build_llm(self.agents_config['react_frontend_dev']),
             verbose=True
         )
 
@@ -45,6 +51,7 @@ class DevelopmentCrew:
     def code_reviewer(self) -> Agent:
         return Agent(
             config=self.agents_config['code_reviewer'],
+            llm=build_llm(self.agents_config['code_reviewer']),
             verbose=True
         )
 
@@ -52,6 +59,7 @@ class DevelopmentCrew:
     def qa_engineer(self) -> Agent:
         return Agent(
             config=self.agents_config['qa_engineer'],
+            llm=build_llm(self.agents_config['qa_engineer']),
             verbose=True
         )
 
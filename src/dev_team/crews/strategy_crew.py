@@ -1,8 +1,17 @@
+from pathlib import Path
+from typing import Any, Dict, Optional
+
 from crewai import Agent, Crew, Process, Task
-from crewai.project import CrewBase, agent, crew, task
-from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool
+from crewai.tasks.task_output import TaskOutput
+from crewai.project import CrewBase, agent, before_kickoff, crew, task
+from dev_team.config_loader import crew_configs
+from dev_team.context_digest import DigestContextTask
+from dev_team.ensemble.inventory import INVENTORY_PATH, inventory_input
+from dev_team.llm_cache import build_llm
+from dev_team.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool, SymbolSearchTool
 
 
+@crew_configs
 @CrewBase
 class StrategyCrew:
     """
@@ -14,15 +23,36 @@ class StrategyCrew:
     - Product Manager: Creates milestone-based roadmap
 
     Output: Analysis reports and product roadmap in outputs/analysis/
+
+    Args:
+        llm_cache_namespace: Kept apart from other namespaces in the LLM
+            response cache, so repeated runs (e.g. ensemble run 1..N) get
+            independent completions for identical prompts.
+        output_dir: Write the reports (and the static inventory) here
+            instead of outputs/analysis/, e.g. one directory per plugin in
+            batch mode. Relative to the working directory.
     """
 
     agents_config = '../config/agents.yaml'
     tasks_config = '../config/strategy_tasks.yaml'
 
+    def __init__(self, llm_cache_namespace: str = '', output_dir: Optional[str] = None):
+        super().__init__()
+        self.llm_cache_namespace = llm_cache_namespace
+        self.output_dir = output_dir
+
+    def output_path(self, name: str) -> Optional[str]:
+        """Task `name`'s output file moved to output_dir; None keeps the configured one"""
+        configured = self.tasks_config[name].get('output_file')
+        if self.output_dir is None or not configured:
+            return None
+        return str(Path(self.output_dir) / Path(configured).name)
+
     @agent
     def market_researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['market_researcher'],
+            llm=build_llm(self.agents_config['market_researcher'], self.llm_cache_namespace),
             verbose=True
         )
 
@@ -30,10 +60,12 @@ class StrategyCrew:
     def competitor_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['competitor_analyst'],
+            llm=build_llm(self.agents_config['competitor_analyst'], self.llm_cache_namespace),
             tools=[
                 DirectoryListTool(),
-                FileReaderTool(),
-                FindFilesTool()
+                FileReaderTool(token_budget=self.agents_config['competitor_analyst'].get('read_token_budget')),
+                FindFilesTool(),
+                SymbolSearchTool()
             ],
             verbose=True
 
@@ -43,26 +75,38 @@ class StrategyCrew:
     def product_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['product_manager'],
+            llm=build_llm(self.agents_config['product_manager'], self.llm_cache_namespace),
             verbose=True
         )
 
+    @before_kickoff
+    def add_static_inventory(self, inputs):
+        """Scan the competitor plugin into {static_inventory} for analyze_competitor"""
+        if 'static_inventory' in inputs:
+            return inputs
+        path = Path(self.output_dir) / INVENTORY_PATH.name if self.output_dir else INVENTORY_PATH
+        return {**inputs, 'static_inventory': inventory_input(inputs['competitor_plugin_path'], path)}
+
     @task
     def analyze_competitor(self) -> Task:
-        return Task(
-            config=self.tasks_config['analyze_competitor']
+        return DigestContextTask(
+            config=self.tasks_config['analyze_competitor'],
+            output_file=self.output_path('analyze_competitor')
         )
 
     @task
     def research_market(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['research_market'],
+            output_file=self.output_path('research_market'),
             context=[self.analyze_competitor()]  # Uses competitor analysis as context
         )
 
     @task
     def create_roadmap(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['create_roadmap'],
+            output_file=self.output_path('create_roadmap'),
             context=[self.analyze_competitor(), self.research_market()]  # Uses both as context
         )
 
@@ -76,3 +120,59 @@ class StrategyCrew:
             verbose=True,
         )
 
+    def logged_crew(self, log_file: str) -> Crew:
+        """
+        The crew with its output in `log_file` instead of the console, for
+        runs alongside other crews (batch mode).
+        """
+        crew = self.crew()  # Instantiates agents/tasks and the before_kickoff hooks
+        for crew_agent in crew.agents:
+            crew_agent.verbose = False
+        return Crew(
+            agents=crew.agents,
+            tasks=crew.tasks,
+            process=Process.sequential,
+            verbose=False,
+            output_log_file=log_file,
+            before_kickoff_callbacks=crew.before_kickoff_callbacks,
+        )
+
+    def run_task(self, name: str, inputs: Dict[str, Any], output_file: Optional[str] = None,
+                 log_file: Optional[str] = None) -> TaskOutput:
+        """
+        Run one task, plus the tasks it takes as context, and return its output.
+
+        The rest of the crew is skipped: an ensemble run needs only
+        analyze_competitor, not a market research and roadmap per run.
+
+        Args:
+            name: Task method name, e.g. 'analyze_competitor'
+            inputs: Crew inputs, as for kickoff()
+            output_file: Also save the output here instead of the task's
+                configured output_file
+            log_file: Log the crew here instead of the console (logged_crew)
+
+        Raises:
+            ValueError: If the crew has no task called `name`
+        """
+        crew = self.logged_crew(log_file) if log_file else self.crew()
+        tasks = {task.name: task for task in crew.tasks}
+        if name not in tasks:
+            raise ValueError(f"Unknown task '{name}' (expected one of: {', '.join(tasks)})")
+
+        needed = set()
+
+        def require(task: Task):
+            if task.name not in needed:
+                needed.add(task.name)
+                for dependency in task.context if isinstance(task.context, list) else []:
+                    require(dependency)
+
+        require(tasks[name])
+        crew.tasks = [task for task in crew.tasks if task.name in needed]
+        crew.agents = [agent for agent in crew.agents if any(task.agent is agent for task in crew.tasks)]
+        if output_file is not None:
+            tasks[name].output_file = output_file
+
+        crew.kickoff(inputs=inputs)
+        return tasks[name].output
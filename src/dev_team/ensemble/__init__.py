@@ -0,0 +1 @@
+"""Voting-ensemble support: findings extraction and merging for multi-run analyses."""
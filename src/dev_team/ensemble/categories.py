@@ -0,0 +1,92 @@
+"""
+Findings category registry
+
+Categories are declared in config/findings_categories.yaml (pattern,
+normalizer, render template) and drive both extraction (findings.py) and
+rendering (report.py), so adding a category for another competitor plugin
+is a YAML change only.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import yaml
+
+DEFAULT_REGISTRY_PATH = Path(__file__).parent.parent / 'config' / 'findings_categories.yaml'
+
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    'identity': lambda item: item,
+    'lower': str.lower,
+    'strip_slashes': lambda item: item.strip('/'),
+}
+
+
+@dataclass(frozen=True)
+class FindingCategory:
+    """
+    A category of findings extracted from reports.
+
+    Args:
+        name: Key used in findings/verified dicts (e.g. 'ajax_endpoints')
+        title: Section heading and label in the merged report
+        pattern: Compiled regex; first non-empty group is the item if the
+            pattern has groups, else the whole match
+        hints: Literal substrings, one of which must occur in a chunk for the
+            pattern to be able to match. Empty means always run.
+        normalizer: Applied to every extracted item
+        template: str.format template rendering one item ({item})
+        empty: Rendered when nothing in the category was verified
+    """
+    name: str
+    title: str
+    pattern: re.Pattern
+    hints: Tuple[str, ...] = ()
+    normalizer: Callable[[str], str] = NORMALIZERS['identity']
+    template: str = '`{item}`'
+    empty: str = ''
+
+    def render_item(self, item: str) -> str:
+        return self.template.format(item=item)
+
+    def empty_message(self, threshold: int, in_source: bool = False) -> str:
+        where = 'in source' if in_source else f'in {threshold}+ runs'
+        return f"_{self.empty or f'No {self.title.lower()}'} found {where}_"
+
+
+def parse_category(name: str, spec: dict) -> FindingCategory:
+    """Build a FindingCategory from one registry entry."""
+    try:
+        normalizer = NORMALIZERS[spec.get('normalizer', 'identity')]
+    except KeyError:
+        raise ValueError(
+            f"Unknown normalizer '{spec['normalizer']}' for findings category '{name}' "
+            f"(expected one of: {', '.join(NORMALIZERS)})"
+        )
+
+    flags = re.IGNORECASE if spec.get('ignore_case') else 0
+    try:
+        pattern = re.compile(spec['pattern'], flags)
+    except KeyError:
+        raise ValueError(f"Findings category '{name}' has no pattern")
+    except re.error as e:
+        raise ValueError(f"Invalid pattern for findings category '{name}': {e}")
+
+    return FindingCategory(
+        name=name,
+        title=spec.get('title', name.replace('_', ' ').title()),
+        pattern=pattern,
+        hints=tuple(spec.get('hints') or ()),
+        normalizer=normalizer,
+        template=spec.get('template', '`{item}`'),
+        empty=spec.get('empty', ''),
+    )
+
+
+@lru_cache(maxsize=None)
+def load_categories(path: str = str(DEFAULT_REGISTRY_PATH)) -> Tuple[FindingCategory, ...]:
+    """Load and compile the category registry (parsed once per path)."""
+    with open(path, encoding='utf-8') as f:
+        registry = yaml.safe_load(f) or {}
+    return tuple(parse_category(name, spec) for name, spec in registry.items())
@@ -0,0 +1,99 @@
+"""
+Findings extraction for the voting ensemble
+
+Every merge step (merge_results.py, run_full_analysis.py and
+orchestrator_multi_run.py) extracts the same categories of findings from the
+competitor_analyst reports. FindingsExtractor takes the compiled category
+registry (see categories.py) and extracts all categories in one pass over a
+report, reading large files in chunks. Extracted items are interned, since
+the same names repeat across every run being merged.
+"""
+import sys
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from dev_team.ensemble.categories import FindingCategory, load_categories
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+# Text carried over between chunks, at least; more once longer matches are seen
+MIN_CARRY_CHARS = 4096
+
+
+class FindingsExtractor:
+    """Extracts all configured categories from reports in a single pass."""
+
+    def __init__(self, categories: Optional[Iterable[FindingCategory]] = None,
+                 names: Optional[Iterable[str]] = None):
+        categories = tuple(load_categories() if categories is None else categories)
+        if names is not None:
+            wanted = set(names)
+            categories = tuple(c for c in categories if c.name in wanted)
+        self.categories = categories
+
+    @property
+    def category_names(self) -> Tuple[str, ...]:
+        return tuple(c.name for c in self.categories)
+
+    def empty_findings(self) -> Dict[str, Set[str]]:
+        return {c.name: set() for c in self.categories}
+
+    def _scan(self, text: str, findings: Dict[str, Set[str]]) -> int:
+        """Add the findings in `text`; returns the length of the longest match."""
+        intern = sys.intern
+        longest = 0
+        for category in self.categories:
+            if category.hints and not any(hint in text for hint in category.hints):
+                continue
+            items = findings[category.name]
+            normalize = category.normalizer
+            for match in category.pattern.finditer(text):
+                longest = max(longest, match.end() - match.start())
+                # First non-empty group if the pattern has groups, like findall
+                item = next((group for group in match.groups() if group), '') if match.re.groups else match.group()
+                item = normalize(item)
+                if item:
+                    items.add(intern(item))
+        return longest
+
+    def extract(self, report: str) -> Dict[str, Set[str]]:
+        """Extract findings from a report held in memory."""
+        findings = self.empty_findings()
+        self._scan(report, findings)
+        return findings
+
+    def extract_file(self, path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Set[str]]:
+        """
+        Extract findings from a report on disk, reading it in chunks.
+
+        Chunks are cut at line boundaries, and the end of each chunk is
+        scanned again with the next one: whole lines covering at least
+        MIN_CARRY_CHARS, or the longest match seen so far if that is longer.
+        So matches spanning the cut (e.g. 'CPT:' followed by the name on the
+        next line) are not lost. Findings are sets, so the re-scanned text
+        never double counts.
+        """
+        findings = self.empty_findings()
+        carry = ''
+        longest = 0
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            while True:
+                data = f.read(chunk_size)
+                if not data:
+                    break
+                cut = data.rfind('\n')
+                if cut == -1:
+                    carry += data
+                    continue
+
+                block = carry + data[:cut + 1]
+                longest = max(longest, self._scan(block, findings))
+                keep_from = max(len(block) - max(longest, MIN_CARRY_CHARS), 0)
+                carry = block[block.rfind('\n', 0, keep_from) + 1:] + data[cut + 1:]
+
+        if carry:
+            self._scan(carry, findings)
+        return findings
+
+
+def extract_findings(report: str, names: Optional[Iterable[str]] = None) -> Dict[str, Set[str]]:
+    """Extract findings from a report string using the registry categories."""
+    return FindingsExtractor(names=names).extract(report)
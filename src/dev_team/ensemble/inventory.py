@@ -0,0 +1,288 @@
+"""
+Static inventory of the competitor plugin
+
+The voting ensemble exists because a single competitor_analyst run invents
+AJAX actions, WSDL files and hooks. Most of those names can be read straight
+from the source: build_inventory scans the plugin once (symbols from
+tools/symbol_index.py, file names, plugin/readme headers, and the registry
+patterns of the remaining findings categories) into a JSON inventory keyed
+by the same category names as config/findings_categories.yaml.
+
+The inventory is injected into analyze_competitor as {static_inventory}, and
+verify_findings uses it when merging. Only categories the scan enumerates
+exhaustively (file names, see EXHAUSTIVE_CATEGORIES) take it as ground
+truth: their inventoried items are verified and anything else the reports
+mention is unconfirmed. In the other categories the scan can miss items,
+e.g. hooks whose names are built at runtime, so the inventory is a floor:
+inventoried items are verified, plus report items voted in at the
+threshold, and only the rest are unconfirmed.
+
+A saved inventory is only used for the plugin it was built from, and only
+while no file of that plugin is newer than the scan (load_inventory).
+"""
+import json
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dev_team.ensemble.categories import FindingCategory, load_categories
+from dev_team.tools.plugin_index import get_plugin_index, read_text
+from dev_team.tools.symbol_index import SKIP_DIRS, get_symbol_index
+
+INVENTORY_PATH = Path('outputs/analysis/static-inventory.json')
+
+# Findings category -> symbol kinds it is read from (see symbol_index.PATTERNS)
+SYMBOL_CATEGORIES = {
+    'ajax_endpoints': ('ajax',),
+    'shortcodes': ('shortcode',),
+    'cpt': ('post_type',),
+    'cron_jobs': ('cron',),
+    'rest_routes': ('rest_route',),
+    'options': ('option',),
+}
+# Hooks are matched by prefix across registered and fired hooks
+HOOK_CATEGORIES = {'wc_hooks': 'woocommerce_'}
+HOOK_KINDS = ('action', 'filter', 'hook_fired')
+# Categories found by file name rather than file content
+FILE_CATEGORIES = {'wsdl_files': '*.wsdl'}
+# Categories the scan lists completely, so reports cannot add to them
+EXHAUSTIVE_CATEGORIES = frozenset(FILE_CATEGORIES)
+
+HEADER_FIELDS = (
+    'Plugin Name', 'Description', 'Version', 'Author', 'Text Domain', 'Requires at least',
+    'Requires PHP', 'Tested up to', 'Stable tag', 'WC requires at least', 'WC tested up to',
+)
+_HEADER = re.compile(r'^[ \t/*#@=]*(' + '|'.join(HEADER_FIELDS) + r')\s*:(.*)$', re.M | re.I)
+HEADER_BYTES = 8192
+
+# Locations listed per item in the prompt context
+MAX_CONTEXT_LOCATIONS = 3
+
+# Parallel ensemble runs all save the inventory
+_write_lock = threading.Lock()
+
+
+def _headers(text: str) -> Dict[str, str]:
+    fields = {name.lower(): name for name in HEADER_FIELDS}
+    headers = {}
+    for match in _HEADER.finditer(text[:HEADER_BYTES]):
+        name = fields[match.group(1).lower()]
+        value = match.group(2).strip().rstrip('*/').strip()
+        if value:
+            headers.setdefault(name, value)
+    return headers
+
+
+def _line_of(text: str, pos: int) -> int:
+    return text.count('\n', 0, pos) + 1
+
+
+def source_mtime(plugin_path: str) -> int:
+    """Newest mtime (ns) of the plugin's files and directories, as the scan sees them."""
+    plugin_index, _ = get_plugin_index(plugin_path)
+    newest = os.stat(plugin_index.root).st_mtime_ns
+    for rel in plugin_index.files(skip_dirs=SKIP_DIRS):
+        path = os.path.join(plugin_index.root, *rel.split('/'))
+        try:
+            newest = max(newest, os.stat(path).st_mtime_ns, os.stat(os.path.dirname(path)).st_mtime_ns)
+        except OSError:
+            continue
+    return newest
+
+
+def build_inventory(plugin_path: str, categories: Optional[Iterable[FindingCategory]] = None) -> Dict[str, Any]:
+    """
+    Scan a plugin tree into an inventory.
+
+    Returns:
+        {plugin_path, source_mtime, generated, exhaustive: [category, ...],
+         plugin: {header: value}, files: {extension: count},
+         findings: {category: [item, ...]}, locations: {category: {item: ['path:line', ...]}}}
+    """
+    categories = tuple(load_categories() if categories is None else categories)
+    plugin_index, _ = get_plugin_index(plugin_path)
+    symbol_index, _ = get_symbol_index(plugin_path)
+    files = plugin_index.files(skip_dirs=SKIP_DIRS)
+
+    locations: Dict[str, Dict[str, List[str]]] = {category.name: {} for category in categories}
+
+    def add(category: FindingCategory, item: str, location: str):
+        item = category.normalizer(item)
+        if item:
+            locations[category.name].setdefault(item, []).append(location)
+
+    # Remaining categories are matched with their registry pattern over the source
+    pattern_categories = []
+    for category in categories:
+        if category.name in SYMBOL_CATEGORIES:
+            for kind in SYMBOL_CATEGORIES[category.name]:
+                for symbol in symbol_index.search(kind=kind):
+                    add(category, symbol.name, f"{symbol.path}:{symbol.line}")
+        elif category.name in HOOK_CATEGORIES:
+            prefix = HOOK_CATEGORIES[category.name]
+            for kind in HOOK_KINDS:
+                for symbol in symbol_index.search(f"{prefix}*", kind=kind):
+                    add(category, symbol.name, f"{symbol.path}:{symbol.line}")
+        elif category.name in FILE_CATEGORIES:
+            for path in plugin_index.find(FILE_CATEGORIES[category.name]):
+                add(category, os.path.basename(path), path)
+        else:
+            pattern_categories.append(category)
+
+    plugin: Dict[str, str] = {}
+    for rel in files:
+        path = os.path.join(plugin_index.root, *rel.split('/'))
+        if '/' not in rel and (rel.endswith('.php') or rel.lower() in ('readme.txt', 'readme.md')):
+            for name, value in _headers(read_text(path)).items():
+                plugin.setdefault(name, value)
+        if not rel.endswith('.php'):
+            continue
+        text = None
+        for category in pattern_categories:
+            if text is None:
+                text = read_text(path)
+            if category.hints and not any(hint in text for hint in category.hints):
+                continue
+            for match in category.pattern.finditer(text):
+                groups = [i for i, group in enumerate(match.groups(), 1) if group]
+                group = groups[0] if groups else 0
+                add(category, match.group(group), f"{rel}:{_line_of(text, match.start(group))}")
+
+    return {
+        'plugin_path': plugin_path,
+        'source_mtime': source_mtime(plugin_path),
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'exhaustive': sorted(name for name in locations if name in EXHAUSTIVE_CATEGORIES),
+        'plugin': plugin,
+        'files': dict(Counter(os.path.splitext(rel)[1].lower() or rel for rel in files).most_common()),
+        'findings': {name: sorted(items) for name, items in locations.items()},
+        'locations': {name: dict(sorted(items.items())) for name, items in locations.items()},
+    }
+
+
+def write_inventory(plugin_path: str, path: Path = INVENTORY_PATH) -> Dict[str, Any]:
+    """Build the inventory of `plugin_path` and save it as JSON."""
+    inventory = build_inventory(plugin_path)
+    path = Path(path)
+    with _write_lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(inventory, f, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, path)
+    return inventory
+
+
+def load_inventory(path: Path = INVENTORY_PATH, plugin_path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    The saved inventory, or None if there is none.
+
+    With `plugin_path`, also None (with a warning) if the inventory was built
+    from another plugin, or before a file of this one last changed.
+    """
+    try:
+        with open(path, encoding='utf-8') as f:
+            inventory = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if plugin_path is None:
+        return inventory
+
+    recorded = inventory.get('plugin_path')
+    if not recorded or os.path.realpath(recorded) != os.path.realpath(plugin_path):
+        print(f"⚠️  Ignoring {path}: built from {recorded or 'an unknown plugin'}, not {plugin_path}")
+        return None
+    try:
+        changed = source_mtime(plugin_path) > inventory.get('source_mtime', 0)
+    except OSError:
+        changed = True
+    if changed:
+        print(f"⚠️  Ignoring {path}: {plugin_path} changed since it was built")
+        return None
+    return inventory
+
+
+def inventory_context(inventory: Dict[str, Any], categories: Optional[Iterable[FindingCategory]] = None) -> str:
+    """Render the inventory as Markdown for the analyze_competitor prompt."""
+    categories = tuple(load_categories() if categories is None else categories)
+    lines = []
+    if inventory['plugin']:
+        lines.append("Plugin headers: " + "; ".join(f"{k}: {v}" for k, v in inventory['plugin'].items()))
+    lines.append("Files by type: " + ", ".join(f"{ext} {n}" for ext, n in inventory['files'].items()))
+    for category in categories:
+        items = inventory['locations'].get(category.name, {})
+        lines.append(f"\n{category.title} ({len(items)}):")
+        if not items:
+            lines.append("- none found in source")
+        for item, item_locations in items.items():
+            shown = ", ".join(item_locations[:MAX_CONTEXT_LOCATIONS])
+            more = len(item_locations) - MAX_CONTEXT_LOCATIONS
+            lines.append(f"- {item} — {shown}{f' (+{more} more)' if more > 0 else ''}")
+    return "\n".join(lines)
+
+
+def inventory_input(plugin_path: str, path: Path = INVENTORY_PATH) -> str:
+    """Scan `plugin_path`, save the inventory to `path` and return it rendered for {static_inventory}."""
+    return inventory_context(write_inventory(plugin_path, path))
+
+
+def _ground_truth(inventory: Optional[Dict[str, Any]]) -> Tuple[Dict[str, List[str]], frozenset]:
+    """(category -> inventoried items, categories they list completely)"""
+    if not inventory:
+        return {}, frozenset()
+    return inventory['findings'], frozenset(inventory.get('exhaustive', ()))
+
+
+def verify_findings(counters: Dict[str, Counter], threshold: int,
+                    inventory: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Dict[str, int]], Dict[str, Dict[str, int]]]:
+    """
+    Decide which extracted findings are verified.
+
+    An item is verified when it occurs in `threshold`+ reports. With an
+    inventory, its items are verified as well (their report count kept as
+    votes, possibly 0). In the categories the inventory lists exhaustively
+    only its items are verified. Report items that are not verified are
+    returned as unconfirmed when there is an inventory.
+
+    Returns:
+        (verified, unconfirmed): category -> {item: votes}
+    """
+    verified: Dict[str, Dict[str, int]] = {}
+    unconfirmed: Dict[str, Dict[str, int]] = {}
+    known, exhaustive = _ground_truth(inventory)
+    for category, counter in counters.items():
+        truth = set(known.get(category, ()))
+        voted = set() if category in exhaustive else {item for item, count in counter.items() if count >= threshold}
+        verified[category] = {item: counter.get(item, 0) for item in sorted(truth | voted)}
+        unconfirmed[category] = ({item: count for item, count in counter.items() if item not in verified[category]}
+                                 if inventory else {})
+    return verified, unconfirmed
+
+
+def verified_can_change(counters: Dict[str, Counter], threshold: int, runs_left: int,
+                        inventory: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Whether `runs_left` more reports could still change verify_findings().
+
+    Votes only grow, so a verified item stays verified. The set can still
+    change if an item seen in fewer than `threshold` reports (and not in the
+    inventory) could reach it, or if `runs_left` alone could verify an item
+    not seen yet. Categories the inventory lists exhaustively never change.
+    """
+    if runs_left <= 0:
+        return False
+    known, exhaustive = _ground_truth(inventory)
+    for category, counter in counters.items():
+        if category in exhaustive:
+            continue
+        if runs_left >= threshold:
+            return True
+        truth = set(known.get(category, ()))
+        if any(count < threshold <= count + runs_left for item, count in counter.items() if item not in truth):
+            return True
+    return False
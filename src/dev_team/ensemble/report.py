@@ -0,0 +1,292 @@
+"""
+Merged report writers for the voting ensemble
+
+One renderer shared by merge_results.py, run_full_analysis.py and
+orchestrator_multi_run.py. Sections are written straight to an open text
+handle (a file, or io.StringIO when the caller wants a string) as each
+category is rendered, instead of growing one string with `report += ...`,
+so memory stays flat no matter how many findings are verified.
+
+The same verified findings can also be written as JSON or CSV for
+downstream tools.
+
+When the merge used the static inventory (see inventory.py), `in_source`
+holds the items the scan found, marked 🔍, and `unconfirmed` the report
+items neither found in the source nor voted in; they are listed under each
+category instead of being dropped silently.
+"""
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from dev_team.ensemble.categories import FindingCategory
+
+Verified = Dict[str, Dict[str, int]]
+
+
+def sorted_by_votes(items: Dict[str, int]):
+    """Items ordered by vote count (descending), then name."""
+    return sorted(items.items(), key=lambda x: (-x[1], x[0]))
+
+
+class MergedReportWriter:
+    """
+    Streams the merged Markdown report to `out`.
+
+    Args:
+        out: Writable text handle
+        categories: Category registry, in report order
+        verified: category name -> {item: votes} for items that passed voting
+        num_runs: Number of reports that were merged
+        threshold: Voting threshold used
+        unconfirmed: category name -> {item: votes} for report items not
+            found by the static inventory, or None if it was not used
+        in_source: category name -> items the static inventory found
+    """
+
+    def __init__(self, out: TextIO, categories: Iterable[FindingCategory], verified: Verified,
+                 num_runs: int, threshold: int, unconfirmed: Optional[Verified] = None,
+                 in_source: Optional[Dict[str, Iterable[str]]] = None):
+        self.out = out
+        self.categories = list(categories)
+        self.verified = verified
+        self.num_runs = num_runs
+        self.threshold = threshold
+        self.unconfirmed = unconfirmed
+        self.in_source = {name: set(items) for name, items in (in_source or {}).items()}
+
+    def count(self, category: FindingCategory) -> int:
+        return len(self.verified.get(category.name, {}))
+
+    @property
+    def total_verified(self) -> int:
+        return sum(self.count(category) for category in self.categories)
+
+    def write_header(self, timestamp: str):
+        n, t = self.num_runs, self.threshold
+        self.out.write(f"""# Merged Technical Analysis Report
+## ELTA Courier Voucher for WooCommerce
+
+**Analysis Method:** Voting Ensemble ({n} runs of competitor_analyst)  
+**Voting Threshold:** {t}/{n} runs  
+**Generated:** {timestamp}  
+**Confidence:** Items verified in {t}+ runs only
+
+---
+
+## Executive Summary
+
+This report merges findings from {n} independent runs of the **competitor_analyst agent**.
+
+Only findings that appear in at least {t} runs are included, which:
+- ✅ Filters out hallucinations (appear in only 1-2 runs)
+- ✅ Increases confidence in findings
+- ✅ Improves accuracy from ~88% to ~94%
+
+**Confidence Levels:**
+- ✅✅✅✅✅ Found in all {n} runs (highest confidence)
+- ✅✅✅✅ Found in 4 runs (very high confidence)
+- ✅✅✅ Found in {t} runs (verified)
+
+---
+
+""")
+        if self.unconfirmed is not None:
+            self.out.write(f"""**Ground Truth:** Static inventory of the plugin source (`static-inventory.json`).
+Items marked 🔍 were found in the source and are verified regardless of votes;
+the others passed the {t}-run vote (file names are taken from the source only).
+Report items neither found in the source nor voted in are listed as unconfirmed.
+
+---
+
+""")
+
+    def write_category(self, category: FindingCategory):
+        write = self.out.write
+        items = self.verified.get(category.name, {})
+        write(f"## {category.title}\n\n**Total Verified:** {len(items)}\n\n")
+        if not items:
+            write(f"{category.empty_message(self.threshold, in_source=self.unconfirmed is not None)}\n")
+            self.write_unconfirmed(category)
+            return
+        in_source = self.in_source.get(category.name, set())
+        for item, count in sorted_by_votes(items):
+            marker = '🔍 ' if item in in_source else ''
+            write(f"- {category.render_item(item)} {marker}{'✅' * min(count, 5)} ({count}/{self.num_runs} runs)\n")
+        self.write_unconfirmed(category)
+
+    def write_unconfirmed(self, category: FindingCategory):
+        items = (self.unconfirmed or {}).get(category.name)
+        if not items:
+            return
+        self.out.write(f"\n**Unconfirmed** (in reports, not found in source or voted in): {len(items)}\n\n")
+        for item, count in sorted_by_votes(items):
+            self.out.write(f"- {category.render_item(item)} ⚠️ ({count}/{self.num_runs} runs)\n")
+
+    def write_categories(self):
+        for i, category in enumerate(self.categories):
+            if i:
+                self.out.write("\n---\n\n")
+            self.write_category(category)
+
+    def write_statistics(self, agent: str):
+        write = self.out.write
+        write(f"""
+---
+
+## Analysis Statistics
+
+- **Agent:** {agent}
+- **Total runs:** {self.num_runs}
+- **Voting threshold:** {self.threshold}/{self.num_runs} runs
+- **Total verified items:** {self.total_verified}
+
+### Verification Breakdown
+
+| Category | Verified Items |
+|----------|----------------|
+""")
+        for category in self.categories:
+            write(f"| {category.title} | {self.count(category)} |\n")
+
+    def write_methodology(self, run_files: Optional[List[str]] = None):
+        write = self.out.write
+        write(f"""
+---
+
+## Methodology
+
+### Voting Ensemble Logic
+
+1. Run competitor_analyst agent {self.num_runs} times independently
+2. Extract structured findings from each report
+3. Count occurrences of each finding across all runs
+4. Only include findings that appear in {self.threshold}+ runs
+5. Assign confidence scores based on frequency
+
+### Benefits
+
+- **Reduces hallucinations:** Fabricated items typically appear in only 1-2 runs
+- **Increases coverage:** Different runs may find different items
+- **Provides confidence scores:** Know which findings are most reliable
+- **Improves accuracy:** From ~88% (single run) to ~94% (5-run ensemble)
+""")
+        if run_files:
+            write("\n### Individual Reports\n\nView individual run results:\n")
+            for run_file in run_files:
+                write(f"- `{run_file}`\n")
+
+    def write_footer(self, generated_by: str, timestamp: str):
+        t = self.threshold
+        self.out.write(f"""
+---
+
+## Recommendations
+
+For findings with ✅✅✅✅✅ (all runs): **Highest confidence - use directly**  
+For findings with ✅✅✅✅ (4 runs): **Very high confidence - minimal verification needed**  
+For findings with ✅✅✅ ({t} runs): **Good confidence - verify if critical**  
+For items in only 1-2 runs: **Low confidence - likely hallucination or edge case**
+
+Consider manual verification for security-critical findings.
+
+---
+
+_Report generated by {generated_by}_  
+_Agent: competitor_analyst | Runs: {self.num_runs} | Threshold: {t} | Generated: {timestamp}_
+""")
+
+    def write(self, generated_by: str, agent: str = 'competitor_analyst',
+              run_files: Optional[List[str]] = None):
+        """Write the complete report."""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.write_header(timestamp)
+        self.write_categories()
+        self.write_statistics(agent)
+        self.write_methodology(run_files)
+        self.write_footer(generated_by, timestamp)
+
+
+def write_findings_json(out: TextIO, categories: Iterable[FindingCategory], verified: Verified,
+                        num_runs: int, threshold: int, unconfirmed: Optional[Verified] = None):
+    """
+    Write verified findings as JSON: {categories: {name: {title, items: [{item, votes}]}}}.
+
+    With `unconfirmed`, each category also gets an `unconfirmed` item list.
+    """
+    data = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'num_runs': num_runs,
+        'threshold': threshold,
+        'ground_truth': 'static-inventory' if unconfirmed is not None else None,
+        'categories': {},
+    }
+    for category in categories:
+        entry = data['categories'][category.name] = {
+            'title': category.title,
+            'items': [
+                {'item': item, 'votes': count}
+                for item, count in sorted_by_votes(verified.get(category.name, {}))
+            ],
+        }
+        if unconfirmed is not None:
+            entry['unconfirmed'] = [
+                {'item': item, 'votes': count}
+                for item, count in sorted_by_votes(unconfirmed.get(category.name, {}))
+            ]
+    json.dump(data, out, indent=2)
+    out.write("\n")
+
+
+def write_findings_csv(out: TextIO, categories: Iterable[FindingCategory], verified: Verified,
+                       num_runs: int, threshold: int):
+    """Write verified findings as CSV rows: category, item, votes, num_runs, threshold."""
+    writer = csv.writer(out)
+    writer.writerow(['category', 'item', 'votes', 'num_runs', 'threshold'])
+    for category in categories:
+        for item, count in sorted_by_votes(verified.get(category.name, {})):
+            writer.writerow([category.name, item, count, num_runs, threshold])
+
+
+def write_merged_outputs(output_dir: Path, categories: Iterable[FindingCategory], verified: Verified,
+                         num_runs: int, threshold: int, generated_by: str,
+                         agent: str = 'competitor_analyst',
+                         run_files: Optional[List[str]] = None,
+                         unconfirmed: Optional[Verified] = None,
+                         in_source: Optional[Dict[str, Iterable[str]]] = None) -> Path:
+    """
+    Write MERGED-technical-analysis.md plus MERGED-findings.json/.csv.
+
+    Pass `unconfirmed` (from inventory.verify_findings) and `in_source` (the
+    inventory's findings) when the static inventory was used.
+
+    Returns the path of the Markdown report.
+    """
+    categories = list(categories)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    report_path = output_dir / 'MERGED-technical-analysis.md'
+    with open(report_path, 'w', encoding='utf-8') as f:
+        MergedReportWriter(f, categories, verified, num_runs, threshold, unconfirmed, in_source).write(
+            generated_by, agent, run_files
+        )
+
+    with open(output_dir / 'MERGED-findings.json', 'w', encoding='utf-8') as f:
+        write_findings_json(f, categories, verified, num_runs, threshold, unconfirmed)
+
+    with open(output_dir / 'MERGED-findings.csv', 'w', encoding='utf-8', newline='') as f:
+        write_findings_csv(f, categories, verified, num_runs, threshold)
+
+    return report_path
+
+
+def print_verified_summary(categories: Iterable[FindingCategory], verified: Verified):
+    """Print the per-category verified counts to the console."""
+    categories = list(categories)
+    width = max(len(category.title) for category in categories) + 1
+    for category in categories:
+        label = f"{category.title}:"
+        print(f"  • {label:<{width}} {len(verified.get(category.name, {}))}")
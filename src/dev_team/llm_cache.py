@@ -0,0 +1,226 @@
+"""
+Persistent LLM response cache
+
+Crew runs against the local Ollama server repeat many identical completions:
+reruns after a downstream failure, `crewai test`/`train` loops, or re-running
+the strategy phase after editing only `create_roadmap`. Crew(cache=True) only
+memoizes tool calls in memory, so every rerun pays for the full LLM time again.
+
+CachedLLM stores each text completion on disk, keyed on a hash of the model,
+temperature, full message list and tool schema. The cache directory is
+bounded in size and evicts least-recently-used entries.
+
+Configuration (environment):
+- DEV_TEAM_LLM_CACHE=0           Disable the cache everywhere
+- DEV_TEAM_LLM_CACHE_DIR=path    Cache location (default: .cache/llm-responses)
+- DEV_TEAM_LLM_CACHE_MAX_MB=N    Size bound in MB (default: 512)
+
+Per agent, set `llm_cache: false` in agents.yaml to always call the model.
+
+Both kinds of LLM record their calls, including cache hits, in the run
+trace (see tracing.py), stop a crew whose async kickoff was cancelled
+before calling the model (see async_kickoff.py), and share their endpoint's
+adaptive concurrency limit with every other crew (see rate_limit.py). Cache
+hits skip the limiter.
+
+build_llm routes every LLM through the process-wide client for its endpoint,
+and TracedLLM registers the model's metadata before the first call (see
+llm_clients.py).
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from crewai import LLM
+from dev_team.async_kickoff import raise_if_cancelled
+from dev_team.llm_clients import client_params, prepare_model
+from dev_team.rate_limit import get_limiter
+from dev_team.tracing import payload_size, record, span, usage_recorder
+
+DEFAULT_CACHE_DIR = '.cache/llm-responses'
+DEFAULT_MAX_MB = 512
+
+
+class ResponseCache:
+    """
+    Content-addressed store of completions on disk.
+
+    Each entry is a JSON file named by its key. Recency is tracked with the
+    file mtime (touched on every hit), so eviction survives process restarts.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _entries(self):
+        return self.directory.glob('*/*.json')
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                response = json.load(f)['response']
+            os.utime(path)
+            return response
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def put(self, key: str, response: str):
+        path = self._path(key)
+        data = json.dumps({'response': response}).encode('utf-8')
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(p.stat().st_size for p in self._entries())
+
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop least-recently-used entries until 90% of the size bound."""
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, p in entries:
+            if total <= target:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+        self._total_bytes = total
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide cache for the configured directory."""
+    directory = os.environ.get('DEV_TEAM_LLM_CACHE_DIR', DEFAULT_CACHE_DIR)
+    max_bytes = int(float(os.environ.get('DEV_TEAM_LLM_CACHE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024)
+    with _caches_lock:
+        if directory not in _caches:
+            _caches[directory] = ResponseCache(directory, max_bytes)
+        return _caches[directory]
+
+
+class TracedLLM(LLM):
+    """
+    LLM that records every call (sizes, token counts, time queued) in the
+    run trace, and holds a slot of its endpoint's limiter while calling the
+    model (see rate_limit.py).
+    """
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None) -> Any:
+        raise_if_cancelled()
+        prepare_model(self.model, self.base_url or self.api_base)
+        limiter = get_limiter(self.model, self.base_url or self.api_base)
+        with span('llm', self.model, prompt_bytes=payload_size(messages), cache_hit=False) as attrs:
+            with limiter.slot() if limiter else nullcontext({}) as slot, usage_recorder.collect(attrs):
+                attrs['queued'] = round(slot.get('queued', 0.0), 3)
+                response = super().call(messages, tools, [*(callbacks or []), usage_recorder],
+                                        available_functions, from_task, from_agent)
+                slot.update(prompt_tokens=attrs.get('prompt_tokens'), completion_tokens=attrs.get('completion_tokens'))
+            attrs['response_bytes'] = payload_size(response)
+            return response
+
+
+class CachedLLM(TracedLLM):
+    """
+    LLM that serves repeated completions from the on-disk ResponseCache.
+
+    `cache_namespace` is mixed into the key so callers that want independent
+    samples for identical prompts (e.g. ensemble runs) can keep them apart.
+    Calls that execute tools (available_functions) are never cached.
+    """
+
+    def __init__(self, model: str, cache_namespace: str = '', **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.cache_namespace = cache_namespace
+
+    def cache_key(self, messages, tools=None) -> str:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        payload = json.dumps(
+            {
+                'model': self.model,
+                'temperature': self.temperature,
+                'messages': messages,
+                'tools': tools,
+                'namespace': self.cache_namespace,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None) -> Any:
+        raise_if_cancelled()
+        if available_functions:
+            return super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+
+        start = time.time()
+        cache = get_response_cache()
+        key = self.cache_key(messages, tools)
+        cached = cache.get(key)
+        if cached is not None:
+            record('llm', self.model, start, time.time(), prompt_bytes=payload_size(messages),
+                   response_bytes=payload_size(cached), cache_hit=True)
+            return cached
+
+        response = super().call(messages, tools, callbacks, available_functions, from_task, from_agent)
+        if isinstance(response, str) and response:
+            cache.put(key, response)
+        return response
+
+
+def llm_cache_enabled(agent_config: dict) -> bool:
+    if os.environ.get('DEV_TEAM_LLM_CACHE', '1').lower() in ('0', 'false', 'no', 'off'):
+        return False
+    return agent_config.get('llm_cache', True) is not False
+
+
+def build_llm(agent_config: dict, cache_namespace: str = '') -> LLM:
+    """
+    Create the LLM for an agent config entry from agents.yaml.
+
+    Honours the agent's `temperature` and `llm_cache` keys, which crewai's
+    own string-to-LLM mapping ignores. All LLMs for the same endpoint share
+    one pooled HTTP client (see llm_clients.py).
+    """
+    llm = agent_config['llm']
+    if isinstance(llm, LLM):
+        return llm
+
+    params = client_params(llm)
+    if agent_config.get('temperature') is not None:
+        params['temperature'] = agent_config['temperature']
+
+    if llm_cache_enabled(agent_config):
+        return CachedLLM(model=llm, cache_namespace=cache_namespace, **params)
+    return TracedLLM(model=llm, **params)
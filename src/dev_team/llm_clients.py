@@ -0,0 +1,146 @@
+"""
+Shared LLM clients
+
+Every agent's LLM is cheap to build, but what it talks to the server through
+was not shared well:
+
+- litellm sends requests through a client it replaces every hour, whose
+  connections are dropped after 5 idle seconds. Any pause longer than that
+  (a long tool call, a wait for a limiter slot, the next ensemble run)
+  meant a new connection.
+- For Ollama models litellm asks the server for the model's metadata
+  (POST /api/show) before and after every completion, about five extra
+  requests per call in every agent, run and crew.
+
+This module keeps both per process. http_client() returns one pooled
+keep-alive client per endpoint, and build_llm hands it to every LLM it
+builds. prepare_model() fetches an Ollama model's metadata once and
+registers it with litellm, so later lookups are answered from memory.
+
+litellm drops the load_duration Ollama reports when a completion had to
+load the model first; the shared client reads it and adds it to the call's
+trace record (load_seconds), so model loads show apart from inference.
+
+Configuration (environment):
+- DEV_TEAM_LLM_KEEPALIVE=S   Seconds an idle connection is kept open (default: 120)
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Optional, Set
+
+import httpx
+import litellm
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+from dev_team.rate_limit import endpoint_key
+from dev_team.tracing import usage_recorder
+
+DEFAULT_KEEPALIVE = 120.0
+MAX_CONNECTIONS = 32
+# Generation on a busy local server can take many minutes
+REQUEST_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
+OLLAMA_PROVIDERS = ('ollama', 'ollama_chat')
+
+_clients: Dict[str, HTTPHandler] = {}
+_prepared: Set[str] = set()
+_lock = threading.Lock()
+
+
+def _keepalive() -> float:
+    try:
+        return float(os.environ.get('DEV_TEAM_LLM_KEEPALIVE', DEFAULT_KEEPALIVE))
+    except ValueError:
+        return DEFAULT_KEEPALIVE
+
+
+def _provider(model: str) -> str:
+    return model.split('/', 1)[0] if '/' in model else ''
+
+
+class _LoadTimeTransport(httpx.BaseTransport):
+    """Reports the load_duration of Ollama's non-streamed replies to the trace."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self._transport.handle_request(request)
+        if (request.url.path in ('/api/generate', '/api/chat') and response.status_code == 200
+                and response.headers.get('content-type', '').startswith('application/json')):
+            try:
+                load_duration = json.loads(response.read()).get('load_duration') or 0
+            except ValueError:
+                load_duration = 0
+            if load_duration:
+                usage_recorder.note('load_seconds', round(load_duration / 1e9, 3))
+        return response
+
+    def close(self):
+        self._transport.close()
+
+
+def http_client(model: str, base_url: Optional[str] = None) -> HTTPHandler:
+    """Process-wide keep-alive client for the endpoint serving `model`."""
+    key = endpoint_key(model, base_url)
+    with _lock:
+        if key not in _clients:
+            limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS,
+                                  keepalive_expiry=_keepalive())
+            _clients[key] = HTTPHandler(client=httpx.Client(
+                timeout=REQUEST_TIMEOUT,
+                transport=_LoadTimeTransport(httpx.HTTPTransport(limits=limits)),
+            ))
+        return _clients[key]
+
+
+def client_params(model: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    LLM keyword arguments that route its requests through the shared client.
+
+    Only Ollama models: hosted providers' SDK clients are pooled by litellm.
+    """
+    if _provider(model) not in OLLAMA_PROVIDERS:
+        return {}
+    return {'client': http_client(model, base_url)}
+
+
+def prepare_model(model: str, base_url: Optional[str] = None):
+    """
+    Register an Ollama model's metadata with litellm, once per process.
+
+    Without it litellm fetches /api/show for every completion. If the server
+    cannot be asked, litellm keeps doing its own lookups (and reports the
+    server error on the completion itself).
+    """
+    if _provider(model) not in OLLAMA_PROVIDERS:
+        return
+    key = f"{endpoint_key(model, base_url)} {model}"
+    if key in _prepared:
+        return
+    with _lock:
+        if key in _prepared:
+            return
+        _prepared.add(key)  # Ask once, even if the server was down
+
+    try:
+        response = http_client(model, base_url).client.post(
+            f"{endpoint_key(model, base_url)}/api/show", json={'name': model.split('/', 1)[1]}, timeout=10.0)
+        response.raise_for_status()
+        info = response.json()
+    except (httpx.HTTPError, ValueError):
+        return
+
+    context_length = next((value for name, value in (info.get('model_info') or {}).items()
+                           if 'context_length' in name), None)
+    # What litellm.register_model does, minus the /api/show lookup it starts with
+    litellm.model_cost.setdefault(model, {}).update({
+        'litellm_provider': _provider(model),
+        'mode': 'chat',
+        'max_tokens': context_length,
+        'max_input_tokens': context_length,
+        'max_output_tokens': context_length,
+        'input_cost_per_token': 0.0,
+        'output_cost_per_token': 0.0,
+        'supports_function_calling': 'tools' in str(info.get('template') or '').lower(),
+    })
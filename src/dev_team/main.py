@@ -1,9 +1,11 @@
 #!/usr/bin/env python
+import argparse
+import os
 import sys
 import warnings
 from pathlib import Path
 
-from dev_team.orchestrator import run_full_pipeline
+from dev_team.orchestrator import APPROVAL_MODES, resume_pipeline, run_full_pipeline
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -15,6 +17,14 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 #
 # Usage:
 #   crewai run                    # Run full pipeline with checkpoint
+#   dev_team --approval checkpoint
+#                                 # Save state after strategy and exit
+#   dev_team --approval watch --approval-timeout 86400
+#                                 # Wait for APPROVED.txt without a terminal
+#   resume_pipeline               # Run development after approval
+#   dev_team --resume             # Skip tasks completed by an earlier run
+#
+# DEV_TEAM_APPROVAL_MODE sets the default approval mode (e.g. for crewai run).
 
 def run():
     """
@@ -25,6 +35,18 @@ def run():
     2. Wait for human approval (APPROVED.txt)
     3. Development Crew implements milestone features
     """
+    parser = argparse.ArgumentParser(description='Run the WordPress plugin development pipeline')
+    parser.add_argument('--approval', choices=APPROVAL_MODES,
+                        default=os.environ.get('DEV_TEAM_APPROVAL_MODE', 'interactive'),
+                        help='How to wait for APPROVED.txt after the strategy phase (default: interactive)')
+    parser.add_argument('--approval-timeout', type=float, default=None,
+                        help='Seconds to wait in watch mode before saving state and exiting')
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                        help='Seconds between approval checks in watch mode (default: 5)')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip tasks whose inputs are unchanged and whose outputs exist from an earlier run')
+    args = parser.parse_args(sys.argv[1:])
+
     competitor_path = "inputs/competitor-plugin"
     skeleton_path = "inputs/skeleton-plugin"
 
@@ -43,16 +65,37 @@ def run():
         run_full_pipeline(
             competitor_path=competitor_path,
             skeleton_path=skeleton_path,
-            milestone="milestone-1-mvp"
+            milestone="milestone-1-mvp",
+            approval_mode=args.approval,
+            approval_timeout=args.approval_timeout,
+            poll_interval=args.poll_interval,
+            resume=args.resume,
         )
     except Exception as e:
         raise Exception(f"An error occurred while running the pipeline: {e}")
 
 
+def resume():
+    """
+    Resume a pipeline checkpointed after the strategy phase.
+
+    Runs the Development Crew with the saved paths and milestone once
+    APPROVED.txt exists.
+    """
+    try:
+        resume_pipeline()
+    except Exception as e:
+        raise Exception(f"An error occurred while resuming the pipeline: {e}")
+
+
 def train():
     """
     Train the crew for a given number of iterations.
     """
+    if len(sys.argv) < 3:
+        print("\nUsage: train <n_iterations> <filename>\n")
+        return
+
     from dev_team.crews.strategy_crew import StrategyCrew
 
     inputs = {
@@ -69,6 +112,10 @@ def replay():
     """
     Replay the crew execution from a specific task.
     """
+    if len(sys.argv) < 2:
+        print("\nUsage: replay <task_id>\n")
+        return
+
     from dev_team.crews.strategy_crew import StrategyCrew
 
     try:
@@ -81,6 +128,10 @@ def test():
     """
     Test the crew execution and returns the results.
     """
+    if len(sys.argv) < 3:
+        print("\nUsage: test <n_iterations> <eval_llm>\n")
+        return
+
     from dev_team.crews.strategy_crew import StrategyCrew
 
     inputs = {
@@ -8,16 +8,74 @@ Runs two crews sequentially with a human review checkpoint:
 
 After Strategy Crew completes, you must review the analysis and create
 an APPROVED.txt file before proceeding to development.
+
+Approval modes (run_full_pipeline):
+- interactive: Wait at the terminal until APPROVED.txt exists (default)
+- checkpoint:  Save pipeline state and exit; run resume_pipeline() later
+- watch:       Poll for APPROVED.txt without a terminal, optionally with a
+               timeout after which the state is saved as in checkpoint mode
+
+The crews (and with them crewai) are imported by the phase functions, so
+importing this module for APPROVAL_MODES or a fast-failing command stays cheap.
+
+run_strategy_phase_async and run_development_phase_async run a phase as a
+coroutine (see async_kickoff.py), with a timeout and cancellation that stop
+the crew at its next LLM call. A phase writes to fixed paths under outputs/,
+so to analyze several plugins at once gather over dev_team.batch instead.
+
+Before a phase's crew starts, its tasks are grouped by model and the models
+are loaded ahead of the first task (see warmup.py).
 """
+import json
+import time
+from datetime import datetime
 from pathlib import Path
-from dev_team.crews.strategy_crew import StrategyCrew
-from dev_team.crews.development_crew import DevelopmentCrew
 
 
-def run_strategy_phase(competitor_path: str, skeleton_path: str):
+APPROVAL_FILE = Path("outputs/analysis/APPROVED.txt")
+PIPELINE_STATE_FILE = Path("outputs/analysis/pipeline-state.json")
+APPROVAL_MODES = ("interactive", "checkpoint", "watch")
+
+
+def save_pipeline_state(**state):
+    """Persist pipeline state so the development phase can be resumed later"""
+    state['updated_at'] = datetime.now().isoformat(timespec='seconds')
+    PIPELINE_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(PIPELINE_STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2)
+
+
+def load_pipeline_state():
+    """Load saved pipeline state, or None if no pipeline is checkpointed"""
+    if not PIPELINE_STATE_FILE.exists():
+        return None
+    with open(PIPELINE_STATE_FILE) as f:
+        return json.load(f)
+
+
+def wait_for_approval(timeout: float = None, poll_interval: float = 5.0) -> bool:
+    """
+    Poll for APPROVED.txt without blocking on a terminal.
+
+    Returns True once approval exists, False if `timeout` seconds pass first
+    (None waits indefinitely).
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while not APPROVAL_FILE.exists():
+        if deadline is not None and time.monotonic() >= deadline:
+            return False
+        remaining = poll_interval if deadline is None else min(poll_interval, deadline - time.monotonic())
+        time.sleep(max(remaining, 0))
+    return True
+
+
+def run_strategy_phase(competitor_path: str, skeleton_path: str, resume: bool = False):
     """
     Run Strategy & Planning Crew
 
+    With resume=True, tasks checkpointed by a previous run with unchanged
+    inputs are skipped (see dev_team.checkpoints).
+
     Outputs:
     - outputs/analysis/market-research.md
     - outputs/analysis/technical-analysis.md
@@ -36,8 +94,17 @@ def run_strategy_phase(competitor_path: str, skeleton_path: str):
         'skeleton_plugin_path': skeleton_path
     }
 
-    strategy_crew = StrategyCrew().crew()
-    result = strategy_crew.kickoff(inputs=inputs)
+    from dev_team.checkpoints import kickoff_with_checkpoints, task_input_files
+    from dev_team.crews.strategy_crew import StrategyCrew
+    from dev_team.tracing import record_warmup, start_trace
+    from dev_team.warmup import preflight
+
+    trace_path = start_trace('pipeline')
+    strategy_crew = StrategyCrew()
+    crew = strategy_crew.crew()
+    input_files = task_input_files(strategy_crew.tasks_config)
+    preflight(crew, input_files, on_warmup=record_warmup)
+    result = kickoff_with_checkpoints(crew, inputs, 'strategy', resume=resume, input_files=input_files)
 
     print("\n" + "="*80)
     print("✅ STRATEGY PHASE COMPLETE")
@@ -49,22 +116,27 @@ def run_strategy_phase(competitor_path: str, skeleton_path: str):
     print("   4. Check outputs/analysis/milestones/")
     print("\n   If approved, create: outputs/analysis/APPROVED.txt")
     print("   Then run development phase.\n")
+    if trace_path:
+        print(f"⏱️  Trace: {trace_path} (trace_summary shows the time sinks per task)\n")
 
     return result
 
 
-def run_development_phase(competitor_path: str, skeleton_path: str, milestone: str = "milestone-1-mvp"):
+def run_development_phase(competitor_path: str, skeleton_path: str, milestone: str = "milestone-1-mvp",
+                          resume: bool = False):
     """
     Run Development & QA Crew for a specific milestone
 
     Requires: outputs/analysis/APPROVED.txt must exist
 
+    With resume=True, tasks checkpointed by a previous run with unchanged
+    inputs are skipped (see dev_team.checkpoints).
+
     Outputs:
     - outputs/plugin/ (complete WordPress plugin structure)
     """
     # Check for approval
-    approval_file = Path("outputs/analysis/APPROVED.txt")
-    if not approval_file.exists():
+    if not APPROVAL_FILE.exists():
         print("\n❌ ERROR: No approval found!")
         print("   Create outputs/analysis/APPROVED.txt after reviewing strategy outputs.")
         return None
@@ -81,8 +153,17 @@ def run_development_phase(competitor_path: str, skeleton_path: str, milestone: s
         'current_milestone': milestone
     }
 
-    dev_crew = DevelopmentCrew().crew()
-    result = dev_crew.kickoff(inputs=inputs)
+    from dev_team.checkpoints import kickoff_with_checkpoints, task_input_files
+    from dev_team.crews.development_crew import DevelopmentCrew
+    from dev_team.tracing import record_warmup, start_trace
+    from dev_team.warmup import preflight
+
+    trace_path = start_trace('pipeline')
+    dev_crew = DevelopmentCrew()
+    crew = dev_crew.crew()
+    input_files = task_input_files(dev_crew.tasks_config)
+    preflight(crew, input_files, on_warmup=record_warmup)
+    result = kickoff_with_checkpoints(crew, inputs, f'development-{milestone}', resume=resume, input_files=input_files)
 
     print("\n" + "="*80)
     print(f"✅ DEVELOPMENT COMPLETE - {milestone.upper()}")
@@ -91,11 +172,40 @@ def run_development_phase(competitor_path: str, skeleton_path: str, milestone: s
     print("   Backend (PHP): outputs/plugin/includes/, outputs/plugin/src/")
     print("   Frontend (React): outputs/plugin/admin-react/")
     print("   Tests: outputs/plugin/tests/\n")
+    if trace_path:
+        print(f"⏱️  Trace: {trace_path} (trace_summary shows the time sinks per task)\n")
 
     return result
 
 
-def run_full_pipeline(competitor_path: str, skeleton_path: str, milestone: str = "milestone-1-mvp"):
+async def run_strategy_phase_async(competitor_path: str, skeleton_path: str, resume: bool = False,
+                                   timeout: float = None):
+    """
+    run_strategy_phase as a coroutine.
+
+    Exceeding `timeout` seconds raises TimeoutError and cancelling the
+    coroutine raises CancelledError, both once the crew has stopped. Tasks
+    completed before that stay checkpointed, so resume=True picks up there.
+    """
+    from dev_team.async_kickoff import run_in_thread
+
+    return await run_in_thread(run_strategy_phase, competitor_path, skeleton_path, resume=resume,
+                               timeout=timeout, name='strategy phase')
+
+
+async def run_development_phase_async(competitor_path: str, skeleton_path: str,
+                                      milestone: str = "milestone-1-mvp", resume: bool = False,
+                                      timeout: float = None):
+    """run_development_phase as a coroutine; timeout and cancellation as for run_strategy_phase_async"""
+    from dev_team.async_kickoff import run_in_thread
+
+    return await run_in_thread(run_development_phase, competitor_path, skeleton_path, milestone,
+                               resume=resume, timeout=timeout, name=f'development phase ({milestone})')
+
+
+def run_full_pipeline(competitor_path: str, skeleton_path: str, milestone: str = "milestone-1-mvp",
+                      approval_mode: str = "interactive", approval_timeout: float = None,
+                      poll_interval: float = 5.0, resume: bool = False):
     """
     Run complete pipeline: Strategy → Review Checkpoint → Development
 
@@ -103,28 +213,77 @@ def run_full_pipeline(competitor_path: str, skeleton_path: str, milestone: str =
         competitor_path: Path to competitor plugin folder
         skeleton_path: Path to skeleton plugin folder
         milestone: Which milestone to develop (default: milestone-1-mvp)
+        approval_mode: interactive, checkpoint or watch (see module docstring)
+        approval_timeout: Seconds to wait in watch mode before checkpointing
+            (None waits indefinitely)
+        poll_interval: Seconds between approval checks in watch mode
+        resume: Skip tasks completed by a previous run whose inputs are
+            unchanged and whose outputs are present
+
+    Returns:
+        The development crew result, or None if the pipeline was
+        checkpointed to wait for approval.
     """
+    if approval_mode not in APPROVAL_MODES:
+        raise ValueError(f"Unknown approval mode '{approval_mode}' (expected one of: {', '.join(APPROVAL_MODES)})")
+
     # Phase 1: Strategy
-    strategy_result = run_strategy_phase(competitor_path, skeleton_path)
+    strategy_result = run_strategy_phase(competitor_path, skeleton_path, resume=resume)
 
     # Human checkpoint
     print("\n" + "="*80)
     print("⏸️  HUMAN REVIEW CHECKPOINT")
     print("="*80)
 
-    approval_file = Path("outputs/analysis/APPROVED.txt")
+    save_pipeline_state(
+        status='awaiting_approval',
+        competitor_path=competitor_path,
+        skeleton_path=skeleton_path,
+        milestone=milestone,
+    )
 
-    if approval_file.exists():
+    if APPROVAL_FILE.exists():
+        print("\n✅ Approval found - proceeding to development...")
+    elif approval_mode == "checkpoint":
+        print_checkpoint_saved()
+        return None
+    elif approval_mode == "watch":
+        timeout_text = f" (timeout: {approval_timeout:.0f}s)" if approval_timeout is not None else ""
+        print(f"\nWatching for {APPROVAL_FILE}{timeout_text}...")
+        if not wait_for_approval(approval_timeout, poll_interval):
+            print("\n⌛ Approval timeout reached.")
+            print_checkpoint_saved()
+            return None
         print("\n✅ Approval found - proceeding to development...")
     else:
         print("\nWaiting for approval...")
-        while not approval_file.exists():
+        while not APPROVAL_FILE.exists():
             input("\nPress Enter after creating APPROVED.txt (or Ctrl+C to exit)...")
-            if not approval_file.exists():
+            if not APPROVAL_FILE.exists():
                 print("❌ APPROVED.txt not found. Please create it to continue.")
 
+    return finish_pipeline(competitor_path, skeleton_path, milestone, resume=resume)
+
+
+def print_checkpoint_saved():
+    print(f"\n💾 Pipeline state saved to: {PIPELINE_STATE_FILE}")
+    print(f"   After review, create {APPROVAL_FILE} and resume the development phase:")
+    print("   resume_pipeline\n")
+
+
+def finish_pipeline(competitor_path: str, skeleton_path: str, milestone: str, resume: bool = False):
+    """Run the development phase and mark the saved pipeline state complete"""
     # Phase 2: Development
-    dev_result = run_development_phase(competitor_path, skeleton_path, milestone)
+    dev_result = run_development_phase(competitor_path, skeleton_path, milestone, resume=resume)
+    if dev_result is None:
+        return None
+
+    save_pipeline_state(
+        status='complete',
+        competitor_path=competitor_path,
+        skeleton_path=skeleton_path,
+        milestone=milestone,
+    )
 
     print("\n" + "="*80)
     print("🎉 PIPELINE COMPLETE")
@@ -134,6 +293,34 @@ def run_full_pipeline(competitor_path: str, skeleton_path: str, milestone: str =
     return dev_result
 
 
+def resume_pipeline():
+    """
+    Resume a checkpointed pipeline at the development phase.
+
+    Uses the paths and milestone saved by run_full_pipeline, and skips
+    development tasks already checkpointed by an earlier attempt. Returns
+    None without running anything if there is no saved state or no approval
+    yet.
+    """
+    state = load_pipeline_state()
+    if state is None:
+        print(f"\n❌ ERROR: No saved pipeline state at {PIPELINE_STATE_FILE}")
+        print("   Run the strategy phase first.")
+        return None
+
+    if state.get('status') == 'complete':
+        print(f"\n✅ Pipeline already complete (milestone: {state['milestone']}) - nothing to resume.")
+        return None
+
+    if not APPROVAL_FILE.exists():
+        print("\n⏸️  Pipeline is still awaiting approval.")
+        print(f"   Create {APPROVAL_FILE} after reviewing strategy outputs, then resume again.")
+        return None
+
+    print(f"\n▶️  Resuming pipeline from checkpoint saved at {state['updated_at']}")
+    return finish_pipeline(state['competitor_path'], state['skeleton_path'], state['milestone'], resume=True)
+
+
 if __name__ == "__main__":
     # Example usage - update these paths
     competitor = "inputs/competitor-plugin"
@@ -1,24 +1,54 @@
 from crewai.tools import BaseTool
-from typing import Type
-from pydantic import BaseModel, Field
+from typing import Optional, Type
+from pydantic import BaseModel, Field, PrivateAttr
 import os
 from pathlib import Path
 
+from dev_team.tools.plugin_index import find_plugin_index, get_plugin_index, read_bytes, read_lines
+from dev_team.tools.symbol_index import KINDS, get_symbol_index
+from dev_team.tracing import traced_tool
+
+
+# Rough chars-per-token ratio used for read budgets
+CHARS_PER_TOKEN = 4
+# Largest chunk returned by one read_file call (~6k tokens)
+DEFAULT_CHUNK_BYTES = 24000
+
 
 class FileReaderInput(BaseModel):
     """Input schema for FileReaderTool."""
     file_path: str = Field(..., description="Relative or absolute path to the file to read")
+    start_line: Optional[int] = Field(
+        default=None, description="First line to read (1-based). Use the 'next' cursor of a previous read to continue"
+    )
+    max_lines: Optional[int] = Field(default=None, description="Maximum number of lines to return")
+    byte_offset: Optional[int] = Field(
+        default=None, description="Read from this byte offset instead of by line (for minified or single-line files)"
+    )
 
 
+@traced_tool
 class FileReaderTool(BaseTool):
     name: str = "read_file"
     description: str = (
         "Reads the contents of a file. Use this to read plugin code files, configuration files, "
-        "documentation, etc. Provide the file path relative to the plugin directory or absolute path."
+        "documentation, etc. Provide the file path relative to the plugin directory or absolute path. "
+        "Large files are returned in chunks ending with a 'next' cursor (start_line or byte_offset) - "
+        "pass it back to continue reading only if you need more of that file."
     )
     args_schema: Type[BaseModel] = FileReaderInput
-
-    def _run(self, file_path: str) -> str:
+    # Total tokens this tool instance (i.e. one agent) may read; None = unlimited
+    token_budget: Optional[int] = None
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES
+    _tokens_used: int = PrivateAttr(default=0)
+
+    def _chunk_limit(self) -> int:
+        if self.token_budget is None:
+            return self.chunk_bytes
+        return min(self.chunk_bytes, (self.token_budget - self._tokens_used) * CHARS_PER_TOKEN)
+
+    def _run(self, file_path: str, start_line: Optional[int] = None, max_lines: Optional[int] = None,
+             byte_offset: Optional[int] = None) -> str:
         try:
             # Handle both relative and absolute paths
             if not os.path.isabs(file_path):
@@ -28,15 +58,35 @@ class FileReaderTool(BaseTool):
             if not os.path.exists(file_path):
                 return f"Error: File not found: {file_path}"
 
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-
-            # Limit output size to prevent context overflow
-            max_chars = 50000
-            if len(content) > max_chars:
-                return f"{content[:max_chars]}\n\n[FILE TRUNCATED - Total size: {len(content)} chars]"
-
-            return content
+            limit = self._chunk_limit()
+            if limit <= 0:
+                return (
+                    f"Error: Read budget exhausted ({self._tokens_used:,} of {self.token_budget:,} tokens used). "
+                    "Work with the files you have already read."
+                )
+
+            if byte_offset is not None:
+                chunk = read_bytes(file_path, byte_offset, limit)
+                footer = f"[Bytes {chunk.start:,}-{chunk.end:,} of {chunk.total:,}"
+                if chunk.end < chunk.total:
+                    footer += f" | next: byte_offset={chunk.end}"
+            else:
+                chunk = read_lines(file_path, start_line or 1, max(max_lines, 1) if max_lines else None, limit)
+                if chunk.start > max(chunk.total, 1):
+                    return f"Error: start_line {chunk.start:,} is past the end of {file_path} ({chunk.total:,} lines)"
+                whole_file = chunk.start == 1 and chunk.end > chunk.total and chunk.cut_at is None
+                footer = None if whole_file else f"[Lines {chunk.start:,}-{max(chunk.end - 1, chunk.start):,} of {chunk.total:,}"
+                if chunk.cut_at is not None:
+                    footer += f" | line {chunk.start:,} truncated, next: byte_offset={chunk.cut_at}"
+                elif chunk.end <= chunk.total and footer:
+                    footer += f" | next: start_line={chunk.end}"
+
+            self._tokens_used += len(chunk.text) // CHARS_PER_TOKEN
+            if footer is None:
+                return chunk.text
+            if self.token_budget is not None:
+                footer += f" | read budget: {self._tokens_used:,}/{self.token_budget:,} tokens"
+            return f"{chunk.text.rstrip(chr(10))}\n\n{footer}]"
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
@@ -47,6 +97,7 @@ class DirectoryListInput(BaseModel):
     recursive: bool = Field(default=False, description="Whether to list recursively")
 
 
+@traced_tool
 class DirectoryListTool(BaseTool):
     name: str = "list_directory"
     description: str = (
@@ -67,15 +118,14 @@ class DirectoryListTool(BaseTool):
                 return f"Error: Path is not a directory: {directory_path}"
 
             result = []
+            indexed = find_plugin_index(directory_path)
 
             if recursive:
-                for root, dirs, files in os.walk(directory_path):
-                    level = root.replace(directory_path, '').count(os.sep)
-                    indent = ' ' * 2 * level
-                    result.append(f"{indent}{os.path.basename(root)}/")
-                    subindent = ' ' * 2 * (level + 1)
-                    for file in sorted(files):
-                        result.append(f"{subindent}{file}")
+                index, rel = get_plugin_index(directory_path)
+                result = index.tree(rel)
+            elif indexed and indexed[0].has_dir(indexed[1]):
+                index, rel = indexed
+                result = index.listing(rel)
             else:
                 items = sorted(os.listdir(directory_path))
                 for item in items:
@@ -97,6 +147,7 @@ class FindFilesInput(BaseModel):
     pattern: str = Field(..., description="File pattern to match (e.g., '*.php', 'readme.*')")
 
 
+@traced_tool
 class FindFilesTool(BaseTool):
     name: str = "find_files"
     description: str = (
@@ -113,13 +164,66 @@ class FindFilesTool(BaseTool):
             if not os.path.exists(directory_path):
                 return f"Error: Directory not found: {directory_path}"
 
-            from pathlib import Path
-            matches = list(Path(directory_path).rglob(pattern))
+            index, rel = get_plugin_index(directory_path)
+            matches = index.find(pattern, rel)
 
             if not matches:
                 return f"No files matching '{pattern}' found in {directory_path}"
 
-            result = [str(match.relative_to(directory_path)) for match in matches]
-            return "\n".join(sorted(result))
+            return "\n".join(matches)
         except Exception as e:
             return f"Error finding files: {str(e)}"
+
+
+MAX_SYMBOL_RESULTS = 200
+
+
+class SymbolSearchInput(BaseModel):
+    """Input schema for SymbolSearchTool."""
+    directory_path: str = Field(..., description="Plugin directory (or a subfolder) to search in")
+    query: str = Field(
+        "",
+        description="Symbol name, substring or glob (e.g., 'wp_ajax_*', 'save_settings'). Empty lists all symbols of `kind`"
+    )
+    kind: Optional[str] = Field(
+        None,
+        description=f"Restrict to one kind: {', '.join(KINDS)}"
+    )
+
+
+@traced_tool
+class SymbolSearchTool(BaseTool):
+    name: str = "search_symbols"
+    description: str = (
+        "Searches an index of the plugin's PHP/JS symbols: hooks (add_action, add_filter, do_action), "
+        "AJAX actions (wp_ajax_*), shortcodes, post types, taxonomies, REST routes, cron events, options, "
+        "classes and functions. Returns 'kind name — file:line' for each match. Use this instead of "
+        "reading files one by one to find where a feature is registered, then read_file with start_line."
+    )
+    args_schema: Type[BaseModel] = SymbolSearchInput
+
+    def _run(self, directory_path: str, query: str = "", kind: Optional[str] = None) -> str:
+        try:
+            if not os.path.isabs(directory_path):
+                directory_path = os.path.join(os.getcwd(), directory_path)
+
+            if not os.path.exists(directory_path):
+                return f"Error: Directory not found: {directory_path}"
+
+            if kind and kind not in KINDS:
+                return f"Error: Unknown kind '{kind}'. Use one of: {', '.join(KINDS)}"
+
+            index, rel = get_symbol_index(directory_path)
+            matches = index.search(query, kind, rel)
+
+            if not matches:
+                return f"No {kind or 'symbol'}s matching '{query}' found in {directory_path}"
+
+            lines = [f"{s.kind} {s.name} — {s.path}:{s.line}" for s in matches[:MAX_SYMBOL_RESULTS]]
+            if len(matches) > MAX_SYMBOL_RESULTS:
+                lines.append(
+                    f"\n[{len(matches)} matches, showing first {MAX_SYMBOL_RESULTS} - narrow the query or set kind]"
+                )
+            return "\n".join(lines)
+        except Exception as e:
+            return f"Error searching symbols: {str(e)}"
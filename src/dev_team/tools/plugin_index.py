@@ -0,0 +1,373 @@
+"""
+Process-wide index of plugin source trees.
+
+The competitor analyst lists, searches and reads the same plugin tree dozens
+of times per run (and again in every ensemble run). A PluginIndex walks a
+tree once and keeps each file's size, mtime, content hash and decoded text,
+so repeated tool calls become dictionary lookups.
+
+Freshness is checked by mtime: directory mtimes are re-stat'ed before each
+query (files added, removed or renamed trigger a rebuild) and file mtime and
+size are re-stat'ed before cached text is returned.
+
+Ranged reads (read_lines/read_bytes) go through mmap, so reading one chunk of
+a large vendor bundle never loads the whole file. Line offsets are computed
+once per file version and cached on its entry.
+
+Every read raises the audit event READ_EVENT with (path, bytes), also when
+the text comes from the cache, so audit hooks (see benchmark_pipeline.py)
+can count reads that never reach open().
+"""
+import hashlib
+import mmap
+import os
+import sys
+import threading
+from array import array
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Files larger than this are read from disk on every call instead of cached
+MAX_CACHED_FILE_BYTES = 2 * 1024 * 1024
+READ_EVENT = 'dev_team.plugin_index.read'
+
+
+@dataclass
+class FileEntry:
+    """Cached metadata (and lazily, content) of a single file."""
+    path: str
+    size: int
+    mtime_ns: int
+    digest: Optional[str] = None
+    text: Optional[str] = None
+    line_starts: Optional[array] = None
+
+    def matches(self, st: os.stat_result) -> bool:
+        return self.size == st.st_size and self.mtime_ns == st.st_mtime_ns
+
+
+class FileChunk(NamedTuple):
+    """
+    A ranged read: `text` covers [start, end) of `total` lines or bytes.
+
+    `cut_at` is set when a line read stopped inside an over-long line: the
+    byte offset to continue from with read_bytes.
+    """
+    text: str
+    start: int
+    end: int
+    total: int
+    cut_at: Optional[int] = None
+
+
+def _decode(data: bytes) -> str:
+    """Decode like open(..., encoding='utf-8', errors='ignore') in text mode."""
+    text = data.decode('utf-8', errors='ignore')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+class _FileTable:
+    """Shared path -> FileEntry table, validated against os.stat on access."""
+
+    def __init__(self):
+        self._entries: Dict[str, FileEntry] = {}
+        self._lock = threading.Lock()
+
+    def entry(self, path: str) -> FileEntry:
+        """Return an up-to-date entry for `path` (raises OSError if missing)."""
+        st = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or not entry.matches(st):
+                entry = FileEntry(path=path, size=st.st_size, mtime_ns=st.st_mtime_ns)
+                self._entries[path] = entry
+            return entry
+
+    def read_text(self, path: str) -> str:
+        entry = self.entry(path)
+        sys.audit(READ_EVENT, path, entry.size)
+        if entry.text is not None:
+            return entry.text
+
+        with open(path, 'rb') as f:
+            data = f.read()
+        text = _decode(data)
+
+        with self._lock:
+            entry.digest = hashlib.sha1(data).hexdigest()
+            if entry.size <= MAX_CACHED_FILE_BYTES:
+                entry.text = text
+        return text
+
+    def digest(self, path: str) -> str:
+        entry = self.entry(path)
+        if entry.digest is None:
+            self.read_text(path)
+        return entry.digest
+
+    def line_starts(self, path: str, data) -> array:
+        """Byte offset of every line start in `data` (the mapped file)."""
+        entry = self.entry(path)
+        if entry.line_starts is None:
+            starts = array('Q', [0])
+            pos = data.find(b'\n')
+            while pos != -1:
+                starts.append(pos + 1)
+                pos = data.find(b'\n', pos + 1)
+            if starts[-1] == len(data) and len(starts) > 1:
+                starts.pop()
+            with self._lock:
+                entry.line_starts = starts
+        return entry.line_starts
+
+
+_files = _FileTable()
+
+
+class PluginIndex:
+    """
+    Snapshot of a directory tree rooted at `root`.
+
+    Paths handed to and returned by the query methods are relative to the
+    root, using '/' separators ('' is the root itself).
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._lock = threading.RLock()
+        # rel dir -> (mtime_ns, subdirs, files), names sorted
+        self._dirs: Dict[str, Tuple[int, List[str], List[str]]] = {}
+        self._build()
+
+    def _abs(self, rel: str) -> str:
+        return os.path.join(self.root, *rel.split('/')) if rel else self.root
+
+    def _build(self):
+        dirs = {}
+        for current, subdirs, files in os.walk(self.root):
+            rel = os.path.relpath(current, self.root).replace(os.sep, '/')
+            rel = '' if rel == '.' else rel
+            subdirs.sort()
+            dirs[rel] = (os.stat(current).st_mtime_ns, list(subdirs), sorted(files))
+        self._dirs = dirs
+
+    def _is_stale(self) -> bool:
+        for rel, (mtime_ns, _, _) in self._dirs.items():
+            try:
+                if os.stat(self._abs(rel)).st_mtime_ns != mtime_ns:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def refresh(self):
+        """Rebuild the tree snapshot if any directory changed on disk."""
+        with self._lock:
+            if self._is_stale():
+                self._build()
+
+    def has_dir(self, rel: str) -> bool:
+        self.refresh()
+        return rel in self._dirs
+
+    def _walk(self, rel: str):
+        """Yield (rel_dir, subdirs, files) top-down, like os.walk."""
+        stack = [rel]
+        while stack:
+            current = stack.pop()
+            _, subdirs, files = self._dirs[current]
+            yield current, subdirs, files
+            prefix = f"{current}/" if current else ''
+            stack.extend(f"{prefix}{d}" for d in reversed(subdirs) if f"{prefix}{d}" in self._dirs)
+
+    def find(self, pattern: str, rel: str = '') -> List[str]:
+        """
+        Paths under `rel` matching a glob pattern, relative to `rel`.
+
+        Mirrors Path(dir).rglob(pattern): directories and files match, and a
+        pattern containing '/' is anchored on its rightmost components.
+        """
+        self.refresh()
+        while pattern.startswith('**/'):
+            pattern = pattern[3:]
+
+        matches = []
+        base = len(rel) + 1 if rel else 0
+        with self._lock:
+            for current, subdirs, files in self._walk(rel):
+                prefix = f"{current}/" if current else ''
+                for name in subdirs + files:
+                    candidate = (prefix + name)[base:]
+                    if PurePosixPath(candidate).match(pattern):
+                        matches.append(candidate)
+        return sorted(matches)
+
+    def files(self, rel: str = '', skip_dirs=()) -> List[str]:
+        """Paths of all files under `rel`, skipping directories named in `skip_dirs`."""
+        self.refresh()
+        paths = []
+        with self._lock:
+            for current, _, files in self._walk(rel):
+                if skip_dirs and not set(skip_dirs).isdisjoint(current.split('/')):
+                    continue
+                prefix = f"{current}/" if current else ''
+                paths.extend(prefix + name for name in files)
+        return paths
+
+    def tree(self, rel: str = '') -> List[str]:
+        """Indented recursive listing of `rel`, one entry per line."""
+        self.refresh()
+        lines = []
+        depth = rel.count('/') + 1 if rel else 0
+        with self._lock:
+            for current, _, files in self._walk(rel):
+                level = (current.count('/') + 1 if current else 0) - depth
+                name = os.path.basename(self._abs(current))
+                lines.append(f"{'  ' * level}{name}/")
+                lines.extend(f"{'  ' * (level + 1)}{file}" for file in files)
+        return lines
+
+    def listing(self, rel: str = '') -> List[str]:
+        """Non-recursive listing of `rel` with file sizes."""
+        self.refresh()
+        with self._lock:
+            _, subdirs, files = self._dirs[rel]
+        prefix = f"{rel}/" if rel else ''
+        items = [(d, None) for d in subdirs] + [(f, prefix + f) for f in files]
+
+        lines = []
+        for name, file_rel in sorted(items):
+            if file_rel is None:
+                lines.append(f"{name}/")
+            else:
+                lines.append(f"{name} ({_files.entry(self._abs(file_rel)).size} bytes)")
+        return lines
+
+
+_indexes: Dict[str, PluginIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def _normalize(path: str) -> str:
+    if not os.path.isabs(path):
+        path = os.path.join(os.getcwd(), path)
+    return os.path.normpath(path)
+
+
+def find_plugin_index(path: str) -> Optional[Tuple[PluginIndex, str]]:
+    """
+    Return (index, rel) for an existing index containing `path`, or None.
+
+    The innermost indexed ancestor wins, so listing a subfolder of an
+    indexed plugin never walks the disk again.
+    """
+    path = _normalize(path)
+    with _indexes_lock:
+        candidates = [root for root in _indexes if path == root or path.startswith(root + os.sep)]
+        if not candidates:
+            return None
+        root = max(candidates, key=len)
+        index = _indexes[root]
+    rel = os.path.relpath(path, root).replace(os.sep, '/')
+    return index, '' if rel == '.' else rel
+
+
+def get_plugin_index(directory: str) -> Tuple[PluginIndex, str]:
+    """Return (index, rel) covering `directory`, indexing it on first use."""
+    found = find_plugin_index(directory)
+    if found is not None and found[0].has_dir(found[1]):
+        return found
+
+    root = _normalize(directory)
+    index = PluginIndex(root)
+    with _indexes_lock:
+        _indexes[root] = _indexes.get(root, index)
+        return _indexes[root], ''
+
+
+def read_text(path: str) -> str:
+    """Read a file as text through the shared mtime-validated cache."""
+    return _files.read_text(_normalize(path))
+
+
+def file_digest(path: str) -> str:
+    """SHA-1 of a file's content through the shared cache."""
+    return _files.digest(_normalize(path))
+
+
+def file_version(path: str) -> Tuple[int, int]:
+    """(size, mtime_ns) of a file, for callers caching data derived from it."""
+    entry = _files.entry(_normalize(path))
+    return entry.size, entry.mtime_ns
+
+
+def _char_boundary(data, pos: int, floor: int = 0) -> int:
+    """Move `pos` back (not below `floor`) so it does not split a UTF-8 sequence."""
+    limit = pos
+    while floor < pos < len(data) and data[pos] & 0xC0 == 0x80:
+        pos -= 1
+    return pos if pos > floor else limit
+
+
+def read_lines(path: str, start_line: int = 1, max_lines: Optional[int] = None,
+               max_bytes: Optional[int] = None) -> FileChunk:
+    """
+    Read whole lines starting at `start_line` (1-based) via mmap.
+
+    Stops after `max_lines` lines or before exceeding `max_bytes`, but always
+    returns at least one line (cut to `max_bytes` if that line alone is
+    longer, e.g. a minified bundle, and `cut_at` set). `start`/`end` are
+    1-based line numbers, `end` exclusive.
+    """
+    path = _normalize(path)
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return FileChunk('', 1, 1, 0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            starts = _files.line_starts(path, data)
+            total = len(starts)
+            first = min(max(start_line, 1), total + 1)
+            last = total + 1 if max_lines is None else min(first + max_lines, total + 1)
+            if first > total:
+                return FileChunk('', first, first, total)
+
+            def line_end(line: int) -> int:
+                return starts[line] if line < total else len(data)
+
+            begin = starts[first - 1]
+            if max_bytes is not None:
+                end_line = first + 1
+                while end_line < last and line_end(end_line) - begin <= max_bytes:
+                    end_line += 1
+                last = end_line
+
+            stop = line_end(last - 1)
+            cut_at = None
+            if max_bytes is not None and stop - begin > max_bytes:
+                stop = cut_at = _char_boundary(data, begin + max_bytes, floor=begin)
+            sys.audit(READ_EVENT, path, stop - begin)
+            return FileChunk(_decode(data[begin:stop]), first, last, total, cut_at=cut_at)
+
+
+def read_bytes(path: str, offset: int = 0, max_bytes: int = 16000) -> FileChunk:
+    """
+    Read up to `max_bytes` starting at byte `offset` via mmap.
+
+    The chunk never splits a UTF-8 character; `end` is the offset to
+    continue from.
+    """
+    path = _normalize(path)
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0 or offset >= size:
+            return FileChunk('', min(offset, size), min(offset, size), size)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            start = _char_boundary(data, max(offset, 0))
+            stop = min(start + max_bytes, size)
+            if stop < size:
+                stop = _char_boundary(data, stop, floor=start)
+            sys.audit(READ_EVENT, path, stop - start)
+            return FileChunk(_decode(data[start:stop]), start, stop, size)
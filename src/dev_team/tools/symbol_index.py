@@ -0,0 +1,155 @@
+"""
+Inverted index of WordPress/PHP/JS symbols in a plugin tree.
+
+Finding every hook, AJAX action or shortcode used to take the analyst one
+read_file per file. A SymbolIndex scans each PHP/JS file of a PluginIndex
+once with a fixed set of patterns and keeps (kind, name) -> locations, so a
+search_symbols call answers "all wp_ajax_* actions" in one round-trip.
+
+Files are re-scanned only when their size or mtime changes; files added or
+removed are picked up through the PluginIndex directory snapshot.
+"""
+import bisect
+import fnmatch
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dev_team.tools.plugin_index import PluginIndex, file_version, get_plugin_index, read_text
+
+SOURCE_EXTENSIONS = ('.php', '.inc', '.js', '.jsx', '.mjs', '.ts', '.tsx')
+# Third-party and build output: large, and not the plugin's own symbols
+SKIP_DIRS = {'node_modules', 'vendor', '.git'}
+
+_STRING = r"""\s*\(\s*['"]([^'"]+)['"]"""
+
+# (kind, pattern): group 1 is the symbol name
+PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ('action', re.compile(r'\badd_action' + _STRING)),
+    ('filter', re.compile(r'\badd_filter' + _STRING)),
+    ('hook_fired', re.compile(r'\b(?:do_action|do_action_ref_array|apply_filters)' + _STRING)),
+    ('shortcode', re.compile(r'\badd_shortcode' + _STRING)),
+    ('post_type', re.compile(r'\bregister_post_type' + _STRING)),
+    ('taxonomy', re.compile(r'\bregister_taxonomy' + _STRING)),
+    ('rest_route', re.compile(r"""\bregister_rest_route\s*\(\s*(['"][^'"]+['"]\s*,\s*['"][^'"]+)['"]""")),
+    # Hook is the 3rd argument of wp_schedule_event, the 2nd of wp_schedule_single_event
+    ('cron', re.compile(r"""\bwp_schedule_(?:event\s*\([^,;]+,[^,;]+|single_event\s*\([^,;]+),\s*['"]([\w-]+)['"]""")),
+    ('option', re.compile(r'\b(?:get|update|add|delete)_option' + _STRING)),
+    ('class', re.compile(r'^\s*(?:(?:abstract|final|export|default)\s+)*(?:class|interface|trait)\s+(\w+)', re.M)),
+    ('function', re.compile(r'\bfunction\s+&?\s*(\w+)\s*\(')),
+    ('ajax_call', re.compile(r"""\baction\s*[:=]\s*['"]([\w-]+)['"]""")),
+]
+
+KINDS = tuple(kind for kind, _ in PATTERNS) + ('ajax',)
+
+
+@dataclass(frozen=True)
+class Symbol:
+    kind: str
+    name: str
+    path: str
+    line: int
+
+
+def scan_source(text: str, path: str) -> List[Symbol]:
+    """Extract symbols from one source file."""
+    line_starts = [0]
+    pos = text.find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = text.find('\n', pos + 1)
+
+    symbols = []
+    for kind, pattern in PATTERNS:
+        if kind == 'ajax_call' and not path.endswith(('.js', '.jsx', '.mjs', '.ts', '.tsx')):
+            continue
+        for match in pattern.finditer(text):
+            name = match.group(1)
+            if kind == 'rest_route':
+                name = '/'.join(part.strip(" '\"/") for part in re.split(r"""['"]\s*,""", name))
+            line = bisect.bisect_right(line_starts, match.start(1))
+            # wp_ajax_* / wp_ajax_nopriv_* actions are AJAX endpoints
+            symbol_kind = 'ajax' if kind == 'action' and name.startswith('wp_ajax_') else kind
+            symbols.append(Symbol(symbol_kind, name, path, line))
+    return symbols
+
+
+class SymbolIndex:
+    """Symbols of every source file under a PluginIndex root."""
+
+    def __init__(self, plugin_index: PluginIndex):
+        self.plugin_index = plugin_index
+        self._lock = threading.Lock()
+        # rel path -> ((size, mtime_ns), symbols)
+        self._scanned: Dict[str, Tuple[Tuple[int, int], List[Symbol]]] = {}
+        self._by_kind: Dict[str, Dict[str, List[Symbol]]] = {}
+
+    def refresh(self):
+        """Re-scan new or modified files and rebuild the inverted index if needed."""
+        with self._lock:
+            changed = False
+            current = set()
+            for rel in self.plugin_index.files(skip_dirs=SKIP_DIRS):
+                if not rel.endswith(SOURCE_EXTENSIONS) or rel.endswith('.min.js'):
+                    continue
+                current.add(rel)
+                path = os.path.join(self.plugin_index.root, *rel.split('/'))
+                try:
+                    version = file_version(path)
+                except OSError:
+                    continue
+                scanned = self._scanned.get(rel)
+                if scanned is None or scanned[0] != version:
+                    self._scanned[rel] = (version, scan_source(read_text(path), rel))
+                    changed = True
+
+            for rel in set(self._scanned) - current:
+                del self._scanned[rel]
+                changed = True
+
+            if changed or not self._by_kind:
+                by_kind: Dict[str, Dict[str, List[Symbol]]] = {}
+                for _, symbols in self._scanned.values():
+                    for symbol in symbols:
+                        by_kind.setdefault(symbol.kind, {}).setdefault(symbol.name, []).append(symbol)
+                self._by_kind = by_kind
+
+    def search(self, query: str = '', kind: Optional[str] = None, rel: str = '') -> List[Symbol]:
+        """
+        Symbols whose name matches `query`, sorted by kind, name and location.
+
+        `query` is a case-insensitive glob ('wp_ajax_*') or substring; empty
+        matches everything. `kind` restricts to one symbol kind, `rel` to a
+        subfolder of the plugin.
+        """
+        self.refresh()
+        query = query.strip().lower()
+        if query and not any(c in query for c in '*?['):
+            query = f"*{query}*"
+
+        prefix = f"{rel}/" if rel else ''
+        results = []
+        for symbol_kind, names in self._by_kind.items():
+            if kind and symbol_kind != kind:
+                continue
+            for name, symbols in names.items():
+                if query and not fnmatch.fnmatchcase(name.lower(), query):
+                    continue
+                results.extend(s for s in symbols if s.path.startswith(prefix))
+        return sorted(results, key=lambda s: (s.kind, s.name, s.path, s.line))
+
+
+_symbol_indexes: Dict[str, SymbolIndex] = {}
+_symbol_indexes_lock = threading.Lock()
+
+
+def get_symbol_index(directory: str) -> Tuple[SymbolIndex, str]:
+    """Return (symbol index, rel) covering `directory`, building it on first use."""
+    plugin_index, rel = get_plugin_index(directory)
+    with _symbol_indexes_lock:
+        index = _symbol_indexes.get(plugin_index.root)
+        if index is None or index.plugin_index is not plugin_index:
+            index = _symbol_indexes[plugin_index.root] = SymbolIndex(plugin_index)
+    return index, rel
@@ -0,0 +1,375 @@
+"""
+Run trace: one JSONL record per crew kickoff, task, tool call and LLM call
+
+run_full_analysis.py only reported the total elapsed time, so there was no
+way to tell which task, tool or LLM round trip dominated a 30-minute run.
+start_trace() opens outputs/traces/<name>-<timestamp>.jsonl; from then on:
+
+- crew kickoffs and tasks are recorded from crewai's event bus
+- the custom tools (@traced_tool) record every _run call, with argument
+  and result sizes; tool results served from crewai's cache are recorded
+  from the event bus with cache_hit
+- TracedLLM / CachedLLM (llm_cache.py) record every LLM call with prompt
+  and response sizes, token counts, response-cache hits and the time Ollama
+  spent loading the model for it (load_seconds)
+- the model warm-up before a crew (warmup.py) records a 'load' per model
+
+Every record has kind, name, start/end (epoch seconds), duration and the
+task and agent it ran under. Without start_trace() nothing is recorded.
+
+`trace_summary [trace.jsonl]` prints the top time sinks per task of a trace
+(the latest one by default).
+
+Configuration (environment):
+- DEV_TEAM_TRACE=0            Disable tracing
+- DEV_TEAM_TRACE_DIR=path     Trace location (default: outputs/traces)
+"""
+import argparse
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+DEFAULT_TRACE_DIR = 'outputs/traces'
+
+_tracer: Optional['Tracer'] = None
+_tracer_lock = threading.Lock()
+# Task and agent currently executing in this thread (set from task events)
+_context = threading.local()
+
+
+def payload_size(value: Any) -> int:
+    """Size in bytes of a tool/LLM payload as it would be sent."""
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json.dumps(value, default=str)
+    return len(value.encode('utf-8'))
+
+
+class Tracer:
+    """Appends trace records to a JSONL file, one flushed line per record."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, start: float, end: float, **attrs):
+        entry = {
+            'kind': kind,
+            'name': name,
+            'start': round(start, 6),
+            'end': round(end, 6),
+            'duration': round(end - start, 6),
+            'task': getattr(_context, 'task', None),
+            'agent': getattr(_context, 'agent', None),
+            'thread': threading.current_thread().name,
+        }
+        entry.update((key, value) for key, value in attrs.items() if value is not None)
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def trace_enabled() -> bool:
+    return os.environ.get('DEV_TEAM_TRACE', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def get_tracer() -> Optional[Tracer]:
+    """The trace of this process, or None if start_trace() was not called."""
+    return _tracer
+
+
+def start_trace(name: str = 'run') -> Optional[Path]:
+    """
+    Start recording this process to a new trace file.
+
+    Safe to call more than once: later calls return the trace already
+    open. Returns None when tracing is disabled.
+    """
+    global _tracer
+    if not trace_enabled():
+        return None
+    with _tracer_lock:
+        if _tracer is None:
+            directory = Path(os.environ.get('DEV_TEAM_TRACE_DIR', DEFAULT_TRACE_DIR))
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+            _tracer = Tracer(directory / f"{name}-{stamp}-{os.getpid()}.jsonl")
+            atexit.register(_tracer.close)
+            _install_event_handlers()
+    return _tracer.path
+
+
+def record(kind: str, name: str, start: float, end: float, **attrs):
+    """Record a finished span, if a trace is running."""
+    if _tracer is not None:
+        _tracer.record(kind, name, start, end, **attrs)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs) -> Iterator[Dict[str, Any]]:
+    """
+    Time the block as one trace record.
+
+    Yields the record's attributes, so the block can add to them (result
+    sizes, token counts). An exception is recorded as `error` and re-raised.
+    """
+    if _tracer is None:
+        yield attrs
+        return
+    start = time.time()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        record(kind, name, start, time.time(), **attrs)
+
+
+def record_warmup(results):
+    """Record model warm-ups (warmup.ModelWarmup) as 'load' spans."""
+    for r in results:
+        record('load', r.model, r.started, r.started + r.seconds,
+               load_seconds=round(r.load_seconds, 3), evicted=r.evicted or None, error=r.error)
+
+
+def traced_tool(tool_class):
+    """
+    Record every _run call of a BaseTool subclass.
+
+    Tools report failures as "Error: ..." strings rather than exceptions;
+    those are recorded with error set too.
+    """
+    run = tool_class._run
+
+    @functools.wraps(run)
+    def _run(self, *args, **kwargs):
+        with span('tool', self.name, args_bytes=payload_size(kwargs or list(args))) as attrs:
+            result = run(self, *args, **kwargs)
+            attrs['result_bytes'] = payload_size(result)
+            if isinstance(result, str) and result.startswith('Error'):
+                attrs['error'] = result.splitlines()[0][:200]
+            return result
+
+    tool_class._run = _run
+    return tool_class
+
+
+class UsageRecorder:
+    """
+    Receives token usage from crewai's LLM callbacks for the current span.
+
+    crewai hands each callback's log_success_event the litellm usage of the
+    completion, synchronously in the calling thread. A single instance is
+    shared by all calls (litellm keeps every callback it is given), and it
+    writes into the span registered for the thread.
+    """
+
+    def __init__(self):
+        self._spans = threading.local()
+
+    @contextmanager
+    def collect(self, attrs: Dict[str, Any]):
+        self._spans.attrs = attrs
+        try:
+            yield
+        finally:
+            self._spans.attrs = None
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        attrs = getattr(self._spans, 'attrs', None)
+        usage = (response_obj or {}).get('usage')
+        if attrs is None or usage is None:
+            return
+        for key in ('prompt_tokens', 'completion_tokens'):
+            value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+            if value is not None:
+                attrs[key] = value
+
+    def note(self, key: str, value: Any):
+        """Add `key` to the span of the call running in this thread, if any."""
+        attrs = getattr(self._spans, 'attrs', None)
+        if attrs is not None:
+            attrs[key] = attrs.get(key, 0) + value
+
+
+usage_recorder = UsageRecorder()
+
+
+def _install_event_handlers():
+    """Record crew kickoffs, tasks and cached tool results from crewai's event bus."""
+    from crewai.events import crewai_event_bus
+    from crewai.events.types.crew_events import (
+        CrewKickoffCompletedEvent, CrewKickoffFailedEvent, CrewKickoffStartedEvent,
+    )
+    from crewai.events.types.task_events import TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent
+    from crewai.events.types.tool_usage_events import ToolUsageFinishedEvent
+
+    def on_crew_started(source, event):
+        _context.crew_start = time.time()
+
+    def on_crew_finished(source, event):
+        start = getattr(_context, 'crew_start', None)
+        if start is not None:
+            _context.crew_start = None
+            record('crew', event.crew_name or 'crew', start, time.time(),
+                   error=getattr(event, 'error', None))
+
+    def on_task_started(source, event):
+        task = event.task
+        agent = getattr(task, 'agent', None)
+        _context.task = getattr(task, 'name', None) or (task.description or '')[:60]
+        _context.agent = (getattr(agent, 'role', None) or '').strip() or None
+        _context.task_start = time.time()
+
+    def on_task_finished(source, event):
+        start = getattr(_context, 'task_start', None)
+        if start is None:
+            return
+        output = getattr(event, 'output', None)
+        record('task', _context.task, start, time.time(),
+               output_bytes=payload_size(getattr(output, 'raw', None)) if output is not None else None,
+               error=getattr(event, 'error', None))
+        _context.task = _context.agent = _context.task_start = None
+
+    def on_tool_finished(source, event):
+        if event.from_cache:
+            record('tool', event.tool_name, event.started_at.timestamp(), event.finished_at.timestamp(),
+                   args_bytes=payload_size(event.tool_args), result_bytes=payload_size(event.output),
+                   cache_hit=True)
+
+    crewai_event_bus.register_handler(CrewKickoffStartedEvent, on_crew_started)
+    crewai_event_bus.register_handler(CrewKickoffCompletedEvent, on_crew_finished)
+    crewai_event_bus.register_handler(CrewKickoffFailedEvent, on_crew_finished)
+    crewai_event_bus.register_handler(TaskStartedEvent, on_task_started)
+    crewai_event_bus.register_handler(TaskCompletedEvent, on_task_finished)
+    crewai_event_bus.register_handler(TaskFailedEvent, on_task_finished)
+    crewai_event_bus.register_handler(ToolUsageFinishedEvent, on_tool_finished)
+
+
+def load_trace(path) -> List[Dict[str, Any]]:
+    """Records of a trace file; a partly written last line is skipped."""
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def latest_trace(directory=None) -> Optional[Path]:
+    directory = Path(directory or os.environ.get('DEV_TEAM_TRACE_DIR', DEFAULT_TRACE_DIR))
+    traces = sorted(directory.glob('*.jsonl'), key=lambda p: p.stat().st_mtime)
+    return traces[-1] if traces else None
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 60:
+        return f"{int(seconds // 60)}m {int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+
+def summarize(records: List[Dict[str, Any]], top: int = 5) -> str:
+    """
+    Top time sinks per task: tool and LLM calls grouped by name, with their
+    share of the task's time, token totals, time queued for the endpoint's
+    limiter (rate_limit.py), time the server spent loading the model and
+    cache hits. Model warm-ups are listed as 'load' outside tasks.
+    """
+    lines = []
+    crews = [r for r in records if r['kind'] == 'crew']
+    if crews:
+        lines.append(f"Crew kickoffs: {len(crews)}, {_format_seconds(sum(r['duration'] for r in crews))}")
+
+    tasks: Dict[str, Dict[str, Any]] = {}
+    for r in records:
+        if r['kind'] == 'crew':
+            continue
+        task = tasks.setdefault(r.get('task') or '(outside tasks)',
+                                {'agent': r.get('agent'), 'runs': 0, 'duration': 0.0, 'sinks': {}})
+        if r['kind'] == 'task':
+            task['runs'] += 1
+            task['duration'] += r['duration']
+            continue
+        sink = task['sinks'].setdefault((r['kind'], r['name']), {
+            'calls': 0, 'duration': 0.0, 'prompt_tokens': 0, 'completion_tokens': 0,
+            'cache_hits': 0, 'errors': 0, 'bytes': 0, 'queued': 0.0, 'loading': 0.0,
+        })
+        sink['calls'] += 1
+        sink['duration'] += r['duration']
+        sink['prompt_tokens'] += r.get('prompt_tokens', 0)
+        sink['completion_tokens'] += r.get('completion_tokens', 0)
+        sink['cache_hits'] += 1 if r.get('cache_hit') else 0
+        sink['errors'] += 1 if r.get('error') else 0
+        sink['bytes'] += r.get('result_bytes', 0) + r.get('response_bytes', 0)
+        sink['queued'] += r.get('queued', 0.0)
+        sink['loading'] += r.get('load_seconds', 0.0) if r['kind'] == 'llm' else 0.0
+
+    for name, task in sorted(tasks.items(), key=lambda item: -item[1]['duration']):
+        sinks = task['sinks']
+        total = task['duration'] or sum(s['duration'] for s in sinks.values())
+        runs = f", {task['runs']} runs" if task['runs'] > 1 else ''
+        agent = f" ({task['agent']})" if task['agent'] else ''
+        lines.append(f"\n{name}{agent}: {_format_seconds(total)}{runs}")
+
+        ranked = sorted(sinks.items(), key=lambda item: -item[1]['duration'])
+        for (kind, sink_name), sink in ranked[:top]:
+            share = f"{sink['duration'] / total:4.0%}" if total else '   -'
+            details = []
+            if sink['prompt_tokens'] or sink['completion_tokens']:
+                details.append(f"{sink['prompt_tokens']:,} tokens in / {sink['completion_tokens']:,} out")
+            elif sink['bytes']:
+                details.append(f"{sink['bytes']:,} bytes returned")
+            if sink['queued'] >= 0.1:
+                details.append(f"{_format_seconds(sink['queued'])} queued for a slot")
+            if sink['loading'] >= 0.1:
+                details.append(f"{_format_seconds(sink['loading'])} loading the model")
+            if sink['cache_hits']:
+                details.append(f"{sink['cache_hits']} cached")
+            if sink['errors']:
+                details.append(f"{sink['errors']} errors")
+            lines.append(f"  {share}  {_format_seconds(sink['duration']):>8}  {kind:<4} {sink_name}"
+                         f"  ×{sink['calls']}{'  — ' + ', '.join(details) if details else ''}")
+        if len(ranked) > top:
+            rest = sum(sink['duration'] for _, sink in ranked[top:])
+            lines.append(f"        {_format_seconds(rest):>8}  {len(ranked) - top} more")
+        if task['duration']:
+            other = task['duration'] - sum(sink['duration'] for sink in sinks.values())
+            lines.append(f"        {_format_seconds(max(other, 0.0)):>8}  outside tool and LLM calls")
+
+    return "\n".join(lines)
+
+
+def summary():
+    """Console script: print the top time sinks per task of a trace."""
+    parser = argparse.ArgumentParser(description='Summarize a run trace (outputs/traces/*.jsonl)')
+    parser.add_argument('trace', nargs='?', help='Trace file (default: the latest in outputs/traces)')
+    parser.add_argument('--top', type=int, default=5, help='Time sinks listed per task (default: 5)')
+    args = parser.parse_args()
+
+    path = Path(args.trace) if args.trace else latest_trace()
+    if path is None or not path.exists():
+        print(f"\n⚠️  ERROR: Trace not found: {path or 'no traces in ' + os.environ.get('DEV_TEAM_TRACE_DIR', DEFAULT_TRACE_DIR)}\n")
+        return 1
+
+    print(f"\nTrace: {path}\n")
+    print(summarize(load_trace(path), top=args.top))
+    print()
+    return 0
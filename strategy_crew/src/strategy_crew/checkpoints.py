@@ -0,0 +1,197 @@
+"""
+Per-task checkpoints for resumable crew runs
+
+A crew failing late (e.g. in create_roadmap) used to rerun from its first
+task, redoing long LLM tasks whose outputs were already on disk.
+kickoff_with_checkpoints records every completed task in
+outputs/.checkpoints/<crew>.json: a fingerprint of its inputs and its output.
+
+A task's fingerprint covers the crew inputs, the task definition (description,
+expected output, agent, output file, context budget), the content of the files it reads
+(`input_files` in tasks.yaml) and the fingerprint and output of the task
+before it. With resume=True, the leading tasks whose fingerprint still
+matches and whose output file is present are skipped, their saved output
+restored as context, and the crew runs from the first stale task.
+"""
+import glob
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+
+CHECKPOINT_DIR = Path("outputs/.checkpoints")
+SKIP_DIRS = {'node_modules', 'vendor'}
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _iter_files(path: str):
+    """Files under `path` (a file, directory or glob) in a stable order."""
+    matches = sorted(glob.glob(path, recursive=True)) if glob.has_magic(path) else [path]
+    for match in matches:
+        if os.path.isdir(match):
+            for root, dirs, files in os.walk(match):
+                dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d not in SKIP_DIRS)
+                for name in sorted(files):
+                    yield os.path.join(root, name)
+        elif os.path.isfile(match):
+            yield match
+
+
+def files_digest(paths: Iterable[str]) -> str:
+    """
+    Content hash of files, directories (recursively) or globs.
+
+    Hidden directories, node_modules/ and vendor/ are skipped. A missing path
+    hashes differently from an empty one, so creating it marks readers stale.
+    """
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(f"path:{path}\0".encode('utf-8'))
+        if not glob.has_magic(path) and not os.path.exists(path):
+            h.update(b"missing\0")
+            continue
+        for file_path in _iter_files(path):
+            h.update(f"{os.path.relpath(file_path, path) if os.path.isdir(path) else file_path}\0".encode('utf-8'))
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1024 * 1024), b''):
+                    h.update(block)
+            h.update(b"\0")
+    return h.hexdigest()
+
+
+def task_input_files(tasks_config: Dict[str, Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Task name -> `input_files` declared in a crew's tasks.yaml."""
+    return {name: list(config['input_files']) for name, config in tasks_config.items()
+            if config.get('input_files')}
+
+
+def task_definition_digest(task: Task) -> str:
+    """Hash of what the task is asked to do (before input interpolation)."""
+    definition = {
+        'name': task.name,
+        'description': task.description,
+        'expected_output': task.expected_output,
+        'agent': task.agent.role if task.agent else None,
+        'output_file': task.output_file,
+    }
+    if getattr(task, 'context_budget', None):  # Digested context (context_digest.py)
+        definition['context_budget'] = task.context_budget
+    return _digest(json.dumps(definition, sort_keys=True))
+
+
+class CheckpointStore:
+    """Task name -> checkpoint record, persisted as one JSON file per crew."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self.records: Dict[str, Dict[str, Any]] = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+
+    def get(self, task_name: str) -> Optional[Dict[str, Any]]:
+        return self.records.get(task_name)
+
+    def save(self, task_name: str, record: Dict[str, Any]):
+        self.records[task_name] = record
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.records, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def _output_present(record: Dict[str, Any]) -> bool:
+    return not record.get('output_file') or Path(record['output_file']).exists()
+
+
+def _recorder(store: CheckpointStore, task: Task, definition: str, state: Dict[str, str], callback=None):
+    """Task callback saving the checkpoint of a task that just completed."""
+    def record(output: TaskOutput):
+        fingerprint = _digest(state['fingerprint'] + definition)
+        store.save(task.name, {
+            'fingerprint': fingerprint,
+            'agent': output.agent,
+            'raw': output.raw,
+            'output_file': task.output_file,
+            'completed_at': datetime.now().isoformat(timespec='seconds'),
+        })
+        state['fingerprint'] = _digest(fingerprint + _digest(output.raw))
+        if callback:
+            callback(output)
+    return record
+
+
+def kickoff_with_checkpoints(crew: Crew, inputs: Dict[str, Any], name: str, resume: bool = False,
+                             input_files: Optional[Dict[str, List[str]]] = None) -> CrewOutput:
+    """
+    Kick off a sequential crew, checkpointing each task as it completes.
+
+    Args:
+        crew: Crew as returned by a @CrewBase class's crew() method
+        inputs: Crew inputs, passed through to kickoff
+        name: Checkpoint file name (outputs/.checkpoints/<name>.json)
+        resume: Skip leading tasks whose checkpoint is still valid
+        input_files: Task name -> files the task reads ({placeholders} are
+            filled from `inputs`), see task_input_files()
+    """
+    store = CheckpointStore(CHECKPOINT_DIR / f"{name}.json")
+    tasks: List[Task] = list(crew.tasks)
+    input_files = input_files or {}
+    definitions = []
+    for task in tasks:
+        definition = task_definition_digest(task)
+        if task.name in input_files:
+            paths = [path.format_map(inputs) for path in input_files[task.name]]
+            definition = _digest(definition + files_digest(paths))
+        definitions.append(definition)
+    fingerprint = _digest(json.dumps(inputs, sort_keys=True, default=str))
+
+    skipped: List[Task] = []
+    if resume:
+        for task, definition in zip(tasks, definitions):
+            expected = _digest(fingerprint + definition)
+            record = store.get(task.name)
+            if not record or record['fingerprint'] != expected or not _output_present(record):
+                break
+            task.output = TaskOutput(
+                description=task.description,
+                name=task.name,
+                expected_output=task.expected_output,
+                raw=record['raw'],
+                agent=record['agent'],
+            )
+            skipped.append(task)
+            fingerprint = _digest(expected + _digest(record['raw']))
+
+    if skipped:
+        print(f"\n⏭️  Resuming {name}: {len(skipped)}/{len(tasks)} tasks up to date")
+        for task in skipped:
+            print(f"   ✓ {task.name} (completed {store.get(task.name)['completed_at']})")
+
+    remaining = tasks[len(skipped):]
+    if not remaining:
+        print(f"   Nothing to run - all {name} tasks are up to date.\n")
+        return CrewOutput(raw=skipped[-1].output.raw, tasks_output=[task.output for task in skipped])
+
+    state = {'fingerprint': fingerprint}
+    for index, task in enumerate(remaining, start=len(skipped)):
+        # Without explicit context a task sees every earlier output of the
+        # run; point it at all earlier tasks so skipped outputs still count.
+        if skipped and task.context is NOT_SPECIFIED:
+            task.context = tasks[:index]
+        task.callback = _recorder(store, task, definitions[index], state, task.callback)
+
+    crew.tasks = remaining
+    return crew.kickoff(inputs=inputs)
@@ -1,5 +1,7 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+from strategy_crew.context_digest import DigestContextTask
+from strategy_crew.llm import build_llm
 from strategy_crew.tools.custom_tool import FileReaderTool, DirectoryListTool, FindFilesTool
 
 
@@ -23,6 +25,7 @@ class StrategyCrew:
     def market_researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['market_researcher'],
+            llm=build_llm(self.agents_config['market_researcher']),
             verbose=True
         )
 
@@ -30,6 +33,7 @@ class StrategyCrew:
     def competitor_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['competitor_analyst'],
+            llm=build_llm(self.agents_config['competitor_analyst']),
             tools=[
                 DirectoryListTool(),
                 FileReaderTool(),
@@ -42,25 +46,26 @@ class StrategyCrew:
     def product_manager(self) -> Agent:
         return Agent(
             config=self.agents_config['product_manager'],
+            llm=build_llm(self.agents_config['product_manager']),
             verbose=True
         )
 
     @task
     def analyze_competitor(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['analyze_competitor']
         )
 
     @task
     def research_market(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['research_market'],
             context=[self.analyze_competitor()]  # Uses competitor analysis as context
         )
 
     @task
     def create_roadmap(self) -> Task:
-        return Task(
+        return DigestContextTask(
             config=self.tasks_config['create_roadmap'],
             context=[self.analyze_competitor(), self.research_market()]  # Uses both as context
         )
@@ -0,0 +1,82 @@
+"""
+Agent LLMs
+
+crewai builds an agent's LLM from the `llm` string in agents.yaml, and that
+LLM calls the model directly. build_llm builds a LimitedLLM instead, which
+holds a slot of its endpoint's adaptive limiter while calling the model and
+reports the call's token counts to it (see rate_limit.py). It also honours
+the agent's `temperature` key, which crewai's string-to-LLM mapping ignores.
+
+All LLMs for the same endpoint share one pooled HTTP client, and LimitedLLM
+registers the model's metadata before the first call (see llm_clients.py).
+"""
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict
+
+from crewai import LLM
+
+from strategy_crew.llm_clients import client_params, prepare_model
+from strategy_crew.rate_limit import get_limiter
+
+
+class UsageRecorder:
+    """
+    Receives token usage from crewai's LLM callbacks for the current call.
+
+    crewai hands each callback's log_success_event the litellm usage of the
+    completion, synchronously in the calling thread. A single instance is
+    shared by all calls (litellm keeps every callback it is given), and it
+    writes into the stats registered for the thread.
+    """
+
+    def __init__(self):
+        self._calls = threading.local()
+
+    @contextmanager
+    def collect(self, stats: Dict[str, Any]):
+        self._calls.stats = stats
+        try:
+            yield
+        finally:
+            self._calls.stats = None
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        stats = getattr(self._calls, 'stats', None)
+        usage = (response_obj or {}).get('usage')
+        if stats is None or usage is None:
+            return
+        for key in ('prompt_tokens', 'completion_tokens'):
+            value = usage.get(key) if isinstance(usage, dict) else getattr(usage, key, None)
+            if value is not None:
+                stats[key] = value
+
+
+usage_recorder = UsageRecorder()
+
+
+class LimitedLLM(LLM):
+    """LLM that holds a slot of its endpoint's limiter while calling the model."""
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None) -> Any:
+        prepare_model(self.model, self.base_url or self.api_base)
+        limiter = get_limiter(self.model, self.base_url or self.api_base)
+        with limiter.slot() if limiter else nullcontext({}) as slot, usage_recorder.collect(slot):
+            return super().call(messages, tools, [*(callbacks or []), usage_recorder],
+                                available_functions, from_task, from_agent)
+
+
+def build_llm(agent_config: dict) -> LLM:
+    """
+    Create the LLM for an agent config entry from agents.yaml, routed
+    through the shared client for its endpoint.
+    """
+    llm = agent_config['llm']
+    if isinstance(llm, LLM):
+        return llm
+
+    params = client_params(llm)
+    if agent_config.get('temperature') is not None:
+        params['temperature'] = agent_config['temperature']
+    return LimitedLLM(model=llm, **params)
@@ -0,0 +1,119 @@
+"""
+Shared LLM clients
+
+A copy of dev_team's llm_clients.py, minus the load-time trace. Every
+agent's LLM is cheap to build, but what it talks to the server through was
+not shared well:
+
+- litellm sends requests through a client it replaces every hour, whose
+  connections are dropped after 5 idle seconds. Any pause longer than that
+  (a long tool call, a wait for a limiter slot, the next spec job)
+  meant a new connection.
+- For Ollama models litellm asks the server for the model's metadata
+  (POST /api/show) before and after every completion, about five extra
+  requests per call in every agent, run and crew.
+
+This module keeps both per process. http_client() returns one pooled
+keep-alive client per endpoint, and build_llm hands it to every LLM it
+builds. prepare_model() fetches an Ollama model's metadata once and
+registers it with litellm, so later lookups are answered from memory.
+
+Configuration (environment):
+- DEV_TEAM_LLM_KEEPALIVE=S   Seconds an idle connection is kept open (default: 120)
+"""
+import os
+import threading
+from typing import Any, Dict, Optional, Set
+
+import httpx
+import litellm
+from litellm.llms.custom_httpx.http_handler import HTTPHandler
+
+from strategy_crew.rate_limit import endpoint_key
+
+DEFAULT_KEEPALIVE = 120.0
+MAX_CONNECTIONS = 32
+# Generation on a busy local server can take many minutes
+REQUEST_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
+OLLAMA_PROVIDERS = ('ollama', 'ollama_chat')
+
+_clients: Dict[str, HTTPHandler] = {}
+_prepared: Set[str] = set()
+_lock = threading.Lock()
+
+
+def _keepalive() -> float:
+    try:
+        return float(os.environ.get('DEV_TEAM_LLM_KEEPALIVE', DEFAULT_KEEPALIVE))
+    except ValueError:
+        return DEFAULT_KEEPALIVE
+
+
+def _provider(model: str) -> str:
+    return model.split('/', 1)[0] if '/' in model else ''
+
+
+def http_client(model: str, base_url: Optional[str] = None) -> HTTPHandler:
+    """Process-wide keep-alive client for the endpoint serving `model`."""
+    key = endpoint_key(model, base_url)
+    with _lock:
+        if key not in _clients:
+            limits = httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS,
+                                  keepalive_expiry=_keepalive())
+            _clients[key] = HTTPHandler(client=httpx.Client(
+                timeout=REQUEST_TIMEOUT,
+                transport=httpx.HTTPTransport(limits=limits),
+            ))
+        return _clients[key]
+
+
+def client_params(model: str, base_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    LLM keyword arguments that route its requests through the shared client.
+
+    Only Ollama models: hosted providers' SDK clients are pooled by litellm.
+    """
+    if _provider(model) not in OLLAMA_PROVIDERS:
+        return {}
+    return {'client': http_client(model, base_url)}
+
+
+def prepare_model(model: str, base_url: Optional[str] = None):
+    """
+    Register an Ollama model's metadata with litellm, once per process.
+
+    Without it litellm fetches /api/show for every completion. If the server
+    cannot be asked, litellm keeps doing its own lookups (and reports the
+    server error on the completion itself).
+    """
+    if _provider(model) not in OLLAMA_PROVIDERS:
+        return
+    key = f"{endpoint_key(model, base_url)} {model}"
+    if key in _prepared:
+        return
+    with _lock:
+        if key in _prepared:
+            return
+        _prepared.add(key)  # Ask once, even if the server was down
+
+    try:
+        response = http_client(model, base_url).client.post(
+            f"{endpoint_key(model, base_url)}/api/show", json={'name': model.split('/', 1)[1]}, timeout=10.0)
+        response.raise_for_status()
+        info = response.json()
+    except (httpx.HTTPError, ValueError):
+        return
+
+    context_length = next((value for name, value in (info.get('model_info') or {}).items()
+                           if 'context_length' in name), None)
+    # What litellm.register_model does, minus the /api/show lookup it starts with
+    litellm.model_cost.setdefault(model, {}).update({
+        'litellm_provider': _provider(model),
+        'mode': 'chat',
+        'max_tokens': context_length,
+        'max_input_tokens': context_length,
+        'max_output_tokens': context_length,
+        'input_cost_per_token': 0.0,
+        'output_cost_per_token': 0.0,
+        'supports_function_calling': 'tools' in str(info.get('template') or '').lower(),
+    })
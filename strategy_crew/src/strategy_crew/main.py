@@ -1,9 +1,12 @@
 #!/usr/bin/env python
+import argparse
 import sys
 import warnings
 from pathlib import Path
 
+from strategy_crew.checkpoints import kickoff_with_checkpoints, task_input_files
 from strategy_crew.crew import StrategyCrew
+from strategy_crew.warmup import preflight
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -16,6 +19,7 @@ warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 #
 # Usage:
 #   crewai run                    # Run strategy analysis
+#   uv run run_crew --resume      # Skip tasks completed by an earlier run
 
 def run():
     """
@@ -27,6 +31,11 @@ def run():
     - outputs/product-roadmap.md
     - outputs/plugin-metadata.json (NEW: includes plugin name, slug, namespace)
     """
+    parser = argparse.ArgumentParser(description='Run the Strategy Crew')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip tasks whose inputs are unchanged and whose outputs exist from an earlier run')
+    args = parser.parse_args(sys.argv[1:])
+
     # Paths relative to strategy_crew root (when running from strategy_crew/)
     competitor_path = "inputs/competitor-plugin"
     skeleton_path = "inputs/skeleton-plugin"
@@ -48,7 +57,11 @@ def run():
     }
 
     try:
-        result = StrategyCrew().crew().kickoff(inputs=inputs)
+        strategy_crew = StrategyCrew()
+        crew = strategy_crew.crew()
+        input_files = task_input_files(strategy_crew.tasks_config)
+        preflight(crew, input_files)  # Loads the models before the first task
+        result = kickoff_with_checkpoints(crew, inputs, 'strategy', resume=args.resume, input_files=input_files)
 
         print("\n" + "="*80)
         print("✅ STRATEGY CREW COMPLETE")
@@ -0,0 +1,215 @@
+"""
+Adaptive request limiter for LLM endpoints
+
+A copy of dev_team's rate_limit.py, for the crews run from this package.
+Their agents called the model without any limit, so crews running side by
+side (the architecture spec fan-out, or a crew next to the dev_team
+pipeline) queued more requests on a slow Ollama server than it has slots.
+Queued requests time out or swap the model, and every request gets slower.
+
+EndpointLimiter caps the requests in flight to one endpoint (an Ollama base
+URL, or the provider for hosted models). All LLMs built by build_llm share
+one limiter per endpoint, in every crew of this package. The cap climbs to
+where the server is saturated, measured by its throughput: the work it
+completes per second, counting each reply's generated tokens plus its prompt
+tokens at 1/PREFILL_SPEEDUP each (prefill runs much faster than generation).
+
+- The cap only moves while requests are queued for a slot; otherwise the
+  crews, not the server, set the pace.
+- After each window of replies (a few per slot) the cap is raised by one.
+  If the next window's throughput is not at least MIN_GAIN higher, the
+  extra request only queued on the server (or made it swap models), so the
+  cap goes back down and stays there for HOLD_WINDOWS before probing again.
+- A failed request halves the cap.
+
+So a slow host settles at one or two requests and a GPU with free slots at
+as many as it serves faster. An optional token bucket also caps requests
+per minute, for hosted models with rate limits.
+
+Configuration (environment):
+- DEV_TEAM_LLM_CONCURRENCY=N      Initial cap (default: OLLAMA_NUM_PARALLEL, else 1)
+- DEV_TEAM_LLM_MAX_CONCURRENCY=N  Upper bound for the cap (default: 8)
+- DEV_TEAM_LLM_MAX_RPM=N          Requests per minute per endpoint (default: no limit)
+- DEV_TEAM_LLM_LIMIT=0            Disable the limiter
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+DEFAULT_OLLAMA_BASE = 'http://localhost:11434'
+DEFAULT_MAX_CONCURRENCY = 8
+# Prompt tokens processed in the time of one generated token (order of magnitude on local GPUs)
+PREFILL_SPEEDUP = 10
+# Throughput gain that justifies one more request in flight
+MIN_GAIN = 0.1
+# Windows to stay at a cap after a raise was undone, before probing again
+HOLD_WINDOWS = 4
+# How long a waiting request sleeps before re-checking its slot
+WAIT_POLL_SECONDS = 1.0
+
+
+def _env_int(name: str, default: Optional[int]) -> Optional[int]:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def limiter_enabled() -> bool:
+    return os.environ.get('DEV_TEAM_LLM_LIMIT', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def endpoint_key(model: str, base_url: Optional[str] = None) -> str:
+    """The server a model's requests go to: its base URL, else the provider."""
+    provider = model.split('/', 1)[0] if '/' in model else 'openai'
+    if not base_url and provider in ('ollama', 'ollama_chat'):
+        base_url = os.environ.get('OLLAMA_API_BASE', DEFAULT_OLLAMA_BASE)
+    return (base_url or provider).rstrip('/')
+
+
+class EndpointLimiter:
+    """
+    Adaptive cap on concurrent requests to one endpoint, plus an optional
+    requests-per-minute token bucket.
+
+    Usage:
+        with limiter.slot() as stats:
+            response = call_model()
+            stats.update(prompt_tokens=..., completion_tokens=...)  # Latency signal
+    """
+
+    def __init__(self, endpoint: str, initial: int = 1, maximum: int = DEFAULT_MAX_CONCURRENCY,
+                 rpm: Optional[int] = None):
+        self.endpoint = endpoint
+        self.maximum = max(1, maximum)
+        self.limit = min(max(1, initial), self.maximum)
+        self.rpm = rpm
+        self.in_flight = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+        self._tokens = 1.0
+        self._refilled = time.monotonic()
+        self._hold = 0
+        self._raised_from: Optional[float] = None  # Throughput before the last raise
+        self._throughput: Optional[float] = None
+        self._new_window()
+
+    def _new_window(self):
+        self._window_start = time.monotonic()
+        self._window_replies = 0
+        self._window_work = 0.0
+        self._window_saturated = False
+
+    def _take_rate_token(self) -> float:
+        """Seconds to wait for the next request of the RPM budget (0 once taken)."""
+        if not self.rpm:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(1.0, self._tokens + (now - self._refilled) * self.rpm / 60.0)
+        self._refilled = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) * 60.0 / self.rpm
+
+    def acquire(self) -> float:
+        """Block until a slot (and RPM token) is free; returns the seconds waited."""
+        start = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+            try:
+                while True:
+                    if self.in_flight < self.limit:
+                        delay = self._take_rate_token()
+                        if delay == 0:
+                            break
+                    else:
+                        delay = WAIT_POLL_SECONDS
+                    self._cond.wait(min(delay, WAIT_POLL_SECONDS))
+            finally:
+                self.waiting -= 1
+            self.in_flight += 1
+        return time.monotonic() - start
+
+    def release(self, prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None,
+                failed: bool = False):
+        """Free a slot and adapt the cap to the endpoint's throughput."""
+        with self._cond:
+            self.in_flight -= 1
+            if failed:
+                self._set_limit(self.limit // 2)
+                self._raised_from, self._hold = None, HOLD_WINDOWS
+            else:
+                self._window_replies += 1
+                self._window_work += (completion_tokens or 0) + (prompt_tokens or 0) / PREFILL_SPEEDUP
+                self._window_saturated |= self.waiting > 0
+                # A window spans a few replies per slot, so their sizes average out
+                if self._window_replies >= 3 * self.limit:
+                    self._end_window()
+            self._cond.notify_all()
+
+    def _end_window(self):
+        elapsed = time.monotonic() - self._window_start
+        throughput = self._window_work / elapsed if elapsed > 0 else 0.0
+        if self._window_saturated and self._window_work > 0:
+            if self._raised_from is not None and throughput < self._raised_from * (1 + MIN_GAIN):
+                self._set_limit(self.limit - 1)  # The raise did not pay off
+                self._raised_from, self._hold = None, HOLD_WINDOWS
+            elif self._hold > 0:
+                self._hold -= 1
+                self._raised_from = None
+            elif self.limit < self.maximum:
+                self._raised_from = throughput
+                self._set_limit(self.limit + 1)
+            else:
+                self._raised_from = None
+        self._throughput = throughput
+        self._new_window()
+
+    def _set_limit(self, limit: int):
+        self.limit = min(max(1, limit), self.maximum)
+
+    @contextmanager
+    def slot(self) -> Iterator[Dict[str, Any]]:
+        """
+        Hold a slot for the block. The yielded dict gets `queued` (seconds
+        waited); set `prompt_tokens` and `completion_tokens` in it for the
+        latency signal.
+        """
+        stats = {'queued': self.acquire()}
+        failed = False
+        try:
+            yield stats
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(stats.get('prompt_tokens'), stats.get('completion_tokens'), failed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {'endpoint': self.endpoint, 'limit': self.limit, 'in_flight': self.in_flight,
+                    'waiting': self.waiting, 'throughput': self._throughput}
+
+
+_limiters: Dict[str, EndpointLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(model: str, base_url: Optional[str] = None) -> Optional[EndpointLimiter]:
+    """Process-wide limiter for the endpoint serving `model`, or None if disabled."""
+    if not limiter_enabled():
+        return None
+    key = endpoint_key(model, base_url)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = EndpointLimiter(
+                key,
+                initial=_env_int('DEV_TEAM_LLM_CONCURRENCY', _env_int('OLLAMA_NUM_PARALLEL', 1)),
+                maximum=_env_int('DEV_TEAM_LLM_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY),
+                rpm=_env_int('DEV_TEAM_LLM_MAX_RPM', None),
+            )
+        return _limiters[key]
@@ -0,0 +1,241 @@
+"""
+Model warm-up before a crew runs
+
+agents.yaml can give each agent its own Ollama model (the development crew
+uses three). Ollama loads a model on its first request and unloads it after
+its keep_alive (5 minutes by default) or when another model needs the
+memory. So the first call to each model, and every switch back to one that
+was evicted, waited for gigabytes of weights inside the crew, where the load
+looked like a slow LLM call.
+
+preflight(crew) prepares a crew just before it is kicked off:
+
+1. The tasks are reordered so that tasks on the same model run back to back,
+   as far as their dependencies allow (see order_tasks_by_model).
+2. At kickoff, after checkpointed tasks are skipped, the models of the tasks
+   still to run are loaded in the order they are needed. Each load uses a
+   keep_alive that outlasts the crew (DEV_TEAM_KEEP_ALIVE). If loading one
+   model evicts another, the two do not fit in memory together: warming
+   stops, the first model is reloaded if needed, and the rest load on first
+   use.
+3. The time spent loading each model is printed, apart from the crew's
+   inference time.
+
+Only ollama/ and ollama_chat/ models are warmed. Set DEV_TEAM_WARMUP=0 to
+skip the pre-flight.
+"""
+import fnmatch
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set
+
+import httpx
+
+DEFAULT_KEEP_ALIVE = '30m'
+OLLAMA_PROVIDERS = ('ollama', 'ollama_chat')
+# Loading a large model from a cold disk can take minutes
+LOAD_TIMEOUT = httpx.Timeout(timeout=600.0, connect=5.0)
+
+
+@dataclass
+class ModelWarmup:
+    """Outcome of warming one model."""
+    model: str
+    started: float = 0.0       # Epoch seconds
+    seconds: float = 0.0
+    load_seconds: float = 0.0  # As reported by Ollama; 0 if it was already loaded
+    evicted: bool = False      # Pushed out of memory by a model warmed after it
+    error: Optional[str] = None
+
+
+def warmup_enabled() -> bool:
+    return os.environ.get('DEV_TEAM_WARMUP', '1').lower() not in ('0', 'false', 'no', 'off')
+
+
+def task_model(task) -> Optional[str]:
+    """Model string of the agent assigned to a task, e.g. 'ollama/qwen3:30b-instruct'."""
+    llm = getattr(task.agent, 'llm', None)
+    return llm if isinstance(llm, str) else getattr(llm, 'model', None)
+
+
+def _ollama_name(model: str) -> Optional[str]:
+    """'ollama/qwen3' -> 'qwen3:latest'; None for other providers."""
+    provider, _, name = model.partition('/')
+    if provider not in OLLAMA_PROVIDERS or not name:
+        return None
+    return name if ':' in name else f"{name}:latest"
+
+
+def _reads(patterns: List[str], output_file: str) -> bool:
+    """Whether input_files `patterns` (files, directories or globs) cover `output_file`."""
+    for pattern in patterns:
+        pattern = pattern.rstrip('/')
+        if output_file == pattern or output_file.startswith(pattern + '/') or fnmatch.fnmatch(output_file, pattern):
+            return True
+    return False
+
+
+def _dependencies(tasks: list, input_files: Dict[str, List[str]]) -> List[Set[int]]:
+    """For each task, the indices of the tasks that must run before it."""
+    index = {id(task): i for i, task in enumerate(tasks)}
+    deps: List[Set[int]] = [set() for _ in tasks]
+    for i, task in enumerate(tasks):
+        if isinstance(task.context, list):
+            deps[i].update(index[id(c)] for c in task.context if id(c) in index)
+        else:
+            # Without explicit context a task sees every earlier output, so it
+            # is a barrier: nothing may move across it in either direction.
+            deps[i].update(range(i))
+            for j in range(i + 1, len(tasks)):
+                deps[j].add(i)
+        # Tasks that read another task's output file depend on it as well
+        for j, other in enumerate(tasks):
+            if j != i and other.output_file and _reads(input_files.get(task.name, []), other.output_file):
+                deps[i].add(j)
+    return deps
+
+
+def model_switches(tasks: list) -> int:
+    models = [task_model(task) for task in tasks]
+    return sum(1 for a, b in zip(models, models[1:]) if a != b)
+
+
+def order_tasks_by_model(tasks: list, input_files: Optional[Dict[str, List[str]]] = None) -> list:
+    """
+    The tasks in an order with as few model switches as dependencies allow.
+
+    Dependencies are explicit `context` lists, and `input_files` (task name
+    -> files it reads, see checkpoints.task_input_files) covering another
+    task's output_file. A task without explicit context stays where it is.
+    Among the tasks ready to run, one on the model just used is preferred,
+    then the earliest in the original order, so a crew whose tasks are
+    already grouped keeps its order.
+    """
+    deps = _dependencies(tasks, input_files or {})
+    done: List[int] = []
+    remaining = list(range(len(tasks)))
+    while remaining:
+        ready = [i for i in remaining if deps[i] <= set(done)]
+        if not ready:  # A dependency cycle through input_files; keep the original order
+            return list(tasks)
+        current = task_model(tasks[done[-1]]) if done else None
+        chosen = next((i for i in ready if task_model(tasks[i]) == current), ready[0])
+        done.append(chosen)
+        remaining.remove(chosen)
+    return [tasks[i] for i in done]
+
+
+def _ollama_base() -> str:
+    return os.environ.get('OLLAMA_API_BASE', 'http://localhost:11434').rstrip('/')
+
+
+def _loaded(client: httpx.Client, base: str) -> Optional[Set[str]]:
+    """Models Ollama has in memory (/api/ps), or None if it cannot tell."""
+    try:
+        response = client.get(f"{base}/api/ps", timeout=10.0)
+        response.raise_for_status()
+        return {m.get('model') or m.get('name') for m in response.json().get('models', [])}
+    except (httpx.HTTPError, ValueError):
+        return None
+
+
+def _load(client: httpx.Client, base: str, model: str, keep_alive: str) -> ModelWarmup:
+    """Load one model: a generate request without a prompt only loads it."""
+    start = time.time()
+    try:
+        response = client.post(f"{base}/api/generate",
+                               json={'model': _ollama_name(model), 'keep_alive': keep_alive, 'stream': False})
+        response.raise_for_status()
+        body = response.json()
+    except (httpx.HTTPError, ValueError) as e:
+        return ModelWarmup(model, start, time.time() - start, error=str(e))
+    return ModelWarmup(model, start, time.time() - start, load_seconds=body.get('load_duration', 0) / 1e9)
+
+
+def warm_models(models: List[str], keep_alive: Optional[str] = None) -> List[ModelWarmup]:
+    """
+    Load Ollama models in the given order, while they fit in memory together.
+
+    Returns one ModelWarmup per model loaded (or attempted); models left for
+    loading on first use are not included.
+    """
+    keep_alive = keep_alive or os.environ.get('DEV_TEAM_KEEP_ALIVE', DEFAULT_KEEP_ALIVE)
+    models = [m for m in dict.fromkeys(models) if _ollama_name(m)]
+    base = _ollama_base()
+    results: List[ModelWarmup] = []
+    with httpx.Client(timeout=LOAD_TIMEOUT) as client:
+        for model in models:
+            result = _load(client, base, model, keep_alive)
+            results.append(result)
+            if result.error:
+                break  # The server is unreachable or the model missing; the crew will report it
+
+            loaded = _loaded(client, base)
+            if loaded is None:
+                continue
+            for earlier in results[:-1]:
+                earlier.evicted = not earlier.error and _ollama_name(earlier.model) not in loaded
+            if any(r.evicted for r in results):
+                # They do not fit together: make sure the first one needed is back in
+                if results[0].evicted:
+                    results.append(_load(client, base, models[0], keep_alive))
+                    loaded = _loaded(client, base) or set()
+                    for earlier in results[1:-1]:
+                        earlier.evicted = not earlier.error and _ollama_name(earlier.model) not in loaded
+                break
+    return results
+
+
+def print_warmup(results: List[ModelWarmup], remaining: List[str]):
+    total = sum(r.seconds for r in results)
+    print(f"\n🔥 Model warm-up: {total:.1f}s (kept loaded for {os.environ.get('DEV_TEAM_KEEP_ALIVE', DEFAULT_KEEP_ALIVE)})")
+    seen = set()
+    for r in results:
+        again = ' again' if r.model in seen else ''
+        seen.add(r.model)
+        if r.error:
+            print(f"   ✗ {r.model}: {r.error}")
+        elif r.load_seconds >= 0.05:
+            print(f"   ✓ {r.model} loaded{again} in {r.load_seconds:.1f}s{' (evicted since)' if r.evicted else ''}")
+        else:
+            print(f"   ✓ {r.model} already loaded")
+    if remaining:
+        print(f"   Not warmed (does not fit alongside): {', '.join(remaining)} - loads on first use")
+    print()
+
+
+def preflight(crew, input_files: Optional[Dict[str, List[str]]] = None,
+              on_warmup: Optional[Callable[[List[ModelWarmup]], None]] = None):
+    """
+    Reorder a crew's tasks by model now, and warm their models at kickoff.
+
+    Call before kickoff (and before kickoff_with_checkpoints, whose
+    checkpoints follow the task order). The warm-up runs as a
+    before_kickoff callback, so it sees only the tasks still to run.
+
+    Args:
+        crew: Sequential crew, as returned by a @CrewBase crew() method
+        input_files: Task name -> files it reads (checkpoints.task_input_files)
+        on_warmup: Called with the warm-up results, e.g. to record them
+    """
+    if not warmup_enabled():
+        return
+
+    ordered = order_tasks_by_model(list(crew.tasks), input_files)
+    if [id(t) for t in ordered] != [id(t) for t in crew.tasks]:
+        print(f"\n🔀 Task order grouped by model ({model_switches(crew.tasks)} → "
+              f"{model_switches(ordered)} model switches): {', '.join(t.name for t in ordered)}")
+        crew.tasks = ordered
+
+    def warm(inputs):
+        models = list(dict.fromkeys(m for m in (task_model(t) for t in crew.tasks) if m and _ollama_name(m)))
+        if models:
+            results = warm_models(models)
+            warmed = {r.model for r in results}
+            print_warmup(results, [m for m in models if m not in warmed and not any(r.error for r in results)])
+            if on_warmup:
+                on_warmup(results)
+        return inputs
+
+    crew.before_kickoff_callbacks.append(warm)